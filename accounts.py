@@ -0,0 +1,116 @@
+import math
+import os
+import threading
+from config import RateLimits
+from http_client import create_session
+from rate_limiter import RateLimiter
+from utils import create_client
+
+# Spread over the accounts; searches (and any other call) use the first account's app credentials
+SHARDED_ACTIONS = ('reply', 'like')
+
+def state_file_for(index: int) -> str:
+    """Rate-limit snapshot path of the index-th account; the first keeps the single-account name"""
+    if index == 0:
+        return RateLimits.STATE_FILE
+    base, extension = os.path.splitext(RateLimits.STATE_FILE)
+    return f"{base}_{index + 1}{extension}"
+
+class Account:
+    """One set of X credentials with its own rate limiter, pooled session and client.
+
+    credentials=None means the credentials in the environment, as read by
+    utils.create_client. The tweepy client is created on first use.
+    """
+
+    def __init__(self, name: str, credentials: dict = None, license_level: str = 'Free',
+                 state_file: str = RateLimits.STATE_FILE, connection_stats=None):
+        self.name = name
+        self.credentials = credentials
+        self.rate_limiter = RateLimiter(license_level, state_file)
+        self.session = create_session(hooks=[self.rate_limiter.response_hook], stats=connection_stats)
+        self.client = None
+        self.async_client = None
+
+    def attach_client(self, client):
+        """Use client for this account, routing tweepy's calls through the account's session and rate-limit hook"""
+        if client is not None and hasattr(client, 'session'):
+            client.session = self.session
+        self.client = client
+
+    def ensure_client(self):
+        """The account's client, created on first use; None if authentication failed"""
+        if self.client is None:
+            self.attach_client(create_client(self.credentials))
+        return self.client
+
+    def close(self):
+        self.rate_limiter.close()
+        self.session.close()
+
+class AccountPool:
+    """Reply and like quota spread over several accounts (or apps) by remaining budget.
+
+    The executor uses the pool as its rate limiter. For replies and likes,
+    try_acquire takes a token from the account with the most quota left for
+    that endpoint and records the account's name in params['account'], which
+    the handler then sends the call with; release marks the call finished on
+    that account, and refund gives the token back to it if the call was never
+    sent. Searches go through the first account.
+    """
+
+    def __init__(self, accounts: list):
+        self.accounts = accounts
+        self.primary = accounts[0]
+        self._by_name = {account.name: account for account in accounts}
+        self._lock = threading.Lock()
+
+    def __iter__(self):
+        return iter(self.accounts)
+
+    def __len__(self) -> int:
+        return len(self.accounts)
+
+    def get(self, name: str = None) -> Account:
+        """The named account, or the first one"""
+        return self._by_name.get(name, self.primary)
+
+    def try_acquire(self, call_type: str, params: dict = None) -> float:
+        """Take a token and return 0, or return the seconds until any account has one"""
+        if call_type not in SHARDED_ACTIONS or params is None:
+            return self.primary.rate_limiter.try_acquire(call_type)
+        with self._lock:
+            account = max(self.accounts, key=lambda candidate: candidate.rate_limiter.remaining(call_type))
+            wait = account.rate_limiter.try_acquire(call_type)
+            if wait > 0:
+                return min(other.rate_limiter.time_until(call_type, 1) for other in self.accounts)
+            params['account'] = account.name
+            return 0.0
+
+    def release(self, call_type: str, params: dict = None):
+        if call_type not in SHARDED_ACTIONS or params is None:
+            self.primary.rate_limiter.release(call_type)
+        else:
+            self.get(params.get('account')).rate_limiter.release(call_type)
+
+    def refund(self, call_type: str, params: dict = None):
+        if call_type not in SHARDED_ACTIONS or params is None:
+            self.primary.rate_limiter.refund(call_type)
+        else:
+            self.get(params.get('account')).rate_limiter.refund(call_type)
+
+    def time_until(self, call_type: str, count: int) -> float:
+        """Rough seconds until count calls will have fit, assuming they are spread evenly"""
+        if call_type not in SHARDED_ACTIONS:
+            return self.primary.rate_limiter.time_until(call_type, count)
+        share = math.ceil(count / len(self.accounts))
+        return max(account.rate_limiter.time_until(call_type, share) for account in self.accounts)
+
+    def rate_budget(self, limits: dict) -> dict:
+        """Per-endpoint limits of the pool as a whole, for ActionExecutor.set_rate_budget"""
+        return {call_type: dict(info, limit=info['limit'] * len(self.accounts)) if call_type in SHARDED_ACTIONS
+                else info for call_type, info in limits.items()}
+
+    def close(self):
+        for account in self.accounts:
+            account.close()
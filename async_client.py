@@ -0,0 +1,168 @@
+import asyncio
+import contextvars
+import importlib.util
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from config import APIConfig, HTTPConfig
+from rate_limiter import request_info
+
+# httpx logs every request at INFO; the engine already logs each call
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+# Per-request timing, status and rate-limit dicts for the current task, like http_client.begin_request_timings()
+request_timings = contextvars.ContextVar('request_timings', default=None)
+
+def available() -> bool:
+    """True if httpx is installed, so the asyncio engine can be used"""
+    return importlib.util.find_spec("httpx") is not None
+
+class LoopThread:
+    """An asyncio event loop running in one background thread.
+
+    Coroutines are handed over from any thread with submit(), which returns a
+    concurrent.futures.Future. Blocking work the coroutines push off the loop
+    (asyncio.to_thread) runs on a small fixed pool.
+    """
+
+    def __init__(self, blocking_workers: int = HTTPConfig.ASYNC_BLOCKING_WORKERS):
+        self.loop = asyncio.new_event_loop()
+        self.loop.set_default_executor(ThreadPoolExecutor(max_workers=blocking_workers,
+                                                          thread_name_prefix="async-blocking"))
+        self._thread = threading.Thread(target=self._run, name="async-io", daemon=True)
+
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def start(self):
+        self._thread.start()
+
+    def submit(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def stop(self, timeout: float = 5):
+        if not self._thread.is_alive():
+            return
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(timeout)
+
+class AsyncXClient:
+    """Non-blocking search, reply and like calls over one pooled httpx.AsyncClient.
+
+    Replies and likes are signed with OAuth 1.0a user credentials, given as
+    credentials or read from the environment, like utils.create_client. Errors are raised as the requests
+    exceptions the engine already handles: requests.exceptions.Timeout, or
+    requests.exceptions.HTTPError carrying the httpx response.
+    """
+
+    def __init__(self, bearer_token: str, rate_limiter=None, credentials: dict = None, connection_stats=None):
+        import httpx
+        self.httpx = httpx
+        self.bearer_token = bearer_token
+        self.rate_limiter = rate_limiter
+        self.connection_stats = connection_stats
+        self.credentials = credentials or os.environ
+        self.user_id = None
+        self._oauth = None
+        self._user_id_lock = asyncio.Lock()
+        self.session = httpx.AsyncClient(
+            headers={"Accept-Encoding": HTTPConfig.ACCEPT_ENCODING},
+            timeout=HTTPConfig.TIMEOUT,
+            limits=httpx.Limits(max_connections=HTTPConfig.ASYNC_MAX_CONNECTIONS,
+                                max_keepalive_connections=HTTPConfig.POOL_MAXSIZE),
+            # HTTP/2 needs the optional h2 package (pip install httpx[http2])
+            http2=HTTPConfig.HTTP2 and importlib.util.find_spec("h2") is not None,
+            event_hooks={'response': [self._on_response]}
+        )
+
+    async def _on_response(self, response):
+        if self.rate_limiter:
+            self.rate_limiter.response_hook(response)
+
+    def _signed_headers(self, method: str, url: str) -> dict:
+        if self._oauth is None:
+            from oauthlib.oauth1 import Client
+            credentials = [self.credentials.get(name) for name in ('API_KEY', 'API_SECRET', 'ACCESS_TOKEN', 'ACCESS_TOKEN_SECRET')]
+            if not all(credentials):
+                raise ValueError("API_KEY, API_SECRET, ACCESS_TOKEN and ACCESS_TOKEN_SECRET are required to post")
+            consumer_key, consumer_secret, token, token_secret = credentials
+            self._oauth = Client(consumer_key, client_secret=consumer_secret,
+                                 resource_owner_key=token, resource_owner_secret=token_secret)
+        # JSON bodies aren't part of the OAuth 1.0a signature
+        _, headers, _ = self._oauth.sign(url, http_method=method)
+        return headers
+
+    async def _request(self, method: str, url: str, **kwargs) -> dict:
+        timings = request_timings.get()
+        timing = None
+        if timings is not None or self.connection_stats is not None:
+            timing = {'new_connection': False, 'connect': 0.0, 'server': 0.0}
+            kwargs['extensions'] = {'trace': self._timing_hook(timing)}
+            if timings is not None:
+                timings.append(timing)
+        start = time.perf_counter()
+        try:
+            response = await self.session.request(method, url, **kwargs)
+        except self.httpx.TimeoutException as e:
+            raise requests.exceptions.Timeout(str(e)) from e
+        finally:
+            if self.connection_stats is not None:
+                self.connection_stats.record(timing['new_connection'], time.perf_counter() - start)
+        if timing is not None:
+            timing.update(request_info(response.status_code, response.headers))
+        if response.is_error:
+            raise requests.exceptions.HTTPError(f"{response.status_code} Error for url: {response.url}",
+                                                response=response)
+        start = time.perf_counter()
+        payload = response.json()
+        if timing is not None:
+            timing['parse'] = time.perf_counter() - start
+        return payload
+
+    @staticmethod
+    def _timing_hook(timing: dict):
+        """httpcore trace callback adding connect (DNS, TCP, TLS) and time-to-headers to timing"""
+        started = {}
+
+        async def trace(event_name: str, info: dict):
+            step, _, phase = event_name.rpartition('.')
+            if phase == 'started':
+                started[step] = time.perf_counter()
+            elif step in started:
+                elapsed = time.perf_counter() - started.pop(step)
+                if step.endswith(('connect_tcp', 'connect_unix_socket', 'start_tls')):
+                    timing['new_connection'] = True
+                    timing['connect'] += elapsed
+                elif step.endswith('receive_response_headers'):
+                    timing['server'] += elapsed
+        return trace
+
+    async def search(self, request_params: dict) -> dict:
+        return await self._request("GET", APIConfig.SEARCH_ENDPOINT, params=request_params,
+                                   headers={"Authorization": f"Bearer {self.bearer_token}"})
+
+    async def create_tweet(self, text: str, in_reply_to_tweet_id: str) -> dict:
+        body = {"text": text, "reply": {"in_reply_to_tweet_id": str(in_reply_to_tweet_id)}}
+        return await self._request("POST", APIConfig.TWEETS_ENDPOINT, json=body,
+                                   headers=self._signed_headers("POST", APIConfig.TWEETS_ENDPOINT))
+
+    async def like(self, tweet_id: str) -> dict:
+        url = APIConfig.LIKES_ENDPOINT.format(user_id=await self.get_user_id())
+        return await self._request("POST", url, json={"tweet_id": str(tweet_id)},
+                                   headers=self._signed_headers("POST", url))
+
+    async def get_user_id(self) -> str:
+        """The authenticating user's id, looked up once"""
+        async with self._user_id_lock:
+            if self.user_id is None:
+                payload = await self._request("GET", APIConfig.USERS_ME_ENDPOINT,
+                                              headers=self._signed_headers("GET", APIConfig.USERS_ME_ENDPOINT))
+                self.user_id = payload['data']['id']
+        return self.user_id
+
+    async def aclose(self):
+        await self.session.aclose()
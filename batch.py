@@ -0,0 +1,203 @@
+import itertools
+import threading
+from collections import Counter, deque
+
+PENDING = 'pending'
+QUEUED = 'queued'
+RETRYING = 'retrying'
+DONE = 'done'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+
+RUNNING = 'running'
+PAUSED = 'paused'
+COMPLETED = 'completed'
+
+FINISHED_STATES = (DONE, FAILED, CANCELLED)
+
+class BatchItem:
+    __slots__ = ('index', 'action_type', 'params', 'state')
+
+    def __init__(self, index: int, action_type: str, params: dict):
+        self.index = index
+        self.action_type = action_type
+        self.params = params
+        self.state = PENDING
+
+class BatchJob:
+    """A set of reply/like actions submitted together and controlled as one.
+
+    Items are handed to the action queue a window at a time, so pausing or
+    cancelling only has to pull back a handful of queued actions; items
+    waiting on a retry don't hold a window slot. submit(action_type, params)
+    queues an action and withdraw(job, cancel) removes the job's not-yet-started
+    actions from the executor, returning their params. on_paused(job, paused)
+    is called after the job is paused or resumed. A job created with
+    paused=True waits for resume() before queueing anything.
+    """
+    _ids = itertools.count(1)
+
+    def __init__(self, actions, submit, withdraw, window: int, on_finished=None, on_paused=None,
+                 paused: bool = False):
+        self.job_id = next(self._ids)
+        self.items = []
+        for index, (action_type, params) in enumerate(actions):
+            params = dict(params, batch_id=self.job_id, batch_item=index)
+            # Actions resumed from the journal keep the attempts they have already used
+            params.setdefault('retries', 0)
+            self.items.append(BatchItem(index, action_type, params))
+        self.window = window
+        self.state = PAUSED if paused else RUNNING
+        self._submit = submit
+        self._withdraw = withdraw
+        self.on_finished = on_finished
+        self.on_paused = on_paused
+        self._lock = threading.Lock()
+        # Running counts and the next items to queue, so feeding and finishing don't rescan every item
+        self.outstanding = 0
+        self._finished_count = 0
+        self._next_index = 0
+        self._requeued = deque()
+
+    def __len__(self):
+        return len(self.items)
+
+    def counts(self) -> Counter:
+        with self._lock:
+            return Counter(item.state for item in self.items)
+
+    def remaining_by_type(self) -> Counter:
+        """Items not yet done, failed or cancelled, per action type"""
+        with self._lock:
+            return Counter(item.action_type for item in self.items
+                           if item.state in (PENDING, QUEUED, RETRYING))
+
+    @property
+    def finished(self) -> bool:
+        return self.state in (COMPLETED, CANCELLED)
+
+    def _set_state(self, item: BatchItem, state: str):
+        # Caller holds self._lock
+        if item.state == QUEUED:
+            self.outstanding -= 1
+        elif item.state in FINISHED_STATES:
+            self._finished_count -= 1
+        item.state = state
+        if state == QUEUED:
+            self.outstanding += 1
+        elif state in FINISHED_STATES:
+            self._finished_count += 1
+        elif state == PENDING and item.index < self._next_index:
+            self._requeued.append(item.index)
+
+    def _next_pending(self):
+        # Caller holds self._lock; items put back to pending go first
+        while self._requeued:
+            item = self.items[self._requeued.popleft()]
+            if item.state == PENDING:
+                return item
+        while self._next_index < len(self.items):
+            item = self.items[self._next_index]
+            self._next_index += 1
+            if item.state == PENDING:
+                return item
+        return None
+
+    def _all_finished(self) -> bool:
+        # Caller holds self._lock
+        return self._finished_count == len(self.items)
+
+    def feed(self):
+        """Queue pending items until the window is full"""
+        with self._lock:
+            if self.state != RUNNING:
+                return
+            ready = []
+            while self.outstanding < self.window:
+                item = self._next_pending()
+                if item is None:
+                    break
+                self._set_state(item, QUEUED)
+                ready.append(item)
+        for item in ready:
+            self._submit(item.action_type, item.params)
+
+    def start_item(self, index: int) -> bool:
+        """Called as an action starts; False means skip it (job paused or cancelled meanwhile)"""
+        with self._lock:
+            item = self.items[index]
+            if self.state == PAUSED:
+                self._set_state(item, PENDING)
+                return False
+            if self.state == CANCELLED:
+                self._set_state(item, CANCELLED)
+                return False
+            return True
+
+    def finish_item(self, index: int, outcome: str):
+        """Record DONE, FAILED or RETRYING for an item and top the window back up"""
+        with self._lock:
+            self._set_state(self.items[index], outcome)
+            completed = self.state == RUNNING and self._all_finished()
+            if completed:
+                self.state = COMPLETED
+        if completed:
+            if self.on_finished:
+                self.on_finished(self)
+        else:
+            self.feed()
+
+    def pause(self):
+        with self._lock:
+            if self.state != RUNNING:
+                return
+            self.state = PAUSED
+        for params in self._withdraw(self, False):
+            with self._lock:
+                self._set_state(self.items[params['batch_item']], PENDING)
+        if self.on_paused:
+            self.on_paused(self, True)
+
+    def resume(self):
+        with self._lock:
+            if self.state != PAUSED:
+                return
+            self.state = RUNNING
+            # The last in-flight items may have finished while the job was paused
+            completed = self._all_finished()
+            if completed:
+                self.state = COMPLETED
+        if self.on_paused:
+            self.on_paused(self, False)
+        if completed:
+            if self.on_finished:
+                self.on_finished(self)
+        else:
+            self.feed()
+
+    def cancel(self):
+        """Drop every item that hasn't started, including scheduled retries; in-flight calls finish"""
+        with self._lock:
+            if self.finished:
+                return
+            self.state = CANCELLED
+            for item in self.items:
+                if item.state == PENDING:
+                    self._set_state(item, CANCELLED)
+        for params in self._withdraw(self, True):
+            with self._lock:
+                self._set_state(self.items[params['batch_item']], CANCELLED)
+        if self.on_finished:
+            self.on_finished(self)
+
+    def format_progress(self) -> str:
+        counts = self.counts()
+        finished = counts[DONE] + counts[FAILED] + counts[CANCELLED]
+        text = f"Batch {self.job_id}: {finished}/{len(self)} finished ({counts[DONE]} done"
+        if counts[FAILED]:
+            text += f", {counts[FAILED]} failed"
+        if counts[CANCELLED]:
+            text += f", {counts[CANCELLED]} cancelled"
+        if counts[RETRYING]:
+            text += f", {counts[RETRYING]} awaiting retry"
+        return text + ")"
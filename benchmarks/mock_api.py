@@ -0,0 +1,252 @@
+"""Offline stand-in for the X API endpoints this app calls.
+
+Serves GET /2/tweets/search/recent, POST /2/tweets, POST /2/users/:id/likes
+and GET /2/users/me with realistic latency, pagination, X-Rate-Limit-*
+headers and 429s once an endpoint's window is used up. Reply and like
+windows are kept per account (OAuth access token), as on the real API:
+
+    python benchmarks/mock_api.py --port 8000 --license Pro
+    python cli.py --api-base-url http://127.0.0.1:8000/2 search "python" --hours 2
+
+With --replay, each call's latency and success are taken in turn from a
+recorded api_call_log.jsonl (or legacy api_call_log.json) instead.
+GET /mock/stats returns per-endpoint request and 429 counts.
+"""
+import argparse
+import itertools
+import json
+import math
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from config import APIConfig, RateLimits
+from logger import normalize_entry
+from rate_limiter import WINDOW_SECONDS
+
+USER_ID = "1000000000000000001"
+AUTHORS = 25
+# Newest post id; older posts count down from here
+NEWEST_POST_ID = 1900000000000000000
+
+ROUTES = [
+    ('GET', re.compile(r"^/2/tweets/search/recent$"), 'search'),
+    ('POST', re.compile(r"^/2/tweets$"), 'reply'),
+    ('POST', re.compile(r"^/2/users/[^/]+/likes$"), 'like'),
+    ('GET', re.compile(r"^/2/users/me$"), 'me'),
+    ('GET', re.compile(r"^/mock/stats$"), 'stats'),
+]
+OAUTH_TOKEN = re.compile(r'oauth_token="([^"]*)"')
+
+class SyntheticLatency:
+    """Log-normal latency around a median, with a fraction of calls failing with a 503"""
+
+    def __init__(self, median_ms: float = 120, sigma: float = 0.35, error_rate: float = 0.0, seed: int = None):
+        self.mu = math.log(median_ms / 1000)
+        self.sigma = sigma
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def sample(self, call_type: str):
+        """Returns (seconds, succeeded)"""
+        with self._lock:
+            return self.random.lognormvariate(self.mu, self.sigma), self.random.random() >= self.error_rate
+
+class ReplayLatency:
+    """Replays recorded (duration, success) pairs per endpoint, in order and then round again"""
+
+    def __init__(self, path: str):
+        recorded = {call_type: [] for call_type in APIConfig.API_REFS}
+        for entry in self._read(path):
+            if entry['endpoint'] in recorded:
+                recorded[entry['endpoint']].append((float(entry['duration']), entry['ok']))
+        if not any(recorded.values()):
+            raise ValueError(f"No search, reply or like calls recorded in {path}")
+        # Endpoints with no recorded calls borrow the others' timings
+        fallback = [sample for samples in recorded.values() for sample in samples]
+        self.samples = {call_type: itertools.cycle(samples or fallback) for call_type, samples in recorded.items()}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _read(path: str):
+        """Entries in the compact schema, from a JSON Lines log or the legacy JSON array"""
+        with open(path, 'r', encoding='utf-8') as f:
+            if f.read(1) == '[':
+                f.seek(0)
+                entries = json.load(f)
+            else:
+                f.seek(0)
+                entries = f
+            for entry in entries:
+                try:
+                    yield normalize_entry(json.loads(entry) if isinstance(entry, str) else entry)
+                except (ValueError, KeyError):
+                    continue
+
+    def sample(self, call_type: str):
+        with self._lock:
+            return next(self.samples.get(call_type) or self.samples['search'])
+
+class MockXAPI:
+    """Request handling state shared by the server threads: quota windows, search corpus and counters"""
+
+    def __init__(self, latency, license_level: str = "Pro", search_results: int = 300, time_scale: float = 1.0):
+        self.latency = latency
+        self.search_results = search_results
+        self.time_scale = time_scale
+        self.limits = {call_type: (info['limit'], WINDOW_SECONDS[info['window']])
+                       for call_type, info in RateLimits.LIMITS[license_level].items()}
+        self.windows = {}
+        self.stats = Counter()
+        self._lock = threading.Lock()
+
+    def take_quota(self, call_type: str, account: str = None):
+        """Use one call from the endpoint's window (the account's own, if given); returns (allowed, rate-limit headers)"""
+        limit, window = self.limits[call_type]
+        now = time.time()
+        with self._lock:
+            remaining, reset_at = self.windows.get((call_type, account), (limit, now + window))
+            if now >= reset_at:
+                remaining, reset_at = limit, now + window
+            allowed = remaining > 0
+            if allowed:
+                remaining -= 1
+            self.windows[(call_type, account)] = (remaining, reset_at)
+            self.stats[f"{call_type}_requests"] += 1
+            if not allowed:
+                self.stats[f"{call_type}_429"] += 1
+        return allowed, {'x-rate-limit-limit': str(limit), 'x-rate-limit-remaining': str(remaining),
+                         'x-rate-limit-reset': str(int(math.ceil(reset_at)))}
+
+    def search_page(self, query: dict) -> dict:
+        """Posts newest first; next_token is the offset of the next page"""
+        max_results = max(10, min(100, int(query.get('max_results', ['10'])[0])))
+        offset = int(query.get('next_token', ['0'])[0])
+        since_id = int(query.get('since_id', ['0'])[0])
+        until_id = int(query.get('until_id', ['0'])[0])
+        newest = min(NEWEST_POST_ID, until_id - 1) if until_id else NEWEST_POST_ID
+        # Fewer posts qualify the narrower the since_id/until_id span is
+        total = max(0, newest - max(since_id, NEWEST_POST_ID - self.search_results))
+        ids = range(newest - offset, newest - min(total, offset + max_results), -1)
+        posts = [{'id': str(post_id), 'author_id': str(2000 + post_id % AUTHORS),
+                  'text': f"Mock post {post_id} matching {query.get('query', [''])[0]}",
+                  'created_at': time.strftime("%Y-%m-%dT%H:%M:%S.000Z", time.gmtime())} for post_id in ids]
+        authors = sorted({post['author_id'] for post in posts})
+        page = {'data': posts, 'includes': {'users': [{'id': author, 'username': f"mock_user_{author}"}
+                                                       for author in authors]},
+                'meta': {'result_count': len(posts)}}
+        if posts:
+            page['meta'].update(newest_id=posts[0]['id'], oldest_id=posts[-1]['id'])
+        if offset + max_results < total:
+            page['meta']['next_token'] = str(offset + max_results)
+        if not posts:
+            del page['data']
+        return page
+
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        self._handle('GET')
+
+    def do_POST(self):
+        self._handle('POST')
+
+    def _handle(self, method: str):
+        api = self.server.api
+        url = urlparse(self.path)
+        body = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        route = next((call_type for route_method, pattern, call_type in ROUTES
+                      if route_method == method and pattern.match(url.path)), None)
+        if route is None:
+            return self._send(404, {'title': "Not Found Error", 'detail': f"{method} {url.path}"})
+        if route == 'stats':
+            return self._send(200, dict(api.stats))
+        if not self.headers.get('Authorization'):
+            return self._send(401, {'title': "Unauthorized", 'status': 401})
+
+        seconds, succeeded = api.latency.sample(route if route != 'me' else 'search')
+        time.sleep(seconds * api.time_scale)
+        if route == 'me':
+            return self._send(200, {'data': {'id': USER_ID, 'username': "mock_user"}})
+
+        account = OAUTH_TOKEN.search(self.headers['Authorization']) if route != 'search' else None
+        allowed, headers = api.take_quota(route, account.group(1) if account else None)
+        if not allowed:
+            return self._send(429, {'title': "Too Many Requests", 'detail': "Too Many Requests", 'status': 429},
+                              headers)
+        if not succeeded:
+            api.stats[f"{route}_errors"] += 1
+            return self._send(503, {'title': "Service Unavailable", 'status': 503}, headers)
+        if route == 'search':
+            return self._send(200, api.search_page(parse_qs(url.query)), headers)
+        payload = json.loads(body or b"{}")
+        if route == 'reply':
+            text = payload.get('text', "")
+            if not text or len(text) > APIConfig.MAX_POST_LENGTH:
+                return self._send(400, {'title': "Invalid Request", 'detail': "text must be 1-280 characters"})
+            return self._send(201, {'data': {'id': str(NEWEST_POST_ID + api.stats['reply_requests']),
+                                             'text': text}}, headers)
+        return self._send(200, {'data': {'liked': True}}, headers)
+
+    def _send(self, status: int, payload: dict, headers: dict = None):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def start_server(api: MockXAPI, host: str = "127.0.0.1", port: int = 0) -> ThreadingHTTPServer:
+    """Serve in a background thread; server.base_url is the value for --api-base-url"""
+    server = ThreadingHTTPServer((host, port), MockHandler)
+    server.daemon_threads = True
+    server.api = api
+    server.base_url = f"http://{host}:{server.server_port}/2"
+    threading.Thread(target=server.serve_forever, name="mock-api", daemon=True).start()
+    return server
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--license", default="Pro", choices=sorted(RateLimits.LIMITS),
+                        help="rate limits to enforce (default: Pro)")
+    parser.add_argument("--search-results", type=int, default=300, help="posts matching any search")
+    parser.add_argument("--latency-ms", type=float, default=120, help="median latency (default: 120)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of calls failing with a 503")
+    parser.add_argument("--seed", type=int, help="random seed for repeatable latencies")
+    parser.add_argument("--replay", metavar="LOG", help="replay latencies and failures from a recorded call log")
+    parser.add_argument("--time-scale", type=float, default=1.0, help="multiply every latency (e.g. 0.1)")
+    args = parser.parse_args()
+
+    latency = ReplayLatency(args.replay) if args.replay else SyntheticLatency(args.latency_ms, error_rate=args.error_rate,
+                                                                              seed=args.seed)
+    server = start_server(MockXAPI(latency, args.license, args.search_results, args.time_scale), args.host, args.port)
+    print(f"Mock X API on {server.base_url} (Ctrl+C to stop)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+        print(json.dumps(dict(server.api.stats), indent=4))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,222 @@
+"""Action pipeline, call log and results rendering benchmarks.
+
+Runs offline against benchmarks/mock_api.py, in a scratch directory so no
+state file in the repo is touched. Reports:
+
+  - actions/sec and p50/p99 latency for a batch of replies and likes, per
+    engine (thread pool, and asyncio when httpx is installed); latency runs
+    from an action being queued to its outcome being recorded
+  - log_call, flush and startup read cost against the call log's size; at
+    startup the stats read the entries logged since their last snapshot, here
+    the last hour
+  - time to render N search results in the GUI (skipped without a display)
+
+Save a baseline once, then compare against it:
+
+    python benchmarks/pipeline.py --save pipeline_baseline.json
+    python benchmarks/pipeline.py --compare pipeline_baseline.json
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, REPO_DIR)
+
+import mock_api
+from utils import set_api_base_url
+
+# Metrics where a larger value is better; every other timing should not grow
+HIGHER_IS_BETTER = ('actions_per_sec',)
+# Changes smaller than this, in the metric's own unit, are noise rather than regressions
+NOISE_FLOOR = 0.5
+
+def _percentile(values: list, fraction: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+def measure_pipeline(async_io: bool, likes: int, replies: int, latency_ms: float, accounts: int = 1) -> dict:
+    from batch import DONE
+    from engine import XEngine
+    from options import load_options
+
+    class TimedEngine(XEngine):
+        """Records each action's time from being queued to its outcome"""
+
+        def __init__(self, *args, **kwargs):
+            self.queued_at = {}
+            self.latencies = []
+            super().__init__(*args, **kwargs)
+
+        def _submit(self, action_type, params):
+            self.queued_at[id(params)] = time.perf_counter()
+            super()._submit(action_type, params)
+
+        def _finish_action(self, action_type, params, outcome, due=None):
+            super()._finish_action(action_type, params, outcome, due)
+            if outcome == DONE:
+                self.latencies.append(time.perf_counter() - self.queued_at.pop(id(params)))
+
+    server = mock_api.start_server(mock_api.MockXAPI(mock_api.SyntheticLatency(latency_ms, seed=1), "Pro"))
+    set_api_base_url(server.base_url)
+    options = dict(load_options(), license_level="Pro")
+    # Dummy credentials, one access token per account; the mock server keeps reply and like quotas per token
+    credentials = [{name: "benchmark" for name in ('API_KEY', 'API_SECRET', 'ACCESS_TOKEN_SECRET')}
+                   for _ in range(accounts)]
+    for index, account in enumerate(credentials):
+        account['ACCESS_TOKEN'] = f"benchmark-{index + 1}"
+    engine = TimedEngine("benchmark", options=options, async_io=async_io, accounts=credentials)
+    engine.start()
+    try:
+        actions = [('like', {'post_id': str(1000 + index)}) for index in range(likes)]
+        actions += [('reply', {'post_id': str(5000 + index), 'text': "Benchmark reply"}) for index in range(replies)]
+        start = time.perf_counter()
+        engine.submit_batch(actions)
+        if not engine.wait_idle(timeout=600, include_retries=False, poll_interval=0.01):
+            raise RuntimeError("pipeline benchmark timed out")
+        elapsed = time.perf_counter() - start
+    finally:
+        engine.shutdown()
+        server.shutdown()
+    if len(engine.latencies) < len(actions):
+        raise RuntimeError(f"only {len(engine.latencies)} of {len(actions)} actions succeeded")
+    return {
+        'actions_per_sec': len(engine.latencies) / elapsed,
+        'p50_ms': _percentile(engine.latencies, 0.50) * 1000,
+        'p99_ms': _percentile(engine.latencies, 0.99) * 1000,
+    }
+
+def measure_log(history_size: int, calls: int = 1000) -> dict:
+    from logger import APICallLogger, JSONLinesLogBackend
+    path = f"bench_log_{history_size}.jsonl"
+    now = time.time()
+    request = {'status': 200, 'remaining': 999, 'reset': int(now) + 900}
+    with open(path, 'w', encoding='utf-8') as f:
+        for index in range(history_size):
+            # Spread over the last day
+            timestamp = now - (history_size - index) * 86000 / history_size
+            f.write(json.dumps(dict(request, endpoint='like', ts=round(timestamp, 3), duration=0.12, ok=True,
+                                    count=1)) + "\n")
+    call_logger = APICallLogger(JSONLinesLogBackend(path, legacy_path=None))
+    try:
+        start = time.perf_counter()
+        sum(1 for _ in call_logger.iter_since(now - 3600))
+        load = time.perf_counter() - start
+        start = time.perf_counter()
+        for _ in range(calls):
+            call_logger.log_call('POST /2/users/:id/likes', 0.12, {'data': {'liked': True}}, request)
+        log_call = (time.perf_counter() - start) / calls
+        start = time.perf_counter()
+        call_logger.save_logs()
+        flush = time.perf_counter() - start
+    finally:
+        call_logger.close()
+    return {'load_ms': load * 1000, 'call_us': log_call * 1e6, 'flush_ms': flush * 1000}
+
+def measure_render(post_counts: list) -> dict:
+    try:
+        import tkinter as tk
+        root = tk.Tk()
+    except Exception as e:
+        # No display (e.g. a CI container without Xvfb)
+        print(f"render benchmark skipped: {e}", file=sys.stderr)
+        return {}
+    import main
+    root.withdraw()
+    app = main.xApp(root)
+    # Keep the engine from starting; only the results table is measured
+    app.running = False
+    results = {}
+    try:
+        for count in post_counts:
+            app.clear_search_results()
+            root.update_idletasks()
+            posts = [{'id': str(10 ** 12 + index), 'author_id': str(index % 25),
+                      'text': f"Benchmark post {index} " * 4, 'created_at': "2026-01-01T00:00:00.000Z"}
+                     for index in range(count)]
+            users = [{'id': str(index), 'username': f"user{index}"} for index in range(25)]
+            start = time.perf_counter()
+            for page in range(0, count, 100):
+                app.append_search_results(posts[page:page + 100], users)
+            root.update_idletasks()
+            results[f"render_ms_{count}"] = (time.perf_counter() - start) * 1000
+    finally:
+        root.destroy()
+    return results
+
+def measure(args) -> dict:
+    import async_client
+    results = {}
+    engines = [('threads', False)] + ([('async', True)] if async_client.available() else [])
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        # Dummy credentials for the OAuth signing; the mock server doesn't check them
+        for name in ['API_KEY', 'API_SECRET', 'ACCESS_TOKEN', 'ACCESS_TOKEN_SECRET', 'BEARER_TOKEN']:
+            os.environ.setdefault(name, "benchmark")
+        try:
+            for name, async_io in engines:
+                for metric, value in measure_pipeline(async_io, args.likes, args.replies, args.latency_ms,
+                                                      args.accounts).items():
+                    results[f"{name}_{metric}"] = value
+                # Each run starts with fresh rate-limit, journal and log state
+                for path in os.listdir(workdir):
+                    os.remove(path)
+            for size in args.log_sizes:
+                for metric, value in measure_log(size).items():
+                    results[f"log_{metric}_{size}"] = value
+            results.update(measure_render(args.render_counts))
+        finally:
+            os.chdir(cwd)
+    return results
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    regressions = []
+    for name, value in results.items():
+        if name not in baseline:
+            continue
+        if name.endswith(HIGHER_IS_BETTER):
+            limit = baseline[name] * (1 - tolerance)
+            if value < limit - NOISE_FLOOR:
+                regressions.append(f"{name}: {value:.1f} < {limit:.1f} (baseline {baseline[name]:.1f} - {tolerance:.0%})")
+        else:
+            limit = baseline[name] * (1 + tolerance)
+            if value > limit + NOISE_FLOOR:
+                regressions.append(f"{name}: {value:.2f} > {limit:.2f} (baseline {baseline[name]:.2f} + {tolerance:.0%})")
+    return regressions
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--likes", type=int, default=400, help="likes per pipeline run")
+    parser.add_argument("--replies", type=int, default=80, help="replies per pipeline run (Pro allows 100/15m)")
+    parser.add_argument("--latency-ms", type=float, default=50, help="median mock API latency")
+    parser.add_argument("--accounts", type=int, default=1, help="accounts to spread replies and likes over")
+    parser.add_argument("--log-sizes", type=int, nargs="+", default=[1000, 10000, 100000],
+                        help="call log history sizes to measure")
+    parser.add_argument("--render-counts", type=int, nargs="+", default=[100, 500, 1000],
+                        help="numbers of search results to render")
+    parser.add_argument("--save", metavar="PATH", help="write the results as a baseline")
+    parser.add_argument("--compare", metavar="PATH", help="fail if worse than this baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed change against the baseline")
+    args = parser.parse_args()
+
+    results = measure(args)
+    for name, value in results.items():
+        print(f"{name:32} {value:10.2f}")
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(results, f, indent=4)
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
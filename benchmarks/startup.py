@@ -0,0 +1,123 @@
+"""Import-time and time-to-first-frame benchmark.
+
+Each measurement runs in a fresh interpreter, so module caches don't hide
+cold-start costs. Save a baseline once, then compare against it:
+
+    python benchmarks/startup.py --save startup_baseline.json
+    python benchmarks/startup.py --compare startup_baseline.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules the GUI must not load before its first frame
+HEAVY_MODULES = ['requests', 'tweepy', 'sqlite3', 'dotenv', 'urllib3']
+
+IMPORT_SNIPPET = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{'seconds': elapsed, 'heavy': [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+FIRST_FRAME_SNIPPET = """
+import json, sys, time
+start = time.perf_counter()
+import tkinter as tk
+import main
+marks = {{}}
+root = tk.Tk()
+def on_map(event):
+    if event.widget is root and 'first_frame' not in marks:
+        marks['first_frame'] = time.perf_counter() - start
+        marks['heavy_at_first_frame'] = [m for m in {heavy!r} if m in sys.modules]
+root.bind("<Map>", on_map, add="+")
+app = main.xApp(root)
+def poll():
+    if app.engine is not None:
+        marks['engine_ready'] = time.perf_counter() - start
+        app.on_closing()
+    else:
+        root.after(1, poll)
+root.after(1, poll)
+root.mainloop()
+print(json.dumps(marks))
+"""
+
+def _run(snippet: str, cwd: str) -> dict:
+    result = subprocess.run([sys.executable, "-c", snippet], cwd=cwd, capture_output=True, text=True,
+                            env=dict(os.environ, PYTHONPATH=REPO_DIR, PYTHONDONTWRITEBYTECODE="1"))
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "failed")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def measure(repeat: int) -> dict:
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        # Dummy credentials and fresh state files, so nothing in the repo is touched
+        with open(os.path.join(workdir, "cred.env"), 'w') as f:
+            for name in ['API_KEY', 'API_SECRET', 'ACCESS_TOKEN', 'ACCESS_TOKEN_SECRET', 'BEARER_TOKEN']:
+                f.write(f"{name}=benchmark\n")
+
+        for module in ['main', 'cli', 'engine']:
+            runs = [_run(IMPORT_SNIPPET.format(module=module, heavy=HEAVY_MODULES), workdir) for _ in range(repeat)]
+            results[f"import_{module}"] = statistics.median(run['seconds'] for run in runs)
+            if module == 'main':
+                results['heavy_modules_loaded_by_main'] = runs[0]['heavy']
+
+        try:
+            runs = [_run(FIRST_FRAME_SNIPPET.format(heavy=HEAVY_MODULES), workdir) for _ in range(repeat)]
+        except RuntimeError as e:
+            # No display (e.g. a CI container without Xvfb)
+            print(f"first-frame benchmark skipped: {e}", file=sys.stderr)
+        else:
+            results['first_frame'] = statistics.median(run['first_frame'] for run in runs)
+            results['engine_ready'] = statistics.median(run['engine_ready'] for run in runs)
+            results['heavy_modules_at_first_frame'] = runs[0]['heavy_at_first_frame']
+    return results
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    regressions = []
+    for name, value in results.items():
+        if not isinstance(value, float) or name not in baseline:
+            continue
+        limit = baseline[name] * (1 + tolerance)
+        if value > limit:
+            regressions.append(f"{name}: {value * 1000:.1f}ms > {limit * 1000:.1f}ms "
+                               f"(baseline {baseline[name] * 1000:.1f}ms + {tolerance:.0%})")
+    for name in ('heavy_modules_loaded_by_main', 'heavy_modules_at_first_frame'):
+        if results.get(name):
+            regressions.append(f"{name}: {', '.join(results[name])}")
+    return regressions
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="runs per measurement; the median is reported")
+    parser.add_argument("--save", metavar="PATH", help="write the results as a baseline")
+    parser.add_argument("--compare", metavar="PATH", help="fail if slower than this baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown over the baseline")
+    args = parser.parse_args()
+
+    results = measure(args.repeat)
+    for name, value in results.items():
+        print(f"{name:32} {value * 1000:8.1f} ms" if isinstance(value, float) else f"{name:32} {value}")
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(results, f, indent=4)
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,222 @@
+import argparse
+import datetime
+import json
+import logging
+import signal
+import sys
+import threading
+from config import APIConfig, DaemonConfig
+from utils import load_accounts, check_time_range, set_api_base_url
+from engine import XEngine
+from store import PostStore
+from batch import FAILED
+
+logger = logging.getLogger(__name__)
+
+TIME_FORMAT = "%Y-%m-%d %H:%M"
+
+def _parse_time(value: str) -> datetime.datetime:
+    return datetime.datetime.strptime(value, TIME_FORMAT).replace(tzinfo=datetime.timezone.utc)
+
+def _time_range(start: str = None, end: str = None, hours: float = DaemonConfig.LOOKBACK_HOURS):
+    now = datetime.datetime.now(datetime.timezone.utc)
+    end_dt = _parse_time(end) if end else now
+    start_dt = _parse_time(start) if start else end_dt - datetime.timedelta(hours=hours)
+    return start_dt.isoformat(), check_time_range(start_dt, end_dt).isoformat()
+
+def _load_json(path: str):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def _create_engine(args, **callbacks) -> XEngine:
+    accounts = load_accounts(args.credentials)
+    engine = XEngine(accounts[0]['BEARER_TOKEN'], trace_port=args.trace_port, accounts=accounts, **callbacks)
+    if args.max_results:
+        engine.max_search_results = args.max_results
+    return engine
+
+def cmd_search(args) -> int:
+    store = PostStore()
+    lock = threading.Lock()
+
+    def on_page(params, posts, users):
+        with lock:
+            store.add_page(posts, users)
+
+    engine = _create_engine(args, on_search_page=on_page)
+    engine.start()
+    try:
+        start_time, end_time = _time_range(args.start, args.end, args.hours)
+        engine.submit_search(engine.search_params(
+            args.keywords, start_time, end_time,
+            verified_only=args.verified_only or None,
+            no_replies=args.no_replies or None,
+            incremental=args.incremental or None
+        ))
+        if not engine.wait_idle(args.timeout, include_retries=not args.no_retry_wait):
+            logger.warning("Timed out waiting for the search to finish")
+    finally:
+        engine.shutdown()
+    for post in store:
+        if args.json:
+            print(json.dumps({'id': post.id, 'username': store.username(post.author_id),
+                              'text': post.text, 'created_at': post.created_at}, ensure_ascii=False))
+        else:
+            print(f"{post.id}\t@{store.username(post.author_id)}\t{' '.join(post.text.split())}")
+    return 0
+
+def cmd_run(args) -> int:
+    """Run a JSON list of {"action": "reply"|"like", "post_id": ..., "text": ...} items"""
+    actions = _load_json(args.batch_file)
+    for item in actions:
+        if item.get('action') not in ('reply', 'like') or not item.get('post_id'):
+            raise ValueError(f"Invalid batch item: {item}")
+        if item['action'] == 'reply' and not 0 < len(item.get('text', "")) <= APIConfig.MAX_POST_LENGTH:
+            raise ValueError(f"Reply text must be 1-{APIConfig.MAX_POST_LENGTH} characters: {item}")
+    engine = _create_engine(args)
+    engine.start()
+    try:
+        job = engine.submit_batch([
+            (item['action'], {'post_id': str(item['post_id']), 'text': item.get('text')}) for item in actions
+        ])
+        finished = engine.wait_idle(args.timeout, include_retries=not args.no_retry_wait)
+    finally:
+        engine.shutdown()
+    if job is not None:
+        print(job.format_progress())
+    if not finished:
+        logger.warning("Timed out with actions still pending")
+        return 1
+    return 1 if job is not None and job.counts()[FAILED] else 0
+
+class SearchDaemon:
+    """Polls saved searches incrementally and applies each one's actions to the new posts it finds.
+
+    The config file holds interval_minutes, lookback_hours and a list of
+    searches: {"keywords", "verified_only", "no_replies", "like", "reply_text"}.
+    """
+
+    def __init__(self, engine: XEngine, config: dict):
+        self.engine = engine
+        self.searches = config['searches']
+        self.interval = config.get('interval_minutes', DaemonConfig.INTERVAL_MINUTES) * 60
+        self.lookback_hours = config.get('lookback_hours', DaemonConfig.LOOKBACK_HOURS)
+        self.running = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def on_search_page(self, params, posts, users):
+        with self._lock:
+            if params.get('saved_search') in self.running:
+                self.running[params['saved_search']].extend(post['id'] for post in posts)
+
+    def on_search_done(self, params):
+        with self._lock:
+            post_ids = self.running.pop(params.get('saved_search'), None)
+        if post_ids is None:
+            return
+        search = self.searches[params['saved_search']]
+        actions = []
+        for post_id in post_ids:
+            if search.get('reply_text'):
+                actions.append(('reply', {'post_id': post_id, 'text': search['reply_text']}))
+            if search.get('like'):
+                actions.append(('like', {'post_id': post_id}))
+        if actions:
+            self.engine.submit_batch(actions)
+
+    def on_action_failed(self, action_type, params):
+        if action_type == 'search':
+            with self._lock:
+                self.running.pop(params.get('saved_search'), None)
+
+    def poll(self):
+        start_time, end_time = _time_range(hours=self.lookback_hours)
+        for index, search in enumerate(self.searches):
+            with self._lock:
+                if index in self.running:
+                    continue  # Previous run still in progress (or waiting on a retry)
+                self.running[index] = []
+            params = self.engine.search_params(
+                search['keywords'], start_time, end_time,
+                verified_only=search.get('verified_only', False),
+                no_replies=search.get('no_replies', False),
+                incremental=True
+            )
+            params['saved_search'] = index
+            self.engine.submit_search(params)
+
+    def run(self, once: bool = False):
+        while not self._stop.is_set():
+            self.poll()
+            if once:
+                self.engine.wait_idle()
+                return
+            self._stop.wait(self.interval)
+
+    def stop(self, *args):
+        self._stop.set()
+
+def cmd_daemon(args) -> int:
+    engine = _create_engine(args)
+    daemon = SearchDaemon(engine, _load_json(args.config_file))
+    engine.on_search_page = daemon.on_search_page
+    engine.on_search_done = daemon.on_search_done
+    engine.on_action_failed = daemon.on_action_failed
+    engine.start()
+    signal.signal(signal.SIGINT, daemon.stop)
+    signal.signal(signal.SIGTERM, daemon.stop)
+    try:
+        daemon.run(once=args.once)
+    finally:
+        engine.shutdown()
+    return 0
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Headless X post search, reply and like")
+    parser.add_argument("--credentials", default="cred.env", help="credentials file (default: cred.env)")
+    parser.add_argument("--max-results", type=int, help="override max_search_results from user_options.json")
+    parser.add_argument("--quiet", action="store_true", help="only log warnings and errors")
+    parser.add_argument("--trace-port", type=int, help="serve Prometheus /metrics and OTLP JSON /traces "
+                                                       "on this local port")
+    parser.add_argument("--api-base-url", help="send API calls here instead of api.twitter.com "
+                                               "(e.g. a local benchmarks/mock_api.py)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    search = subparsers.add_parser("search", help="run one search and print the posts found")
+    search.add_argument("keywords")
+    search.add_argument("--start", help="UTC start time (YYYY-MM-DD HH:MM)")
+    search.add_argument("--end", help="UTC end time (default: now)")
+    search.add_argument("--hours", type=float, default=DaemonConfig.LOOKBACK_HOURS,
+                        help="window length when --start is not given")
+    search.add_argument("--verified-only", action="store_true")
+    search.add_argument("--no-replies", action="store_true")
+    search.add_argument("--incremental", action="store_true", help="only posts newer than the last search")
+    search.add_argument("--json", action="store_true", help="print one JSON object per post")
+    search.set_defaults(func=cmd_search)
+
+    run = subparsers.add_parser("run", help="run a JSON batch of reply/like actions")
+    run.add_argument("batch_file")
+    run.set_defaults(func=cmd_run)
+
+    daemon = subparsers.add_parser("daemon", help="poll saved searches and act on new posts")
+    daemon.add_argument("config_file")
+    daemon.add_argument("--once", action="store_true", help="poll once, wait for the actions, then exit")
+    daemon.set_defaults(func=cmd_daemon)
+
+    for subparser in (search, run):
+        subparser.add_argument("--timeout", type=float, help="give up waiting after this many seconds")
+        subparser.add_argument("--no-retry-wait", action="store_true",
+                               help="exit once queued actions finish, without waiting for scheduled retries")
+    return parser
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(level=logging.WARNING if args.quiet else logging.INFO,
+                        format="[%(asctime)s] %(levelname)s: %(message)s", datefmt="%Y-%m-%d %H:%M:%S")
+    if args.api_base_url:
+        set_api_base_url(args.api_base_url)
+    return args.func(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,13 @@
+import os
+
 class APIConfig:
-    BASE_URL = "https://api.twitter.com/2"
+    DEFAULT_BASE_URL = "https://api.twitter.com/2"
+    # Point the app at a stand-in server (benchmarks/mock_api.py) with X_API_BASE_URL
+    BASE_URL = os.getenv("X_API_BASE_URL", DEFAULT_BASE_URL).rstrip("/")
     SEARCH_ENDPOINT = f"{BASE_URL}/tweets/search/recent"
+    TWEETS_ENDPOINT = f"{BASE_URL}/tweets"
+    USERS_ME_ENDPOINT = f"{BASE_URL}/users/me"
+    LIKES_ENDPOINT = BASE_URL + "/users/{user_id}/likes"
     DEFAULT_HEADERS = {"User-Agent": "v2RecentSearchPython"}
     MAX_POST_LENGTH = 280
     MAX_RETRIES = 6
@@ -8,6 +15,60 @@ class APIConfig:
     MIN_END_TIME_OFFSET = 10
     SECONDS_PER_15M = 15 * 60
     SECONDS_PER_24H = 24 * 60 * 60
+    MAX_WORKERS = 8
+    # Use the asyncio engine (async_client.py) when httpx is installed
+    ASYNC_IO = True
+    # Concurrent calls per endpoint in the asyncio engine, before rate limits
+    ASYNC_MAX_CONCURRENCY = 64
+    # Batch actions handed to the executor at a time; the rest stay with the batch, where Pause and Cancel reach them
+    BATCH_WINDOW = 16
+    API_REFS = {
+        'search': 'GET /2/tweets/search/recent',
+        'reply': 'POST /2/tweets',
+        'like': 'POST /2/users/:id/likes'
+    }
+
+class SearchConfig:
+    STATE_FILE = "search_state.json"
+    CACHE_FILE = "search_cache.db"
+    CACHE_TTL_SECONDS = 15 * 60
+    CACHE_MAX_ENTRIES = 200
+    CACHE_MAX_BYTES = 20 * 1024 * 1024
+
+class StoreConfig:
+    MAX_POSTS = 5000
+
+class HTTPConfig:
+    POOL_CONNECTIONS = 4
+    POOL_MAXSIZE = 16
+    KEEP_ALIVE = True
+    ACCEPT_ENCODING = "gzip, deflate"
+    TIMEOUT = 30
+    # Used by the asyncio engine only
+    ASYNC_MAX_CONNECTIONS = 100
+    ASYNC_BLOCKING_WORKERS = 2
+    HTTP2 = False
+
+class TracingConfig:
+    # Recording is cheap (a few spans per action, bounded buffer); serving is opt-in
+    ENABLED = True
+    HOST = "127.0.0.1"
+    # Serve /metrics and /traces on this port when set (the CLI's --trace-port)
+    PORT = None
+    MAX_SPANS = 10000
+    BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300, 900)
+
+class JournalConfig:
+    FILE = "action_journal.jsonl"
+    # Recent search only reaches back 7 days, so older posts can't come up again
+    DONE_RETENTION_SECONDS = 7 * 24 * 60 * 60
+    # Rewrite the journal once it holds this many times more lines than records worth keeping
+    COMPACT_RATIO = 2
+    COMPACT_MIN_LINES = 1000
+
+class DaemonConfig:
+    INTERVAL_MINUTES = 15
+    LOOKBACK_HOURS = 24
 
 class GUIConfig:
     MAIN_SIZE = (800, 800)
@@ -15,10 +76,34 @@ class GUIConfig:
     OPTIONS_SIZE = (300, 350)
     PADDING = 10
     PADY = 5
+    STATUS_FLUSH_MS = 100
+    STATUS_MAX_LINES = 2000
+    ENGINE_START_FALLBACK_MS = 500
 
 class RateLimits:
+    STATE_FILE = "rate_limit_state.json"
     LIMITS = {
         'Free': {'search': {'limit': 1, 'window': '15m'}, 'reply': {'limit': 17, 'window': '24h'}, 'like': {'limit': 1, 'window': '15m'}},
         'Basic': {'search': {'limit': 60, 'window': '15m'}, 'reply': {'limit': 100, 'window': '24h'}, 'like': {'limit': 200, 'window': '24h'}},
         'Pro': {'search': {'limit': 300, 'window': '15m'}, 'reply': {'limit': 100, 'window': '15m'}, 'like': {'limit': 1000, 'window': '24h'}}
-    }
\ No newline at end of file
+    }
+
+class LogConfig:
+    FILE = "api_call_log.jsonl"
+    LEGACY_FILE = "api_call_log.json"
+    FSYNC_BATCH_SIZE = 20
+    FSYNC_INTERVAL = 5.0
+    READ_CHUNK_SIZE = 64 * 1024
+    # API Stats totals as of the last close, so the next start only reads the calls logged since
+    STATS_SNAPSHOT_FILE = "api_call_stats.json"
+    # Fraction of successful responses whose body is kept in the log, truncated
+    RESPONSE_SAMPLE_RATE = 0.0
+    RESPONSE_MAX_CHARS = 300
+    # The active log is rotated at this size or once its first entry is this old
+    ROTATE_BYTES = 16 * 1024 * 1024
+    ROTATE_SECONDS = 24 * 60 * 60
+    # Rotated segments are compressed with "gzip", or "zstd" if the zstandard package is installed
+    COMPRESSION = "gzip"
+    # Segments older than this are compacted into per-hour aggregates, which are kept for RETENTION_SECONDS
+    AGGREGATE_AFTER_SECONDS = 7 * 24 * 60 * 60
+    RETENTION_SECONDS = 365 * 24 * 60 * 60
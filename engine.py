@@ -0,0 +1,918 @@
+import asyncio
+import datetime
+import time
+import logging
+from queue import Queue
+import requests
+from config import APIConfig, HTTPConfig, RateLimits, TracingConfig
+from options import DEFAULT_OPTIONS, load_options
+from logger import APICallLogger
+from stats import APICallStats
+from executor import ActionExecutor, RetryScheduler
+from accounts import Account, AccountPool, state_file_for
+from http_client import ConnectionStats, begin_request_timings, end_request_timings, read_json
+from search_state import SearchCursors
+from search_cache import SearchCache
+from tracing import Tracer
+import tracing
+from batch import BatchJob, DONE, FAILED, RETRYING, CANCELLED, FINISHED_STATES
+from journal import ActionJournal, STARTED, RETRY
+import journal
+import async_client
+
+logger = logging.getLogger(__name__)
+
+# (present participle, past tense) for status messages
+ACTION_VERBS = {'reply': ("Replying to", "replied to"), 'like': ("Liking", "liked")}
+
+class XEngine:
+    """Search, reply, like and retry logic, independent of any UI.
+
+    Front ends observe the engine through callbacks, which run on worker
+    threads: on_status(message), on_search_page(params, posts, users),
+    on_search_done(params) and on_action_failed(action_type, params) once an
+    action has used up its retries. params is the action's own dict, which
+    stays the same object across retries.
+
+    API calls run on one asyncio event loop (async_client.py) when httpx is
+    installed and no blocking client is given, or on a thread pool otherwise.
+    With async_io=True, a given client must have coroutine create_tweet and
+    like methods.
+
+    Each action is traced (tracing.py); with trace_port set, the spans are
+    served as Prometheus metrics and OTLP JSON on that local port.
+
+    accounts is a list of credential dicts (utils.load_accounts); replies and
+    likes are spread over them by remaining quota (accounts.py), while
+    searches use the first. By default the one account in the environment is
+    used, and a given client belongs to the first account.
+    """
+
+    def __init__(self, bearer_token: str, client=None, options: dict = None,
+                 on_status=None, on_search_page=None, on_search_done=None, on_action_failed=None,
+                 async_io: bool = None, trace_port: int = TracingConfig.PORT, accounts: list = None):
+        if async_io is None:
+            async_io = APIConfig.ASYNC_IO and client is None and async_client.available()
+        self.async_io = async_io
+        self.on_status = on_status
+        self.on_search_page = on_search_page
+        self.on_search_done = on_search_done
+        self.on_action_failed = on_action_failed
+        self.apply_options(options or load_options())
+        self.tracer = Tracer()
+        self.trace_port = trace_port
+        self.trace_server = None
+        self.logger = APICallLogger()
+        self.stats = APICallStats(self.logger, self.license_level)
+        self.connection_stats = ConnectionStats()
+        self.stats.add_section(self.connection_stats)
+        self.accounts = AccountPool([Account(str(index + 1), credentials, self.license_level, state_file_for(index),
+                                             self.connection_stats)
+                                     for index, credentials in enumerate(accounts or [None])])
+        # Searches go through the first account
+        self.rate_limiter = self.accounts.primary.rate_limiter
+        self.session = self.accounts.primary.session
+        self.search_headers = {"Authorization": f"Bearer {bearer_token}"}
+        self.search_cursors = SearchCursors()
+        self.search_cache = SearchCache()
+        self.stats.add_section(self.search_cache)
+        self.action_queue = Queue()
+        self.retry_scheduler = RetryScheduler(self.action_queue)
+        self.batches = {}
+        self.journal = ActionJournal()
+        if async_io:
+            self.loop = async_client.LoopThread()
+            for account in self.accounts:
+                if account is self.accounts.primary and client is not None:
+                    account.async_client = client
+                else:
+                    account.async_client = async_client.AsyncXClient(bearer_token, account.rate_limiter,
+                                                                     account.credentials, self.connection_stats)
+            self.async_client = self.accounts.primary.async_client
+            handlers = {'search': self.perform_search_async, 'reply': self.perform_reply_async,
+                        'like': self.perform_like_async}
+        else:
+            self.loop = None
+            self.async_client = None
+            if client is not None:
+                self.accounts.primary.attach_client(client)
+            handlers = {'search': self.perform_search, 'reply': self.perform_reply, 'like': self.perform_like}
+        self.executor = ActionExecutor(
+            self.action_queue,
+            handlers,
+            max_workers=APIConfig.ASYNC_MAX_CONCURRENCY if async_io else APIConfig.MAX_WORKERS,
+            on_idle=self._on_actions_idle,
+            rate_limiter=self.accounts,
+            on_paced=self._on_action_paced,
+            loop=self.loop,
+            on_dispatch=self._on_action_dispatched
+        )
+        self.executor.set_rate_budget(self.accounts.rate_budget(RateLimits.LIMITS[self.license_level]))
+
+    def apply_options(self, options: dict):
+        self.verified_only = options['verified_only']
+        self.no_replies = options['no_replies']
+        self.debug_mode = options['debug_mode']
+        self.incremental_search = options['incremental_search']
+        self.search_retry_minutes = options['search_retry_minutes']
+        self.like_retry_minutes = options['like_retry_minutes']
+        self.reply_retry_hours = options['reply_retry_hours']
+        self.max_search_results = options['max_search_results']
+        self.license_level = options['license_level']
+
+    def get_options(self) -> dict:
+        return {name: getattr(self, name) for name in DEFAULT_OPTIONS}
+
+    def start(self) -> BatchJob:
+        """Start the workers; returns the batch resumed from the journal, if any"""
+        if self.loop:
+            self.loop.start()
+        self.executor.start()
+        self.retry_scheduler.start()
+        self.stats.start()
+        if self.trace_port:
+            self.trace_server = tracing.start_server(self.tracer, self.trace_port)
+            self.update_status(f"Tracing: http://{TracingConfig.HOST}:{self.trace_port}/metrics and /traces")
+        if len(self.accounts) > 1:
+            self.update_status(f"Replies and likes are spread over {len(self.accounts)} accounts")
+        return self.resume_journal()
+
+    def shutdown(self):
+        self.retry_scheduler.stop()
+        self.executor.shutdown()
+        if self.loop:
+            for account in self.accounts:
+                try:
+                    self.loop.submit(account.async_client.aclose()).result(timeout=5)
+                except Exception as e:
+                    logger.warning(f"Closing the async HTTP client failed: {e}")
+            self.loop.stop()
+        if self.trace_server:
+            self.trace_server.shutdown()
+        self.accounts.close()
+        self.search_cache.close()
+        self.journal.close()
+        self.stats.close()
+        self.logger.close()
+
+    def update_status(self, message: str):
+        logger.info(message)
+        if self.on_status:
+            self.on_status(message)
+
+    def debug_log(self, message: str):
+        if self.debug_mode:
+            logger.debug(message)
+            self.update_status(f"[DEBUG] {message}")
+
+    def search_params(self, keywords: str, start_time: str, end_time: str, verified_only: bool = None,
+                      no_replies: bool = None, incremental: bool = None) -> dict:
+        """Search action parameters; filters left as None fall back to the saved options"""
+        return {
+            'keywords': keywords,
+            'start_time': start_time,
+            'end_time': end_time,
+            'verified_only': self.verified_only if verified_only is None else verified_only,
+            'no_replies': self.no_replies if no_replies is None else no_replies,
+            'incremental': self.incremental_search if incremental is None else incremental,
+            'retries': 0
+        }
+
+    def submit_search(self, params: dict) -> bool:
+        """Queue a search, or answer it from the cache; returns True on a cache hit"""
+        if not params['incremental']:
+            # Served before queueing, so a hit costs neither an API call nor a rate-limit token
+            cached = self.search_cache.get(self._search_cache_key(params))
+            if cached is not None:
+                posts, users = cached
+                params['fetched'] = len(posts)
+                if self.on_search_page:
+                    self.on_search_page(params, posts, users)
+                if self.on_search_done:
+                    self.on_search_done(params)
+                self.update_status(f"Search served from cache. Found {len(posts)} posts")
+                return True
+        self._submit('search', params)
+        self.update_status("Search queued")
+        return False
+
+    def submit_batch(self, actions) -> BatchJob:
+        """Queue [(action_type, params), ...] as one job that can be paused, resumed or cancelled.
+
+        Actions already pending or done for the same post are skipped; returns
+        None if nothing is left to run.
+        """
+        # One journal write for the whole batch; this runs on the GUI thread
+        admitted = self.journal.admit_many(actions)
+        skipped = len(actions) - len(admitted)
+        if skipped:
+            self.update_status(f"{skipped} actions skipped: already queued or done for those posts")
+        return self._start_batch(admitted)
+
+    def _start_batch(self, actions, paused: bool = False) -> BatchJob:
+        if not actions:
+            return None
+        job = BatchJob(actions, self._submit, self._withdraw_batch,
+                       window=min(APIConfig.BATCH_WINDOW, self.executor.max_workers),
+                       on_finished=self._on_batch_finished, on_paused=self._on_batch_paused, paused=paused)
+        self.batches[job.job_id] = job
+        if paused:
+            self.update_status(f"Batch {job.job_id}: {len(job)} actions paused")
+        else:
+            self.update_status(f"Batch {job.job_id}: {len(job)} actions queued")
+        job.feed()
+        return job
+
+    def resume_journal(self) -> BatchJob:
+        """Pick up the reply/like actions left unfinished when the app last stopped.
+
+        Returns them as one batch, started paused if any of them belonged to a
+        paused batch, or None if there were none.
+        """
+        resumed = []
+        paused = False
+        for record in self.journal.unfinished():
+            action_type, params = record['action'], dict(record['params'], retries=record.get('retries', 0))
+            if record['op'] == RETRY:
+                self.retry_scheduler.schedule(action_type, params, max(0.0, record['due'] - time.time()))
+            elif record['op'] == STARTED and action_type == 'reply':
+                # The reply may have been posted just before the app stopped; resending could duplicate it
+                self.journal.update(action_type, params['post_id'], journal.FAILED)
+                self.update_status(f"⚠️ Reply to post {params['post_id']} was interrupted and may have been "
+                                   f"sent; not resending it")
+            else:
+                # Likes are idempotent, so an interrupted like is simply sent again
+                resumed.append((action_type, params))
+                paused = paused or record.get('paused', False)
+        scheduled = len(self.retry_scheduler.pending())
+        if resumed or scheduled:
+            self.update_status(f"Resuming {len(resumed)} unfinished actions and {scheduled} scheduled retries")
+        return self._start_batch(resumed, paused=paused)
+
+    def batch_eta(self, job: BatchJob) -> float:
+        """Rough seconds left: per endpoint, the longer of the wait for quota and the calls themselves"""
+        eta = 0.0
+        for action_type, count in job.remaining_by_type().items():
+            quota_wait = self.accounts.time_until(action_type, count)
+            call_time = count * self.stats.get_avg_duration(action_type) / self.executor.limits[action_type]
+            eta = max(eta, quota_wait, call_time)
+        return eta
+
+    def _withdraw_batch(self, job: BatchJob, include_retries: bool) -> list:
+        def belongs(action_type, params):
+            return params.get('batch_id') == job.job_id
+        withdrawn = self.executor.withdraw(belongs)
+        if include_retries:
+            withdrawn += [retry.params for retry in
+                          self.retry_scheduler.cancel_matching(lambda retry: belongs(retry.action_type, retry.params))]
+        return withdrawn
+
+    def _start_action(self, action_type: str, params) -> bool:
+        """Called before a reply/like is sent; False means skip it (its batch was paused or cancelled)"""
+        job = self.batches.get(params.get('batch_id'))
+        if job is not None and not job.start_item(params['batch_item']):
+            # The executor took a token for this call, which won't be sent now
+            self.accounts.refund(action_type, params)
+            if job.state == CANCELLED:
+                self.journal.update(action_type, params['post_id'], journal.CANCELLED)
+                self._drop_batch(job)
+            return False
+        self.journal.update(action_type, params['post_id'], STARTED)
+        return True
+
+    def _finish_action(self, action_type: str, params, outcome: str, due: float = None):
+        if outcome == RETRYING:
+            self.journal.update(action_type, params['post_id'], RETRY, due=due, retries=params['retries'])
+        else:
+            self.journal.update(action_type, params['post_id'], outcome)
+            self.tracer.end(params, outcome)
+        job = self.batches.get(params.get('batch_id'))
+        if job:
+            job.finish_item(params['batch_item'], outcome)
+            self._drop_batch(job)
+
+    def _drop_batch(self, job: BatchJob):
+        # A cancelled job stays until its queued and in-flight actions have come back to it
+        if job.finished and not job.outstanding:
+            self.batches.pop(job.job_id, None)
+
+    def _on_batch_paused(self, job: BatchJob, paused: bool):
+        self.journal.set_paused([(item.action_type, item.params['post_id']) for item in job.items
+                                 if item.state not in FINISHED_STATES], paused)
+
+    def _on_batch_finished(self, job: BatchJob):
+        if job.state == CANCELLED:
+            cancelled = [item for item in job.items if item.state == CANCELLED]
+            self.journal.update_many([(item.action_type, item.params['post_id']) for item in cancelled],
+                                     journal.CANCELLED)
+            for item in cancelled:
+                self.tracer.end(item.params, CANCELLED)
+        self.update_status(job.format_progress())
+        self._drop_batch(job)
+
+    def cancel_retries(self, retry_ids=None) -> int:
+        """Cancel the given scheduled retries, or all of them"""
+        cancelled = self.retry_scheduler.cancel_matching(
+            lambda retry: retry_ids is None or retry.retry_id in retry_ids)
+        for retry in cancelled:
+            if retry.action_type in ('reply', 'like'):
+                self._finish_action(retry.action_type, retry.params, CANCELLED)
+        return len(cancelled)
+
+    def _submit(self, action_type: str, params: dict):
+        self.tracer.queued(action_type, params)
+        self.action_queue.put((action_type, params))
+
+    def is_idle(self, include_retries: bool = True) -> bool:
+        if include_retries:
+            return self.retry_scheduler.idle()
+        return not self.action_queue.unfinished_tasks
+
+    def wait_idle(self, timeout: float = None, include_retries: bool = True, poll_interval: float = 0.2) -> bool:
+        """Block until queued actions (and, optionally, scheduled retries) have finished"""
+        deadline = None if timeout is None else time.time() + timeout
+        while not self.is_idle(include_retries):
+            if deadline is not None and time.time() >= deadline:
+                return False
+            time.sleep(poll_interval)
+        return True
+
+    def build_search_query(self, params) -> str:
+        query = f"{params['keywords']} -is:retweet"
+        if params['verified_only']:
+            query += " is:verified"
+        if params['no_replies']:
+            query += " -is:reply"
+        return query
+
+    def _search_cache_key(self, params) -> str:
+        return SearchCache.make_key(self.build_search_query(params), params['start_time'],
+                                    params['end_time'], self.max_search_results)
+
+    def perform_search(self, params):
+        query, cacheable = self._begin_search(params)
+        collected = ([], []) if cacheable else None
+        start_time = time.time()
+        try:
+            for page_posts, page_users in self.iter_search_pages(query, params):
+                start_time = time.time()
+                self._receive_search_page(params, page_posts, page_users, collected)
+            self._complete_search(params, query, collected)
+        except Exception as e:
+            self._search_failed(params, query, e, start_time)
+
+    async def perform_search_async(self, params):
+        query, cacheable = self._begin_search(params)
+        collected = ([], []) if cacheable else None
+        start_time = time.time()
+        try:
+            async for page_posts, page_users in self.aiter_search_pages(query, params):
+                start_time = time.time()
+                self._receive_search_page(params, page_posts, page_users, collected)
+            await asyncio.to_thread(self._complete_search, params, query, collected)
+        except Exception as e:
+            await asyncio.to_thread(self._search_failed, params, query, e, start_time)
+
+    def _begin_search(self, params):
+        """Returns the query and whether its results can be cached"""
+        query = self.build_search_query(params)
+        if params['no_replies']:
+            self.update_status("ℹ️ Excluding replies from search results")
+        else:
+            self.update_status("ℹ️ Including replies in search results")
+
+        params.setdefault('fetched', 0)
+        params.setdefault('next_token', None)
+        # Only complete, non-incremental result sets are cacheable
+        cacheable = not params['next_token'] and not params.get('incremental')
+        if not params['next_token'] and params.get('incremental'):
+            resume = self.search_cursors.resume_point(query)
+            if resume:
+                # The last search stopped early; fetch the rest of its span before moving the cursor
+                params['since_id'] = resume['since_id']
+                params['until_id'] = resume['until_id']
+                params['span_newest_id'] = resume['newest_id']
+                self.update_status(f"ℹ️ Incremental search: continuing below post {resume['until_id']}, "
+                                   f"where the last search stopped")
+            else:
+                since_id = self.search_cursors.get(query)
+                if since_id:
+                    params['since_id'] = since_id
+                    self.update_status(f"ℹ️ Incremental search: only posts newer than {since_id}")
+        self.debug_log(f"Executing search: {query}")
+        self.update_status("Performing search...")
+        return query, cacheable
+
+    def _receive_search_page(self, params, page_posts, page_users, collected):
+        self.update_status(f"Received {len(page_posts)} posts ({params['fetched']} so far)")
+        if collected is not None:
+            collected[0].extend(page_posts)
+            collected[1].extend(page_users)
+        if self.on_search_page:
+            self.on_search_page(params, page_posts, page_users)
+
+    def _complete_search(self, params, query: str, collected):
+        newest_id = params.get('span_newest_id') or params.get('newest_id')
+        if not params['next_token'] and not params.get('truncated'):
+            # Every result was fetched, so nothing up to newest_id is left behind
+            if newest_id:
+                self.search_cursors.update(query, newest_id)
+        elif params.get('incremental') and params.get('oldest_id'):
+            self.search_cursors.save_resume_point(query, params.get('since_id'), params['oldest_id'], newest_id)
+        # Cache only results that ran to the end or to max_search_results, not ones cut short by the quota
+        if collected is not None and not params.get('quota_cut'):
+            self.search_cache.put(self._search_cache_key(params), *collected)
+        self.tracer.end(params, DONE)
+        self.update_status(f"Search completed. Found {params['fetched']} posts")
+        logger.info(f"Search successful: {params['fetched']} posts found")
+        if self.on_search_done:
+            self.on_search_done(params)
+
+    def _search_failed(self, params, query: str, e: Exception, start_time: float):
+        if isinstance(e, requests.exceptions.Timeout):
+            self.update_status("⚠️ Search request timed out. Will retry automatically...")
+            logger.warning("Search request timed out")
+            self.handle_retry('search', params, None, Exception("Timeout"), 'GET /2/tweets/search/recent', start_time)
+        elif isinstance(e, requests.exceptions.HTTPError):
+            error_details = self._format_api_error_details(
+                f"Search HTTP Error ({e.response.status_code})",
+                "GET /2/tweets/search/recent",
+                {'query': query, 'start_time': params['start_time'], 'end_time': params['end_time'],
+                 'next_token': params['next_token']},
+                e.response,
+                str(e)
+            )
+            if e.response.status_code == 429:
+                self.update_status(f"⚠️ Rate limit exceeded: {error_details}")
+            else:
+                self.update_status(f"⚠️ Search failed: {error_details}")
+            logger.error(f"Search HTTP error: {e}")
+            self.handle_retry('search', params, e.response, e, 'GET /2/tweets/search/recent', start_time)
+        else:
+            self.update_status(f"⚠️ Search failed: {str(e)}. Will retry automatically...")
+            logger.error(f"Search error: {e}")
+            self.handle_retry('search', params, None, e, 'GET /2/tweets/search/recent', start_time)
+
+    def iter_search_pages(self, query: str, params: dict):
+        """Yield (posts, users) for each result page, following meta.next_token.
+
+        Stops at max_search_results posts or when the search quota runs out.
+        params['fetched'] and params['next_token'] record progress, so a retry
+        after a failed page continues from that page.
+        """
+        first_page = True
+        while self._can_fetch_search_page(params, first_page):
+            request_params = self._search_request_params(query, params)
+
+            def search_call():
+                self._announce_search(query, params)
+                response = self.session.get(APIConfig.SEARCH_ENDPOINT, headers=self.search_headers,
+                                            params=request_params, timeout=HTTPConfig.TIMEOUT)
+                response.raise_for_status()
+                return read_json(response)
+
+            try:
+                payload, success = self.execute_api_call(search_call, 'GET /2/tweets/search/recent', params)
+            finally:
+                if not first_page:
+                    self.rate_limiter.release('search')
+            first_page = False
+
+            yield self._take_search_page(params, payload)
+            if not params['next_token']:
+                return
+
+    async def aiter_search_pages(self, query: str, params: dict):
+        """Async counterpart of iter_search_pages"""
+        first_page = True
+        while self._can_fetch_search_page(params, first_page):
+            request_params = self._search_request_params(query, params)
+
+            async def search_call():
+                self._announce_search(query, params)
+                return await self.async_client.search(request_params)
+
+            try:
+                payload, success = await self.execute_api_call_async(search_call, 'GET /2/tweets/search/recent', params)
+            finally:
+                if not first_page:
+                    self.rate_limiter.release('search')
+            first_page = False
+
+            yield self._take_search_page(params, payload)
+            if not params['next_token']:
+                return
+
+    def _can_fetch_search_page(self, params: dict, first_page: bool) -> bool:
+        if params['fetched'] >= self.max_search_results:
+            return False
+        # The executor already took a token for the first page
+        if not first_page and self.rate_limiter.try_acquire('search') > 0:
+            params['quota_cut'] = True
+            self.update_status(f"Search quota used up after {params['fetched']} posts; "
+                               f"remaining pages skipped")
+            return False
+        return True
+
+    def _search_request_params(self, query: str, params: dict) -> dict:
+        request_params = {
+            "query": query,
+            "start_time": params['start_time'],
+            "end_time": params['end_time'],
+            # The API accepts 10-100 results per page
+            "max_results": min(100, max(10, self.max_search_results - params['fetched'])),
+            "tweet.fields": "created_at",
+            "expansions": "author_id",
+            "user.fields": "username"
+        }
+        if params['next_token']:
+            request_params["next_token"] = params['next_token']
+        if params.get('since_id'):
+            # since_id already bounds the window from below
+            request_params["since_id"] = params['since_id']
+            del request_params["start_time"]
+        if params.get('until_id'):
+            # and until_id from above
+            request_params["until_id"] = params['until_id']
+            del request_params["end_time"]
+        return request_params
+
+    def _announce_search(self, query: str, params: dict):
+        self.update_status("Sending search request to Twitter API...")
+        logger.info(f"Search query: {query}, start_time: {params['start_time']}, end_time: {params['end_time']}")
+
+    def _take_search_page(self, params: dict, payload: dict):
+        """Record a page's progress in params and return its (posts, users)"""
+        meta = payload.get('meta', {})
+        # Pages run newest to oldest, so the first page carries the newest id
+        params.setdefault('newest_id', meta.get('newest_id'))
+        data = payload.get('data', [])
+        page_posts = data[:self.max_search_results - params['fetched']]
+        params['fetched'] += len(page_posts)
+        params['next_token'] = meta.get('next_token')
+        # A page cut at max_search_results leaves results behind even without a next_token
+        params['truncated'] = len(page_posts) < len(data)
+        if page_posts:
+            # Where an incremental search cut short picks up next time
+            params['oldest_id'] = page_posts[-1]['id']
+        return page_posts, payload.get('includes', {}).get('users', [])
+
+    def perform_reply(self, params):
+        if not self._start_action('reply', params):
+            return
+        client = self.ensure_client(params.get('account'))
+        if not client:
+            self._finish_action('reply', params, FAILED)
+            return
+        start_time = time.time()
+
+        def reply_call():
+            self._announce_action('reply', params)
+            return client.create_tweet(text=params['text'], in_reply_to_tweet_id=params['post_id'])
+
+        try:
+            self.execute_api_call(reply_call, 'POST /2/tweets', params)
+            self._action_succeeded('reply', params)
+        except Exception as e:
+            self._action_failed('reply', params, e, start_time)
+
+    def perform_like(self, params):
+        if not self._start_action('like', params):
+            return
+        client = self.ensure_client(params.get('account'))
+        if not client:
+            self._finish_action('like', params, FAILED)
+            return
+        start_time = time.time()
+
+        def like_call():
+            self._announce_action('like', params)
+            return client.like(params['post_id'])
+
+        try:
+            self.execute_api_call(like_call, 'POST /2/users/:id/likes', params)
+            self._action_succeeded('like', params)
+        except Exception as e:
+            self._action_failed('like', params, e, start_time)
+
+    async def perform_reply_async(self, params):
+        if not await asyncio.to_thread(self._start_action, 'reply', params):
+            return
+        start_time = time.time()
+
+        async def reply_call():
+            self._announce_action('reply', params)
+            return await self.accounts.get(params.get('account')).async_client.create_tweet(
+                text=params['text'], in_reply_to_tweet_id=params['post_id'])
+
+        try:
+            await self.execute_api_call_async(reply_call, 'POST /2/tweets', params)
+            await asyncio.to_thread(self._action_succeeded, 'reply', params)
+        except Exception as e:
+            await asyncio.to_thread(self._action_failed, 'reply', params, e, start_time)
+
+    async def perform_like_async(self, params):
+        if not await asyncio.to_thread(self._start_action, 'like', params):
+            return
+        start_time = time.time()
+
+        async def like_call():
+            self._announce_action('like', params)
+            return await self.accounts.get(params.get('account')).async_client.like(params['post_id'])
+
+        try:
+            await self.execute_api_call_async(like_call, 'POST /2/users/:id/likes', params)
+            await asyncio.to_thread(self._action_succeeded, 'like', params)
+        except Exception as e:
+            await asyncio.to_thread(self._action_failed, 'like', params, e, start_time)
+
+    def _announce_action(self, action_type: str, params):
+        account = f" as account {params['account']}" if len(self.accounts) > 1 and params.get('account') else ""
+        self.debug_log(f"{ACTION_VERBS[action_type][0]} post {params['post_id']}{account}")
+        self.update_status(f"Preparing to {action_type} post {params['post_id']}...")
+        self.update_status(f"Sending {action_type} to Twitter API...")
+        if action_type == 'reply':
+            logger.info(f"Replying to post {params['post_id']} with text: {params['text'][:50]}...")
+        else:
+            logger.info(f"Liking post {params['post_id']}")
+
+    def _action_succeeded(self, action_type: str, params):
+        label = action_type.capitalize()
+        self.update_status(f"{label} API call completed, processing response...")
+        self.update_status(f"Successfully {ACTION_VERBS[action_type][1]} post {params['post_id']}")
+        logger.info(f"{label} successful for post {params['post_id']}")
+        self._finish_action(action_type, params, DONE)
+
+    def _action_failed(self, action_type: str, params, e: Exception, start_time: float):
+        label = action_type.capitalize()
+        call_ref = APIConfig.API_REFS[action_type]
+        # Create request details for error formatting
+        if action_type == 'reply':
+            request_details = {
+                'text': params['text'][:50] + "..." if len(params['text']) > 50 else params['text'],
+                'in_reply_to_tweet_id': params['post_id']
+            }
+        else:
+            request_details = {'tweet_id': params['post_id']}
+
+        response = getattr(e, 'response', None)
+        error_details = self._format_api_error_details(f"{label} Error", call_ref, request_details, response, str(e))
+
+        # Check if it's a rate limit error
+        if response is not None and response.status_code == 429:
+            self.update_status(f"⚠️ {label} rate limit exceeded: {error_details}")
+        else:
+            self.update_status(f"⚠️ {label} failed: {error_details}")
+
+        logger.error(f"{label} failed for post {params['post_id']}: {str(e)}")
+        due = self.handle_retry(action_type, params, response, e, call_ref, start_time)
+        self._finish_action(action_type, params, RETRYING if due else FAILED, due)
+
+    def calculate_retry_delay(self, response, call_type: str, retries: int):
+        if response and hasattr(response, 'status_code') and response.status_code == 429:
+            # Rate limit exceeded, use reset time from headers
+            reset_time = response.headers.get('X-Rate-Limit-Reset')
+            if reset_time:
+                try:
+                    reset_timestamp = int(reset_time)
+                    current_time = int(time.time())
+                    delay = max(0, reset_timestamp - current_time)
+                    self.update_status(f"Rate limit exceeded. Retrying in {delay} seconds (at {datetime.datetime.fromtimestamp(reset_timestamp).strftime('%H:%M:%S')})")
+                    return delay
+                except (ValueError, TypeError):
+                    pass
+
+        # Use configurable retry times when API doesn't provide reset time
+        if call_type == 'search':
+            delay = self.search_retry_minutes * 60
+        elif call_type == 'like':
+            delay = self.like_retry_minutes * 60
+        elif call_type == 'reply':
+            delay = self.reply_retry_hours * 60 * 60
+        else:
+            delay = 300  # 5 minutes default
+
+        retry_time = datetime.datetime.now() + datetime.timedelta(seconds=delay)
+        self.update_status(f"Using configured retry time. Will retry {call_type} in {delay} seconds (at {retry_time.strftime('%H:%M:%S')})")
+        return delay
+
+    def handle_retry(self, action_type: str, params, response, exception, call_ref: str, start_time: float):
+        """Schedule another attempt; returns its due time, or None once retries are used up.
+
+        The failed call itself was already logged, with its status and error, by execute_api_call.
+        """
+        retries = params.get('retries', 0)
+
+        if retries >= APIConfig.MAX_RETRIES:
+            self.update_status(f"❌ Max retries ({APIConfig.MAX_RETRIES}) reached for {action_type}. Operation failed.")
+            self.tracer.end(params, FAILED)
+            logger.error(f"Max retries reached for {action_type} on {call_ref}")
+            if self.on_action_failed:
+                self.on_action_failed(action_type, params)
+            return None
+
+        # Reschedule at its own due time; the worker is free for other actions meanwhile
+        delay = self.calculate_retry_delay(response, action_type, retries)
+        params['retries'] = retries + 1
+        self.tracer.retry_scheduled(params, delay)
+        self.retry_scheduler.schedule(action_type, params, delay)
+        return time.time() + delay
+
+    def execute_api_call(self, call_func, call_ref: str, params: dict = None):
+        start_time = time.time()
+        begin_request_timings()
+        try:
+            response = call_func()
+        except Exception as e:
+            self._record_api_call(params, call_ref, start_time, time.time(), end_request_timings(), error=e)
+            raise e
+        self._record_api_call(params, call_ref, start_time, time.time(), end_request_timings(), response)
+        return response, True
+
+    async def execute_api_call_async(self, call_func, call_ref: str, params: dict = None):
+        start_time = time.time()
+        timings = []
+        token = async_client.request_timings.set(timings)
+        try:
+            response = await call_func()
+        except Exception as e:
+            # Logging appends to the call log (and may fsync or rotate it), so it runs off the loop
+            await asyncio.to_thread(self._record_api_call, params, call_ref, start_time, time.time(), timings,
+                                    error=e)
+            raise e
+        finally:
+            async_client.request_timings.reset(token)
+        await asyncio.to_thread(self._record_api_call, params, call_ref, start_time, time.time(), timings, response)
+        return response, True
+
+    def _record_api_call(self, params, call_ref: str, start_time: float, end_time: float, timings: list,
+                         response=None, error=None):
+        """Log and trace one API call; timings come from the HTTP layer, the last one being the final request"""
+        self.logger.log_call(call_ref, end_time - start_time, response if error is None else None,
+                             timings[-1] if timings else None, error)
+        if params is None:
+            return
+        status_response = getattr(error, 'response', None) if error is not None else response
+        self.tracer.api_call(params, call_ref, start_time, end_time, timings,
+                             status_code=getattr(status_response, 'status_code', None),
+                             error=type(error).__name__ if error is not None else None)
+
+    def ensure_client(self, account_name: str = None):
+        """The named (or first) account's client, created on first use; None if that failed"""
+        client = self.accounts.get(account_name).ensure_client()
+        if not client:
+            self.update_status("API reconnection failed")
+        return client
+
+    def _on_action_dispatched(self, action_type: str, params, rate_wait: float):
+        self.tracer.dispatched(params, rate_wait)
+
+    def _on_action_paced(self, action_type: str, wait: float, waiting: int):
+        resume_at = datetime.datetime.now() + datetime.timedelta(seconds=wait)
+        self.update_status(f"⏳ {action_type.capitalize()} quota used up; {waiting} queued, "
+                           f"next call at {resume_at.strftime('%H:%M:%S')}")
+
+
+    def _on_actions_idle(self):
+        pending = len(self.retry_scheduler.pending())
+        if pending:
+            self.update_status(f"All queued actions completed, {pending} retries pending")
+        else:
+            self.update_status("All actions completed")
+
+
+    def _format_api_error_details(self, error_type, endpoint, request_params, response, error_message):
+        """Format comprehensive API error details for better debugging"""
+        details = f"{error_type}: {error_message}"
+
+        # Add request information
+        details += f"\n📡 Endpoint: {endpoint}"
+
+        if request_params:
+            # Mask sensitive information
+            safe_params = {}
+            for key, value in request_params.items():
+                if 'token' in key.lower() or 'key' in key.lower():
+                    safe_params[key] = "***MASKED***"
+                else:
+                    safe_params[key] = value
+            details += f"\n📋 Parameters: {safe_params}"
+
+        # Add response information if available
+        if response:
+            details += f"\n📊 Status Code: {response.status_code}"
+
+            # Add specific troubleshooting for common errors
+            if response.status_code == 400:
+                details += "\n🚨 400 Bad Request - Common causes:"
+                details += "\n   • Invalid request parameters or malformed data"
+                details += "\n   • Tweet text too long or contains invalid characters"
+                details += "\n   • Invalid date format in search parameters"
+                details += "\n   • Duplicate tweet content"
+                details += "\n💡 Check your input data and try again"
+            elif response.status_code == 403:
+                details += "\n🚫 403 Forbidden - Common causes:"
+                details += "\n   • Missing write permissions for likes/replies"
+                details += "\n   • Tweet is protected/private"
+                details += "\n   • Account suspended or restricted"
+                details += "\n   • Missing OAuth write scope"
+                details += "\n💡 Check your app permissions and tweet visibility"
+
+            # Try to get Twitter API error details
+            try:
+                if hasattr(response, 'json'):
+                    error_data = response.json()
+                    if 'errors' in error_data and error_data['errors']:
+                        api_error = error_data['errors'][0]
+                        if 'message' in api_error:
+                            details += f"\n❌ API Message: {api_error['message']}"
+                        if 'code' in api_error:
+                            details += f"\n🔢 Error Code: {api_error['code']}"
+                            # Add documentation link for common errors
+                            doc_link = self._get_error_documentation_link(api_error['code'])
+                            if doc_link:
+                                details += f"\n📖 Documentation: {doc_link}"
+
+                            # Add specific troubleshooting for common error codes
+                            troubleshooting = self._get_error_troubleshooting(api_error['code'])
+                            if troubleshooting:
+                                details += f"\n🔧 Troubleshooting: {troubleshooting}"
+            except Exception:
+                pass
+
+            # Add rate limit information if available
+            if hasattr(response, 'headers'):
+                rate_limit_remaining = response.headers.get('X-Rate-Limit-Remaining')
+                rate_limit_reset = response.headers.get('X-Rate-Limit-Reset')
+                if rate_limit_remaining:
+                    details += f"\n⏱️ Rate Limit Remaining: {rate_limit_remaining}"
+                if rate_limit_reset:
+                    try:
+                        reset_time = datetime.datetime.fromtimestamp(int(rate_limit_reset))
+                        details += f"\n🔄 Rate Limit Resets: {reset_time.strftime('%H:%M:%S UTC')}"
+                    except:
+                        details += f"\n🔄 Rate Limit Reset: {rate_limit_reset}"
+
+        return details
+
+    def _get_error_documentation_link(self, error_code):
+        """Get documentation link for common Twitter API error codes"""
+        error_links = {
+            32: "https://developer.twitter.com/en/docs/authentication/api-reference/authenticate",
+            34: "https://developer.twitter.com/en/docs/twitter-api/v2/tweets/lookup/api-reference/get-tweets-id",
+            36: "https://developer.twitter.com/en/docs/twitter-api/v2/tweets/manage-tweets/api-reference/post-tweets",
+            44: "https://developer.twitter.com/en/docs/twitter-api/v2/tweets/manage-tweets/api-reference/post-tweets",
+            64: "https://developer.twitter.com/en/docs/twitter-api/v2/tweets/manage-tweets/api-reference/post-tweets",
+            88: "https://developer.twitter.com/en/docs/rate-limits",
+            89: "https://developer.twitter.com/en/docs/authentication/oauth-2-0/authorization-code",
+            99: "https://developer.twitter.com/en/docs/authentication/oauth-2-0/authorization-code",
+            130: "https://developer.twitter.com/en/docs/twitter-api/v2/tweets/search/api-reference/get-tweets-search-recent",
+            131: "https://developer.twitter.com/en/docs/twitter-api/v2/tweets/search/api-reference/get-tweets-search-recent",
+            135: "https://developer.twitter.com/en/docs/authentication/api-reference/authenticate",
+            144: "https://developer.twitter.com/en/docs/twitter-api/v2/tweets/manage-tweets/api-reference/delete-tweets-id",
+            179: "https://developer.twitter.com/en/docs/twitter-api/v2/tweets/lookup/api-reference/get-tweets-id",
+            185: "https://developer.twitter.com/en/docs/twitter-api/v2/tweets/manage-tweets/api-reference/post-tweets",
+            186: "https://developer.twitter.com/en/docs/twitter-api/v2/tweets/manage-tweets/api-reference/post-tweets",
+            187: "https://developer.twitter.com/en/docs/twitter-api/v2/tweets/manage-tweets/api-reference/post-tweets",
+            200: "https://developer.twitter.com/en/docs/twitter-api/v2/tweets/manage-tweets/api-reference/post-tweets",
+            220: "https://developer.twitter.com/en/docs/rate-limits",
+            226: "https://developer.twitter.com/en/docs/twitter-api/v2/tweets/filtered-stream/api-reference/get-tweets-search-stream",
+            261: "https://developer.twitter.com/en/docs/twitter-api/v2/tweets/manage-tweets/api-reference/post-tweets",
+            326: "https://developer.twitter.com/en/docs/twitter-api/v2/tweets/manage-tweets/api-reference/post-tweets",
+            327: "https://developer.twitter.com/en/docs/twitter-api/v2/tweets/manage-tweets/api-reference/post-tweets",
+            349: "https://developer.twitter.com/en/docs/authentication/oauth-2-0/authorization-code",
+            415: "https://developer.twitter.com/en/docs/twitter-api/v2/tweets/manage-tweets/api-reference/post-tweets",
+            416: "https://developer.twitter.com/en/docs/twitter-api/v2/tweets/manage-tweets/api-reference/post-tweets"
+        }
+        return error_links.get(error_code)
+
+    def _get_error_troubleshooting(self, error_code):
+        """Get specific troubleshooting steps for common Twitter API error codes"""
+        troubleshooting = {
+            32: "Your app's API keys are invalid. Regenerate them in the Twitter Developer Portal.",
+            34: "The tweet you're trying to access doesn't exist or has been deleted.",
+            36: "You don't have permission to perform this action on this tweet.",
+            44: "This tweet has already been liked by your account.",
+            64: "Your account is suspended and cannot perform write actions.",
+            88: "Rate limit exceeded. Wait for the reset time shown above, or upgrade your API plan.",
+            89: "Your access token has expired. Re-authenticate your application.",
+            99: "Unable to verify your credentials. Check your API keys and access tokens.",
+            130: "Twitter is temporarily over capacity. Wait a few minutes and try again.",
+            131: "Internal Twitter error. This is usually temporary - try again later.",
+            135: "Authentication failed. Check your API keys, tokens, and OAuth flow.",
+            144: "The tweet you're trying to delete doesn't exist or isn't yours to delete.",
+            179: "You don't have permission to view this tweet (it's protected).",
+            185: "You are posting too frequently. Wait before posting again.",
+            186: "Your tweet is too long. Shorten it to fit within Twitter's character limit.",
+            187: "You're trying to post a duplicate tweet. Twitter doesn't allow exact duplicates.",
+            200: "You can't reply to a tweet that doesn't allow replies.",
+            220: "Your credentials don't have the required permissions for this action.",
+            226: "This request looks like it might be automated. Twitter may have flagged your activity.",
+            261: "Application cannot perform write actions. Check your app permissions in Developer Portal.",
+            326: "You have been temporarily locked out due to unusual activity. Wait and try again.",
+            327: "You cannot reply to this tweet (it may be from a blocked account).",
+            349: "You don't have the correct OAuth scope for this operation.",
+            415: "Unsupported media type. Check your file format and try again.",
+            416: "The tweet you're trying to reply to doesn't exist."
+        }
+        return troubleshooting.get(error_code)
@@ -0,0 +1,279 @@
+import heapq
+import itertools
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from queue import Queue, Empty
+from typing import Callable, Dict
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+class ActionExecutor:
+    """Runs queued actions on a bounded worker pool.
+
+    A dispatcher thread blocks on the action queue and hands each action to
+    the pool as long as its endpoint is below its concurrency limit and, when
+    a rate limiter is given, has quota left. Other actions wait in a
+    per-endpoint backlog so they don't hold up other endpoints. The rate
+    limiter (accounts.AccountPool) is asked with try_acquire(action_type,
+    params) and told the call finished with release(action_type, params);
+    a handler that skips its action refunds the token itself.
+
+    With an event loop (async_client.LoopThread), handlers are coroutine
+    functions run on that loop instead of the pool, so an in-flight call costs
+    no thread of its own.
+
+    on_dispatch(action_type, params, rate_wait) is called as each action is
+    handed out, with the seconds it spent held back by the rate limiter.
+    """
+
+    def __init__(self, action_queue: Queue, handlers: Dict[str, Callable], max_workers: int,
+                 serial_actions=('search',), on_idle: Callable = None, rate_limiter=None,
+                 on_paced: Callable = None, loop=None, on_dispatch: Callable = None):
+        self.action_queue = action_queue
+        self.handlers = handlers
+        self.max_workers = max_workers
+        self.serial_actions = set(serial_actions)
+        self.on_idle = on_idle
+        self.rate_limiter = rate_limiter
+        self.on_paced = on_paced
+        self.on_dispatch = on_dispatch
+        self._timers = {}
+        # Per endpoint, total seconds spent paced by the rate limiter, and since when if paced now
+        self._paced_total = {action_type: 0.0 for action_type in handlers}
+        self._paced_since = {}
+        self.loop = loop
+        self.pool = None if loop else ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="action")
+        self.limits = {action_type: 1 for action_type in handlers}
+        self.active = {action_type: 0 for action_type in handlers}
+        self.backlog = {action_type: deque() for action_type in handlers}
+        self._lock = threading.Lock()
+        self._dispatcher = threading.Thread(target=self._dispatch, name="action-dispatcher", daemon=True)
+
+    def start(self):
+        self._dispatcher.start()
+
+    def set_rate_budget(self, limits: dict):
+        """Cap per-endpoint concurrency at the pool size or the endpoint's rate limit, whichever is lower"""
+        with self._lock:
+            for action_type in self.handlers:
+                if action_type in self.serial_actions or action_type not in limits:
+                    self.limits[action_type] = 1
+                else:
+                    self.limits[action_type] = max(1, min(self.max_workers, limits[action_type]['limit']))
+                self._drain(action_type)
+
+    def _dispatch(self):
+        while True:
+            item = self.action_queue.get()
+            if item is _STOP:
+                self.action_queue.task_done()
+                return
+            action_type, params = item
+            with self._lock:
+                self.backlog[action_type].append((params, self._paced_clock(action_type)))
+                self._drain(action_type)
+
+    def _paced_clock(self, action_type: str) -> float:
+        # Caller holds self._lock
+        since = self._paced_since.get(action_type)
+        return self._paced_total[action_type] + (time.monotonic() - since if since is not None else 0.0)
+
+    def _drain(self, action_type: str):
+        # Caller holds self._lock
+        backlog = self.backlog[action_type]
+        while backlog and self.active[action_type] < self.limits[action_type]:
+            params, paced_clock = backlog[0]
+            if self.rate_limiter:
+                wait = self.rate_limiter.try_acquire(action_type, params)
+                if wait > 0:
+                    self._drain_later(action_type, wait)
+                    return
+            backlog.popleft()
+            if self.on_dispatch:
+                self.on_dispatch(action_type, params, self._paced_clock(action_type) - paced_clock)
+            self.active[action_type] += 1
+            if self.loop:
+                self.loop.submit(self._run_async(action_type, params))
+            else:
+                self.pool.submit(self._run, action_type, params)
+
+    def _drain_later(self, action_type: str, wait: float):
+        # Caller holds self._lock; one pending timer per endpoint
+        if action_type in self._timers:
+            return
+        timer = threading.Timer(wait, self._on_timer, args=(action_type,))
+        timer.daemon = True
+        self._timers[action_type] = timer
+        self._paced_since[action_type] = time.monotonic()
+        timer.start()
+        if self.on_paced:
+            self.on_paced(action_type, wait, len(self.backlog[action_type]))
+
+    def _on_timer(self, action_type: str):
+        with self._lock:
+            self._timers.pop(action_type, None)
+            since = self._paced_since.pop(action_type, None)
+            if since is not None:
+                self._paced_total[action_type] += time.monotonic() - since
+            self._drain(action_type)
+
+    def _run(self, action_type: str, params):
+        try:
+            self.handlers[action_type](params)
+        except Exception as e:
+            logger.error(f"Unhandled error in {action_type} action: {e}")
+        finally:
+            self._finish(action_type, params)
+
+    async def _run_async(self, action_type: str, params):
+        try:
+            await self.handlers[action_type](params)
+        except Exception as e:
+            logger.error(f"Unhandled error in {action_type} action: {e}")
+        finally:
+            self._finish(action_type, params)
+
+    def _finish(self, action_type: str, params):
+        if self.rate_limiter:
+            self.rate_limiter.release(action_type, params)
+        with self._lock:
+            self.active[action_type] -= 1
+            self._drain(action_type)
+            idle = self._is_idle()
+        self.action_queue.task_done()
+        if idle and self.on_idle:
+            self.on_idle()
+
+    def _is_idle(self) -> bool:
+        return (not any(self.active.values()) and not any(self.backlog.values())
+                and self.action_queue.empty())
+
+    def clear_pending(self) -> int:
+        """Drop queued and backlogged actions; in-flight calls finish normally"""
+        dropped = 0
+        while True:
+            try:
+                self.action_queue.get_nowait()
+            except Empty:
+                break
+            self.action_queue.task_done()
+            dropped += 1
+        with self._lock:
+            for timer in self._timers.values():
+                timer.cancel()
+            self._timers.clear()
+            self._paced_since.clear()
+            for backlog in self.backlog.values():
+                for _ in range(len(backlog)):
+                    backlog.popleft()
+                    self.action_queue.task_done()
+                    dropped += 1
+        return dropped
+
+    def withdraw(self, predicate: Callable) -> list:
+        """Remove backlogged actions for which predicate(action_type, params) is true; returns their params"""
+        removed = []
+        with self._lock:
+            for action_type, backlog in self.backlog.items():
+                kept, matched = [], []
+                for entry in backlog:
+                    (matched if predicate(action_type, entry[0]) else kept).append(entry)
+                if not matched:
+                    continue
+                for _ in matched:
+                    self.action_queue.task_done()
+                backlog.clear()
+                backlog.extend(kept)
+                removed.extend(params for params, _ in matched)
+        return removed
+
+    def shutdown(self):
+        self.clear_pending()
+        self.action_queue.put(_STOP)
+        if self.pool:
+            self.pool.shutdown(wait=False)
+
+class PendingRetry:
+    __slots__ = ('retry_id', 'action_type', 'params', 'due', 'delay')
+
+    def __init__(self, retry_id: int, action_type: str, params: dict, due: float, delay: float):
+        self.retry_id = retry_id
+        self.action_type = action_type
+        self.params = params
+        self.due = due
+        self.delay = delay
+
+    def remaining(self, now: float = None) -> float:
+        return max(0.0, self.due - (now or time.time()))
+
+class RetryScheduler:
+    """Heap-ordered delayed queue that re-queues each failed action at its own due time"""
+
+    def __init__(self, action_queue: Queue):
+        self.action_queue = action_queue
+        self._heap = []
+        self._entries = {}
+        self._ids = itertools.count(1)
+        self._cond = threading.Condition()
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="retry-scheduler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def schedule(self, action_type: str, params: dict, delay: float) -> int:
+        with self._cond:
+            retry = PendingRetry(next(self._ids), action_type, params, time.time() + delay, delay)
+            self._entries[retry.retry_id] = retry
+            heapq.heappush(self._heap, (retry.due, retry.retry_id))
+            self._cond.notify()
+            return retry.retry_id
+
+    def cancel_matching(self, predicate: Callable) -> list:
+        """Cancel the retries for which predicate(retry) is true; returns the cancelled PendingRetry objects"""
+        # Heap entries are dropped lazily when they reach the top
+        with self._cond:
+            matches = [retry for retry in self._entries.values() if predicate(retry)]
+            for retry in matches:
+                del self._entries[retry.retry_id]
+            return matches
+
+    def pending(self) -> list:
+        with self._cond:
+            return sorted(self._entries.values(), key=lambda retry: retry.due)
+
+    def idle(self) -> bool:
+        """True when no retry is scheduled and every queued action has finished.
+
+        Checked under the scheduler lock, so a retry moving from the heap to
+        the queue is always seen in one place or the other.
+        """
+        with self._cond:
+            return not self._entries and not self.action_queue.unfinished_tasks
+
+    def _run(self):
+        with self._cond:
+            while self._running:
+                while self._heap and self._heap[0][1] not in self._entries:
+                    heapq.heappop(self._heap)
+                if not self._heap:
+                    self._cond.wait()
+                    continue
+                due, retry_id = self._heap[0]
+                wait = due - time.time()
+                if wait > 0:
+                    self._cond.wait(wait)
+                    continue
+                heapq.heappop(self._heap)
+                retry = self._entries.pop(retry_id)
+                self.action_queue.put((retry.action_type, retry.params))
+
+    def stop(self):
+        with self._cond:
+            self._running = False
+            self._cond.notify()
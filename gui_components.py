@@ -1,4 +1,6 @@
+import threading
 import tkinter as tk
+from collections import deque
 from tkinter import ttk, messagebox
 from tkinter.scrolledtext import ScrolledText
 from config import GUIConfig, RateLimits
@@ -25,7 +27,7 @@ class OptionsWindow:
         ttk.Checkbutton(content_frame, text="Exclude replies in search", variable=self.no_replies_var).pack(anchor="w")
 
         ttk.Label(content_frame, text="Max Search Results:", font=bold_font).pack(anchor="w", pady=(GUIConfig.PADY * 2, GUIConfig.PADY))
-        self.max_results_var = tk.StringVar(value=str(self.app.max_search_results))
+        self.max_results_var = tk.StringVar(value=str(self.app.engine.max_search_results))
         ttk.Entry(content_frame, textvariable=self.max_results_var, width=10).pack(anchor="w")
 
         ttk.Label(content_frame, text="Retry Times:", font=bold_font).pack(anchor="w", pady=(GUIConfig.PADY * 2, GUIConfig.PADY))
@@ -34,21 +36,21 @@ class OptionsWindow:
         search_frame = ttk.Frame(content_frame)
         search_frame.pack(fill="x", pady=(0, GUIConfig.PADY))
         ttk.Label(search_frame, text="Search retry (minutes):").pack(side="left")
-        self.search_retry_var = tk.StringVar(value=str(self.app.search_retry_minutes))
+        self.search_retry_var = tk.StringVar(value=str(self.app.engine.search_retry_minutes))
         ttk.Entry(search_frame, textvariable=self.search_retry_var, width=10).pack(side="right")
 
         # Like retry
         like_frame = ttk.Frame(content_frame)
         like_frame.pack(fill="x", pady=(0, GUIConfig.PADY))
         ttk.Label(like_frame, text="Like retry (minutes):").pack(side="left")
-        self.like_retry_var = tk.StringVar(value=str(self.app.like_retry_minutes))
+        self.like_retry_var = tk.StringVar(value=str(self.app.engine.like_retry_minutes))
         ttk.Entry(like_frame, textvariable=self.like_retry_var, width=10).pack(side="right")
 
         # Reply retry
         reply_frame = ttk.Frame(content_frame)
         reply_frame.pack(fill="x", pady=(0, GUIConfig.PADY))
         ttk.Label(reply_frame, text="Reply retry (hours):").pack(side="left")
-        self.reply_retry_var = tk.StringVar(value=str(self.app.reply_retry_hours))
+        self.reply_retry_var = tk.StringVar(value=str(self.app.engine.reply_retry_hours))
         ttk.Entry(reply_frame, textvariable=self.reply_retry_var, width=10).pack(side="right")
 
         ttk.Label(content_frame, text="Debug Options:", font=bold_font).pack(anchor="w", pady=(GUIConfig.PADY * 2, GUIConfig.PADY))
@@ -57,6 +59,44 @@ class OptionsWindow:
 
         ttk.Button(content_frame, text="Close", command=self.window.destroy).pack(anchor="w", pady=GUIConfig.PADY * 2)
 
+class BufferedStatusLog:
+    """Collects status lines from any thread and writes them to a Text widget in one insert per frame.
+
+    Only the newest max_lines lines are kept, both in the pending buffer and in the widget.
+    """
+
+    def __init__(self, root, text_widget: tk.Text, interval_ms: int = GUIConfig.STATUS_FLUSH_MS,
+                 max_lines: int = GUIConfig.STATUS_MAX_LINES):
+        self.root = root
+        self.text = text_widget
+        self.interval_ms = interval_ms
+        self.max_lines = max_lines
+        self._pending = deque(maxlen=max_lines)
+        self._lock = threading.Lock()
+        self.root.after(self.interval_ms, self._flush)
+
+    def write(self, message: str):
+        with self._lock:
+            self._pending.append(f"[{get_timestamp()}] {message}")
+
+    def _flush(self):
+        with self._lock:
+            lines = list(self._pending)
+            self._pending.clear()
+        if lines:
+            try:
+                self.text.config(state="normal")
+                self.text.insert(tk.END, "\n".join(lines) + "\n")
+                # The Text always ends with an empty line after the last newline
+                excess = int(self.text.index("end-1c").split(".")[0]) - 1 - self.max_lines
+                if excess > 0:
+                    self.text.delete("1.0", f"{excess + 1}.0")
+                self.text.see(tk.END)
+                self.text.config(state="disabled")
+            except tk.TclError:
+                return  # Widget destroyed
+        self.root.after(self.interval_ms, self._flush)
+
 class StatusWindow:
     def __init__(self, parent, x: int, y: int):
         self.window = tk.Toplevel(parent)
@@ -67,12 +107,10 @@ class StatusWindow:
         self.text = ScrolledText(self.window, height=20, width=80, wrap=tk.WORD)
         self.text.pack(fill="both", expand=True, padx=GUIConfig.PADDING, pady=GUIConfig.PADDING)
         self.text.config(state="disabled")
+        self.log = BufferedStatusLog(self.window, self.text)
 
     def update(self, message: str):
-        self.text.config(state="normal")
-        self.text.insert(tk.END, f"[{get_timestamp()}] {message}\n")
-        self.text.see(tk.END)
-        self.text.config(state="disabled")
+        self.log.write(message)
 
     def on_close(self):
         self.window.withdraw()
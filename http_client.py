@@ -0,0 +1,148 @@
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from config import APIConfig, HTTPConfig
+from rate_limiter import request_info
+
+_local = threading.local()
+
+class _TimedHTTPConnection(HTTPConnection):
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            _local.connect_time = getattr(_local, 'connect_time', 0.0) + time.perf_counter() - start
+
+class _TimedHTTPSConnection(HTTPSConnection):
+    def connect(self):
+        # DNS, TCP and TLS handshake together
+        start = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            _local.connect_time = getattr(_local, 'connect_time', 0.0) + time.perf_counter() - start
+
+class _CountingHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+    def _new_conn(self):
+        _local.new_connection = True
+        return super()._new_conn()
+
+class _CountingHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+    def _new_conn(self):
+        _local.new_connection = True
+        return super()._new_conn()
+
+def begin_request_timings():
+    """Collect timing, status and rate-limit headers for each request this thread sends until end_request_timings()"""
+    _local.timings = []
+
+def end_request_timings() -> list:
+    timings, _local.timings = getattr(_local, 'timings', None) or [], None
+    return timings
+
+def read_json(response):
+    """response.json(), adding the parse time to the request's timing"""
+    start = time.perf_counter()
+    payload = response.json()
+    timings = getattr(_local, 'timings', None)
+    if timings:
+        timings[-1]['parse'] = time.perf_counter() - start
+    return payload
+
+class ConnectionStats:
+    """Counts how often requests reused a pooled connection and what a new one cost"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.new_connections = 0
+        self.new_connection_time = 0.0
+        self.reused_time = 0.0
+
+    def record(self, new_connection: bool, elapsed: float):
+        with self._lock:
+            self.requests += 1
+            if new_connection:
+                self.new_connections += 1
+                self.new_connection_time += elapsed
+            else:
+                self.reused_time += elapsed
+
+    @property
+    def reused(self) -> int:
+        return self.requests - self.new_connections
+
+    def estimated_savings(self) -> float:
+        """Seconds saved by reuse: reused calls times the extra latency of a fresh connection"""
+        with self._lock:
+            if not self.new_connections or not self.reused:
+                return 0.0
+            extra = self.new_connection_time / self.new_connections - self.reused_time / self.reused
+            return max(0.0, extra) * self.reused
+
+    def format(self) -> str:
+        reuse_pct = 100.0 * self.reused / self.requests if self.requests else 0.0
+        return (f"Connections:\n"
+                f"  Requests: {self.requests}, New connections: {self.new_connections} ({reuse_pct:.0f}% reused)\n"
+                f"  Est. latency saved by reuse: {self.estimated_savings():.2f}s")
+
+class PooledAdapter(HTTPAdapter):
+    """HTTPAdapter that records, per request, whether a new connection had to be opened.
+
+    When APIConfig.BASE_URL is overridden, requests to the real API (tweepy's
+    reply and like calls) are redirected to it as well.
+    """
+
+    def __init__(self, stats: ConnectionStats, **kwargs):
+        self.stats = stats
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': _CountingHTTPConnectionPool,
+            'https': _CountingHTTPSConnectionPool
+        }
+
+    def send(self, request, *args, **kwargs):
+        if APIConfig.BASE_URL != APIConfig.DEFAULT_BASE_URL and request.url.startswith(APIConfig.DEFAULT_BASE_URL):
+            request.url = APIConfig.BASE_URL + request.url[len(APIConfig.DEFAULT_BASE_URL):]
+        _local.new_connection = False
+        _local.connect_time = 0.0
+        start = time.perf_counter()
+        response = None
+        try:
+            response = super().send(request, *args, **kwargs)
+            return response
+        finally:
+            elapsed = time.perf_counter() - start
+            self.stats.record(_local.new_connection, elapsed)
+            if getattr(_local, 'timings', None) is not None:
+                timing = request_info(response.status_code, response.headers) if response is not None else {}
+                # send() returns once the headers are in: the rest is server time plus a round trip
+                timing.update(new_connection=_local.new_connection, connect=_local.connect_time,
+                              server=elapsed - _local.connect_time)
+                _local.timings.append(timing)
+
+def create_session(hooks=(), stats: ConnectionStats = None) -> requests.Session:
+    """Long-lived session shared by every X API call: pooled, keep-alive, compressed"""
+    session = requests.Session()
+    adapter = PooledAdapter(stats or ConnectionStats(),
+                            pool_connections=HTTPConfig.POOL_CONNECTIONS,
+                            pool_maxsize=HTTPConfig.POOL_MAXSIZE,
+                            pool_block=False)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update(APIConfig.DEFAULT_HEADERS)
+    session.headers["Accept-Encoding"] = HTTPConfig.ACCEPT_ENCODING
+    session.headers["Connection"] = "keep-alive" if HTTPConfig.KEEP_ALIVE else "close"
+    session.hooks['response'].extend(hooks)
+    return session
@@ -0,0 +1,147 @@
+import json
+import os
+import threading
+import time
+from config import JournalConfig
+
+QUEUED = 'queued'
+STARTED = 'started'
+RETRY = 'retry'
+DONE = 'done'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+
+# States that block a second submission of the same (action, post_id)
+ACTIVE = (QUEUED, STARTED, RETRY)
+
+def action_key(action_type: str, post_id: str) -> str:
+    return f"{action_type}:{post_id}"
+
+class ActionJournal:
+    """Append-only, fsync'd journal of reply/like actions keyed by (action, post_id).
+
+    Each line records one state change. Replaying the file gives the last
+    state of every key: queued, started (the API call was sent), retry (with
+    its due time), done, failed or cancelled, plus whether its batch was
+    paused. The file is compacted on open, and again whenever it has grown to
+    COMPACT_RATIO times the lines its records need.
+    """
+
+    def __init__(self, path: str = JournalConfig.FILE, retention: int = JournalConfig.DONE_RETENTION_SECONDS,
+                 compact_ratio: float = JournalConfig.COMPACT_RATIO,
+                 compact_min_lines: int = JournalConfig.COMPACT_MIN_LINES):
+        self.path = path
+        self.retention = retention
+        self.compact_ratio = compact_ratio
+        self.compact_min_lines = compact_min_lines
+        self.records = {}
+        self._lines = 0
+        self._lock = threading.Lock()
+        self._replay()
+        self._compact()
+        self._file = open(self.path, 'a', encoding='utf-8')
+
+    def _replay(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    change = json.loads(line)
+                except ValueError:
+                    continue  # Torn final line from a crash mid-write
+                if 'action' in change:
+                    self.records[change['key']] = change
+                elif change['key'] in self.records:
+                    self.records[change['key']].update(change)
+
+    def _compact(self):
+        """Rewrite the journal with one line per key still worth keeping"""
+        cutoff = time.time() - self.retention
+        self.records = {
+            key: record for key, record in self.records.items()
+            if record['op'] in ACTIVE or (record['op'] == DONE and record['ts'] >= cutoff)
+        }
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for record in self.records.values():
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        self._lines = len(self.records)
+
+    def _write(self, *changes: dict):
+        # Caller holds self._lock; one fsync however many changes
+        if self._file.closed:
+            return
+        self._file.write("".join(json.dumps(change, ensure_ascii=False) + "\n" for change in changes))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._lines += len(changes)
+        if self._lines > max(self.compact_min_lines, self.compact_ratio * len(self.records)):
+            self._file.close()
+            self._compact()
+            self._file = open(self.path, 'a', encoding='utf-8')
+
+    def admit_many(self, actions) -> list:
+        """Record the new ones of [(action_type, params), ...] with one fsync; returns those admitted.
+
+        An action on a post it is already pending or done for is left out.
+        """
+        admitted, records = [], []
+        with self._lock:
+            for action_type, params in actions:
+                key = action_key(action_type, params['post_id'])
+                record = self.records.get(key)
+                if record is not None and record['op'] in ACTIVE + (DONE,):
+                    continue
+                record = {'op': QUEUED, 'key': key, 'ts': time.time(), 'action': action_type,
+                          'params': {name: value for name, value in params.items() if name in ('post_id', 'text')}}
+                self.records[key] = record
+                records.append(record)
+                admitted.append((action_type, params))
+            if records:
+                self._write(*records)
+        return admitted
+
+    def update(self, action_type: str, post_id: str, op: str, **fields):
+        self.update_many([(action_type, post_id)], op, **fields)
+
+    def update_many(self, actions, op: str, **fields):
+        """Record the same state change for each (action_type, post_id), with one fsync"""
+        with self._lock:
+            changes = []
+            for action_type, post_id in actions:
+                key = action_key(action_type, post_id)
+                record = self.records.get(key)
+                if record is None:
+                    continue
+                change = dict(fields, op=op, key=key, ts=time.time())
+                record.update(change)
+                changes.append(change)
+            if changes:
+                self._write(*changes)
+
+    def set_paused(self, actions, paused: bool):
+        """Mark the (action_type, post_id) pairs of a paused or resumed batch, so a restart keeps them paused"""
+        with self._lock:
+            changes = []
+            for action_type, post_id in actions:
+                key = action_key(action_type, post_id)
+                record = self.records.get(key)
+                if record is None or record['op'] not in ACTIVE:
+                    continue
+                change = {'op': record['op'], 'key': key, 'ts': time.time(), 'paused': paused}
+                record.update(change)
+                changes.append(change)
+            if changes:
+                self._write(*changes)
+
+    def unfinished(self) -> list:
+        with self._lock:
+            return [dict(record) for record in self.records.values() if record['op'] in ACTIVE]
+
+    def close(self):
+        with self._lock:
+            self._file.close()
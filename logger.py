@@ -1,36 +1,499 @@
+import gzip
+import importlib.util
 import json
+import logging
 import os
 import datetime
-from typing import Any
+import random
+import re
+import threading
+import time
+from typing import Any, Iterator
+from config import APIConfig, LogConfig
 
-LOG_FILE = "api_call_log.json"
+logger = logging.getLogger(__name__)
+
+LOG_FILE = LogConfig.FILE
+LEGACY_LOG_FILE = LogConfig.LEGACY_FILE
+# Rotation time in a segment's name, e.g. api_call_log.20260101-120000-000000.jsonl.gz
+SEGMENT_STAMP_FORMAT = "%Y%m%d-%H%M%S-%f"
+
+# 'GET /2/tweets/search/recent' -> 'search', ...
+ENDPOINTS = {ref: call_type for call_type, ref in APIConfig.API_REFS.items()}
+
+def normalize_entry(entry: dict) -> dict:
+    """Convert an old {api_ref, timestamp, duration, response} entry to the compact schema.
+
+    Compact entries hold the endpoint ('search', 'reply' or 'like'), ts (epoch
+    seconds), duration, ok and, when known, the HTTP status, the rate-limit
+    remaining/reset headers, the result count, a truncated error and a sampled,
+    truncated response.
+    """
+    if 'endpoint' in entry:
+        return entry
+    return {
+        'endpoint': ENDPOINTS.get(entry['api_ref'], entry['api_ref']),
+        'ts': round(datetime.datetime.fromisoformat(entry['timestamp']).timestamp(), 3),
+        'duration': entry['duration'],
+        'ok': entry['response'] != "Failed"
+    }
+
+def _parse_line(line):
+    line = line.strip()
+    if not line:
+        return None
+    try:
+        return normalize_entry(json.loads(line))
+    except (ValueError, KeyError):
+        # Torn final line from an interrupted write
+        return None
+
+def entry_time(entry: dict) -> float:
+    return entry['ts']
+
+def is_hourly(entry: dict) -> bool:
+    """True for a per-hour aggregate that replaced raw entries when the log was compacted"""
+    return 'calls' in entry
+
+def aggregate_hours(entries, segment: str = None) -> list:
+    """Reduce raw entries to one {endpoint, ts, calls, failures, duration_sum} record per endpoint and hour.
+
+    duration_sum covers successful calls only, as APICallStats averages those.
+    """
+    hours = {}
+    for entry in entries:
+        hour = int(entry_time(entry) // 3600 * 3600)
+        aggregate = hours.get((entry['endpoint'], hour))
+        if aggregate is None:
+            aggregate = hours[(entry['endpoint'], hour)] = {'endpoint': entry['endpoint'], 'ts': hour, 'calls': 0,
+                                                            'failures': 0, 'duration_sum': 0.0}
+            if segment:
+                aggregate['segment'] = segment
+        aggregate['calls'] += 1
+        if entry['ok']:
+            aggregate['duration_sum'] = round(aggregate['duration_sum'] + entry['duration'], 4)
+        else:
+            aggregate['failures'] += 1
+    return sorted(hours.values(), key=lambda aggregate: (aggregate['ts'], aggregate['endpoint']))
+
+def _stamp_time(stamp: str) -> float:
+    return datetime.datetime.strptime(stamp, SEGMENT_STAMP_FORMAT).timestamp()
+
+def _compression_suffix(compression: str) -> str:
+    """'.zst' if zstd is configured and the zstandard package is installed, else '.gz'"""
+    if compression == "zstd" and importlib.util.find_spec("zstandard") is not None:
+        return ".zst"
+    return ".gz"
+
+def _compress_bytes(data: bytes, suffix: str) -> bytes:
+    if suffix == ".zst":
+        import zstandard
+        return zstandard.ZstdCompressor().compress(data)
+    return gzip.compress(data)
+
+def _open_text(path: str):
+    if path.endswith(".zst"):
+        import zstandard
+        return zstandard.open(path, 'rt', encoding='utf-8')
+    if path.endswith(".gz"):
+        return gzip.open(path, 'rt', encoding='utf-8')
+    return open(path, 'r', encoding='utf-8')
+
+def _read_entries(path: str) -> Iterator[dict]:
+    """Entries of a log file or (compressed) segment, oldest first; nothing if it doesn't exist"""
+    try:
+        f = _open_text(path)
+    except FileNotFoundError:
+        return
+    yield from _file_entries(f)
+
+def _file_entries(f) -> Iterator[dict]:
+    """Entries of an open text file, oldest first; closes it"""
+    with f:
+        for line in f:
+            entry = _parse_line(line)
+            if entry is not None:
+                yield entry
+
+def _open_existing(paths: list, opener=_open_text) -> list:
+    files = []
+    for path in paths:
+        try:
+            files.append(opener(path))
+        except FileNotFoundError:
+            pass
+    return files
+
+def _encode_lines(entries) -> bytes:
+    return "".join(json.dumps(entry, ensure_ascii=False) + "\n" for entry in entries).encode('utf-8')
+
+def _write_synced(path: str, data: bytes):
+    with open(path, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+
+def _write_atomic(path: str, data: bytes):
+    _write_synced(path + ".tmp", data)
+    os.replace(path + ".tmp", path)
+
+def _result_count(response):
+    """Number of results in a JSON payload or tweepy Response, if it has any"""
+    if isinstance(response, dict):
+        meta, data = response.get('meta') or {}, response.get('data')
+    elif hasattr(response, 'data'):
+        meta, data = getattr(response, 'meta', None) or {}, response.data
+    else:
+        return None
+    result_count = meta.get('result_count')
+    if result_count is not None:
+        return result_count
+    if isinstance(data, list):
+        return len(data)
+    return 1 if data else 0
+
+class LogBackend:
+    """Storage interface for API call log entries"""
+
+    def append(self, entry: dict):
+        raise NotImplementedError
+
+    def iter_entries(self) -> Iterator[dict]:
+        """Yield entries oldest first"""
+        raise NotImplementedError
+
+    def iter_reverse(self) -> Iterator[dict]:
+        """Yield entries newest first"""
+        return reversed(self.read_all())
+
+    def read_all(self) -> list:
+        return list(self.iter_entries())
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.flush()
+
+class JSONLinesLogBackend(LogBackend):
+    """Append-only JSON Lines log: one entry per line, fsync'd in batches.
+
+    The active file is rotated once it reaches rotate_bytes or its first entry
+    is rotate_seconds old. A background thread compresses rotated segments
+    (gzip, or zstd with the zstandard package) and, once a segment is
+    aggregate_after seconds old, compacts it into per-hour aggregates in
+    <name>.hourly.jsonl, which are kept for retention seconds. History is read
+    in order: aggregates, segments, then the active file.
+    """
+
+    def __init__(self, path: str = LOG_FILE, legacy_path: str = LEGACY_LOG_FILE,
+                 fsync_batch_size: int = LogConfig.FSYNC_BATCH_SIZE,
+                 fsync_interval: float = LogConfig.FSYNC_INTERVAL,
+                 rotate_bytes: int = LogConfig.ROTATE_BYTES,
+                 rotate_seconds: float = LogConfig.ROTATE_SECONDS,
+                 compression: str = LogConfig.COMPRESSION,
+                 aggregate_after: float = LogConfig.AGGREGATE_AFTER_SECONDS,
+                 retention: float = LogConfig.RETENTION_SECONDS):
+        self.path = path
+        self.fsync_batch_size = fsync_batch_size
+        self.fsync_interval = fsync_interval
+        self.rotate_bytes = rotate_bytes
+        self.rotate_seconds = rotate_seconds
+        self.aggregate_after = aggregate_after
+        self.retention = retention
+        self.suffix = _compression_suffix(compression)
+        base = os.path.splitext(path)[0]
+        self.hourly_path = base + ".hourly.jsonl"
+        self._directory = os.path.dirname(os.path.abspath(path))
+        self._segment_pattern = re.compile(re.escape(os.path.basename(base)) + r"\.(\d{8}-\d{6}-\d{6})\.jsonl(\.gz|\.zst)?$")
+        self._lock = threading.Lock()
+        # Held while segments are listed and opened, and while one is swapped or removed
+        self._segment_lock = threading.RLock()
+        self._maintenance_lock = threading.Lock()
+        self._maintenance = None
+        self._maintenance_requested = False
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+        self._migrate_legacy(legacy_path)
+        self._open_active()
+        # Picks up segments a previous run left uncompressed or that are now due for compaction
+        self._start_maintenance()
+
+    def _migrate_legacy(self, legacy_path: str):
+        """One-time conversion of the old indented JSON array log"""
+        if not legacy_path or os.path.exists(self.path) or not os.path.exists(legacy_path):
+            return
+        try:
+            with open(legacy_path, 'r', encoding='utf-8') as f:
+                entries = [normalize_entry(entry) for entry in json.load(f)]
+        except (OSError, ValueError, KeyError):
+            return
+        _write_atomic(self.path, _encode_lines(entries))
+
+    def _open_active(self):
+        self._file = open(self.path, 'a', encoding='utf-8')
+        self._size = os.path.getsize(self.path)
+        self._first_time = next((entry_time(entry) for entry in _read_entries(self.path)), None)
+
+    def append(self, entry: dict):
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+            self._unsynced += 1
+            self._size += len(line)
+            if self._first_time is None:
+                self._first_time = entry_time(entry)
+            now = time.monotonic()
+            if self._size >= self.rotate_bytes or entry_time(entry) - self._first_time >= self.rotate_seconds:
+                self._rotate()
+            elif self._unsynced >= self.fsync_batch_size or now - self._last_sync >= self.fsync_interval:
+                self._sync(now)
+
+    def _sync(self, now: float):
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._last_sync = now
+
+    def _rotate(self):
+        """Move the active file aside as a segment; compression and compaction run in the background"""
+        self._sync(time.monotonic())
+        self._file.close()
+        stamp = datetime.datetime.now().strftime(SEGMENT_STAMP_FORMAT)
+        segment = os.path.join(self._directory, f"{os.path.basename(os.path.splitext(self.path)[0])}.{stamp}.jsonl")
+        with self._segment_lock:
+            try:
+                os.replace(self.path, segment)
+            except PermissionError:
+                # Windows can't rename a file a reader still has open; the next append tries again
+                self._open_active()
+                return
+        self._open_active()
+        self._start_maintenance()
+
+    def _segments(self) -> list:
+        """Rotated segment paths, oldest first"""
+        return sorted(os.path.join(self._directory, name) for name in os.listdir(self._directory)
+                      if self._segment_pattern.match(name))
+
+    def _segment_stamp(self, segment: str) -> str:
+        return self._segment_pattern.match(os.path.basename(segment)).group(1)
+
+    def _open_history(self, binary_active: bool = False) -> list:
+        """Open the aggregates, segments and active file, oldest first.
+
+        Only the opening happens under the segment lock. The open handles keep
+        reading the same data if the active file is rotated or a segment is
+        compressed or compacted meanwhile, so readers never hold the lock and
+        never block an append that rotates the log. The active file is the
+        last handle, opened in binary mode if binary_active.
+        """
+        with self._segment_lock:
+            files = _open_existing([self.hourly_path] + self._segments())
+            try:
+                files.append(open(self.path, 'rb') if binary_active else _open_text(self.path))
+            except BaseException:
+                for f in files:
+                    f.close()
+                raise
+        return files
+
+    def iter_entries(self) -> Iterator[dict]:
+        self.flush()
+        files = self._open_history()
+        try:
+            for f in files:
+                yield from _file_entries(f)
+        finally:
+            for f in files:
+                f.close()
+
+    def iter_reverse(self) -> Iterator[dict]:
+        """Read the active file backwards in fixed-size chunks so only the tail is touched.
+
+        Older segments are only decompressed if the reader gets that far.
+        """
+        self.flush()
+        files = self._open_history(binary_active=True)
+        try:
+            yield from self._read_reverse(files[-1])
+            for f in reversed(files[:-1]):
+                yield from reversed(list(_file_entries(f)))
+        finally:
+            for f in files:
+                f.close()
+
+    def _read_reverse(self, f) -> Iterator[dict]:
+        with f:
+            f.seek(0, os.SEEK_END)
+            position = f.tell()
+            remainder = b""
+            while position > 0:
+                read_size = min(LogConfig.READ_CHUNK_SIZE, position)
+                position -= read_size
+                f.seek(position)
+                lines = (f.read(read_size) + remainder).split(b"\n")
+                # The first piece may be a partial line; keep it for the next chunk
+                remainder = lines.pop(0)
+                for line in reversed(lines):
+                    entry = _parse_line(line)
+                    if entry is not None:
+                        yield entry
+            entry = _parse_line(remainder)
+            if entry is not None:
+                yield entry
+
+    def _start_maintenance(self):
+        with self._maintenance_lock:
+            self._maintenance_requested = True
+            if self._maintenance is None:
+                self._maintenance = threading.Thread(target=self._run_maintenance, name="log-maintenance",
+                                                     daemon=True)
+                self._maintenance.start()
+
+    def _run_maintenance(self):
+        while True:
+            with self._maintenance_lock:
+                if not self._maintenance_requested:
+                    self._maintenance = None
+                    return
+                self._maintenance_requested = False
+            try:
+                self.maintain()
+            except OSError as e:
+                logger.warning(f"Call log maintenance failed: {e}")
+
+    def maintain(self, now: float = None):
+        """Compress rotated segments, compact old ones into hourly aggregates and drop expired aggregates"""
+        now = now or time.time()
+        with self._segment_lock:
+            segments = self._segments()
+        aggregate_before = now - self.aggregate_after
+        due = [segment for segment in segments if _stamp_time(self._segment_stamp(segment)) < aggregate_before]
+        expired = next((entry_time(entry) for entry in _read_entries(self.hourly_path)), now) < now - self.retention
+        if due or expired:
+            self._compact(due, now)
+        for segment in segments[len(due):]:
+            if not segment.endswith(('.gz', '.zst')):
+                self._compress(segment)
+
+    def _compress(self, segment: str):
+        with open(segment, 'rb') as f:
+            data = _compress_bytes(f.read(), self.suffix)
+        tmp_path = segment + self.suffix + ".tmp"
+        _write_synced(tmp_path, data)
+        # Swapped under the lock, so readers see either the plain or the compressed segment, never both
+        with self._segment_lock:
+            os.replace(tmp_path, segment + self.suffix)
+            try:
+                os.remove(segment)
+            except PermissionError:
+                # Still open in a reader (on Windows); keep the plain segment and compress it next time
+                os.remove(segment + self.suffix)
+                raise
+
+    def _compact(self, segments: list, now: float):
+        cutoff = now - self.retention
+        aggregates = [entry for entry in _read_entries(self.hourly_path) if entry_time(entry) >= cutoff]
+        # A segment whose aggregates were written before an interrupted removal isn't counted twice
+        compacted = {entry.get('segment') for entry in aggregates}
+        for segment in segments:
+            stamp = self._segment_stamp(segment)
+            if stamp not in compacted:
+                aggregates.extend(aggregate for aggregate in aggregate_hours(_read_entries(segment), stamp)
+                                  if aggregate['ts'] >= cutoff)
+        with self._segment_lock:
+            _write_atomic(self.hourly_path, _encode_lines(aggregates))
+            for segment in segments:
+                os.remove(segment)
+
+    def flush(self):
+        with self._lock:
+            if self._file.closed:
+                return
+            self._file.flush()
+            if self._unsynced:
+                self._sync(time.monotonic())
+
+    def close(self):
+        self.flush()
+        with self._lock:
+            self._file.close()
+        maintenance = self._maintenance
+        if maintenance is not None:
+            maintenance.join()
 
 class APICallLogger:
-    def __init__(self):
-        self.logs = []
-        self.load_logs()
+    """Appends call entries to the backend and passes them to listeners; nothing is kept in memory.
 
-    def log_call(self, api_ref: str, duration: float, response: Any):
-        timestamp = datetime.datetime.now().isoformat()
+    History is streamed from the backend, in full or from the end of the log,
+    so opening the log costs nothing at startup.
+    """
+
+    def __init__(self, backend: LogBackend = None, response_sample_rate: float = LogConfig.RESPONSE_SAMPLE_RATE):
+        self.backend = backend or JSONLinesLogBackend()
+        self.response_sample_rate = response_sample_rate
+        self.listeners = []
+        self._last_ts = 0.0
+        self._lock = threading.Lock()
+
+    def log_call(self, api_ref: str, duration: float, response: Any, request: dict = None, error: Exception = None):
+        """Record one call; response is None if it failed.
+
+        request is the HTTP layer's info on the call's last request (status and
+        rate-limit headers), as collected by http_client.begin_request_timings().
+        """
         log_entry = {
-            'api_ref': api_ref,
-            'timestamp': timestamp,
-            'duration': duration,
-            'response': str(response) if response else "Failed"
+            'endpoint': ENDPOINTS.get(api_ref, api_ref),
+            'ts': None,
+            'duration': round(duration, 4),
+            'ok': response is not None
         }
-        self.logs.append(log_entry)
-        self.save_logs()
+        for field in ('status', 'remaining', 'reset'):
+            if request and request.get(field) is not None:
+                log_entry[field] = request[field]
+        count = _result_count(response)
+        if count is not None:
+            log_entry['count'] = count
+        if error is not None:
+            log_entry['error'] = str(error)[:LogConfig.RESPONSE_MAX_CHARS]
+        elif response is not None and self.response_sample_rate and random.random() < self.response_sample_rate:
+            log_entry['response'] = str(response)[:LogConfig.RESPONSE_MAX_CHARS]
+        with self._lock:
+            # Stamped under the lock and strictly increasing, so a subscription's watermark splits history cleanly
+            self._last_ts = log_entry['ts'] = max(round(time.time(), 3), round(self._last_ts + 0.001, 3))
+            self.backend.append(log_entry)
+            for listener in self.listeners:
+                listener(log_entry)
+
+    def subscribe(self, listener) -> float:
+        """Call listener(entry) for every new entry; returns the watermark.
+
+        Every entry logged from now on has a ts above the watermark, and every
+        entry already in the log is at or below it, so history read with
+        iter_logs() or iter_since() up to the watermark is neither missed nor
+        delivered twice.
+        """
+        with self._lock:
+            self._last_ts = max(self._last_ts, round(time.time(), 3))
+            self.listeners.append(listener)
+            return self._last_ts
 
     def save_logs(self):
-        with open(LOG_FILE, 'w') as f:
-            json.dump(self.logs, f, indent=4)
+        self.backend.flush()
 
-    def load_logs(self):
-        if os.path.exists(LOG_FILE):
-            with open(LOG_FILE, 'r') as f:
-                self.logs = json.load(f)
-        else:
-            self.logs = []
+    def iter_logs(self) -> Iterator[dict]:
+        """Stream the full history, oldest first, without loading it into memory"""
+        return self.backend.iter_entries()
+
+    def iter_since(self, since: float) -> Iterator[dict]:
+        """Entries logged after since, oldest first; only the tail of the log is read"""
+        newer = []
+        for entry in self.backend.iter_reverse():
+            if entry_time(entry) <= since:
+                break
+            newer.append(entry)
+        return reversed(newer)
 
-    def get_logs(self) -> list:
-        return self.logs
+    def close(self):
+        self.backend.close()
@@ -1,57 +1,76 @@
 import datetime
-import json
 import os
 import time
-import threading
 import logging
-from queue import Queue
-from dotenv import load_dotenv
 import tkinter as tk
 from tkinter import ttk, messagebox
-import requests
-from config import APIConfig, GUIConfig, RateLimits
-from utils import get_timestamp, create_client
-from logger import APICallLogger
-from stats import APICallStats
-from gui_components import OptionsWindow, StatusWindow
-
-# Logging setup
-logging.basicConfig(level=logging.INFO, format="[%(asctime)s] %(levelname)s: %(message)s", datefmt="%Y-%m-%d %H:%M:%S")
-logger = logging.getLogger(__name__)
+from config import APIConfig, GUIConfig
+from utils import load_accounts, check_time_range
+from options import load_options, save_options
+from gui_components import OptionsWindow, StatusWindow, BufferedStatusLog
+from store import PostStore
+from batch import PAUSED
 
-# Load environment variables
-if not os.path.exists("cred.env"):
-    raise FileNotFoundError("cred.env file not found.")
-load_dotenv("cred.env")
-API_KEY = os.getenv("API_KEY")
-API_SECRET = os.getenv("API_SECRET")
-ACCESS_TOKEN = os.getenv("ACCESS_TOKEN")
-ACCESS_TOKEN_SECRET = os.getenv("ACCESS_TOKEN_SECRET")
-BEARER_TOKEN = os.getenv("BEARER_TOKEN")
-if not all([API_KEY, API_SECRET, ACCESS_TOKEN, ACCESS_TOKEN_SECRET, BEARER_TOKEN]):
-    raise ValueError("Missing environment variables in cred.env.")
-
-# Constants
-LOG_FILE = "api_call_log.json"
-OPTIONS_FILE = "user_options.json"
+logger = logging.getLogger(__name__)
 
 class xApp:
-    def __init__(self, root: tk.Tk, client):
+    """Tk front end; the search/reply/like logic lives in XEngine"""
+
+    def __init__(self, root: tk.Tk, client=None):
         self.root = root
         self.client = client
-        self.logger = APICallLogger()
+        self.engine = None
+        self.startup_error = None
+        self.options = load_options()
         self.load_user_options()
-        self.stats = APICallStats(self.logger, "Free")  # Default license level
-        self.action_queue = Queue()
         self.running = True
-        self.stop_processing_event = threading.Event()
         self.root.title("X Post Search and Reply")
-        self.posts = []
-        self.users = []
+        self.store = PostStore()
         self.setup_gui()
-        self.processor_thread = threading.Thread(target=self.process_action_queue, daemon=True)
-        self.processor_thread.start()
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
+        # The engine (credentials, HTTP session, log, cache) is built once the window is on screen
+        self.root.bind("<Map>", self._on_map, add="+")
+        self.root.after(GUIConfig.ENGINE_START_FALLBACK_MS, self._start_engine)
+
+    def _on_map(self, event):
+        if event.widget is self.root:
+            self.root.after_idle(self._start_engine)
+
+    def _start_engine(self):
+        if self.engine is not None or not self.running:
+            return
+        # Imported here: requests, sqlite3 and the HTTP stack aren't needed to draw the window
+        from engine import XEngine
+        try:
+            accounts = load_accounts()
+        except (FileNotFoundError, ValueError) as e:
+            messagebox.showerror("Credentials Error", str(e))
+            self.running = False
+            self.root.destroy()
+            return
+        try:
+            engine = XEngine(
+                accounts[0]['BEARER_TOKEN'],
+                client=self.client,
+                accounts=accounts,
+                options=self.options,
+                on_status=self._show_status,
+                # Engine callbacks run on worker threads; results are applied on the Tk thread
+                on_search_page=lambda params, posts, users: self.root.after(0, self._show_search_page, params, posts, users),
+                on_search_done=lambda params: self.root.after(0, self.finish_search_results)
+            )
+        except Exception as e:
+            self.startup_error = str(e)
+            logger.error(f"Engine startup failed: {e}")
+            messagebox.showerror("Startup Error", f"The engine could not be started: {e}")
+            return
+        self.engine = engine
+        self.startup_error = None
+        resumed = self.engine.start()
+        if resumed is not None:
+            self._show_batch(resumed)
+        self._refresh_retry_view()
+        self.update_status("Application started.")
 
     def setup_gui(self):
         # Set up main window
@@ -75,10 +94,15 @@ class xApp:
         left_panel = ttk.Frame(content_pane)
         content_pane.add(left_panel, weight=2)
 
-        ttk.Label(left_panel, text="Found Posts (uncheck to exclude from actions):").pack(anchor="w", pady=(0, 5))
+        results_header = ttk.Frame(left_panel)
+        results_header.pack(fill="x", pady=(0, 5))
+        ttk.Label(results_header, text="Found Posts (uncheck to exclude from actions):").pack(side="left")
+        ttk.Button(results_header, text="Clear Results", command=self.clear_search_results).pack(side="right")
+        self.results_count_label = ttk.Label(results_header, text="")
+        self.results_count_label.pack(side="right", padx=(0, 10))
         self.post_frame = ttk.Frame(left_panel)
         self.post_frame.pack(fill="both", expand=True)
-        self._setup_scrollable_frame()
+        self._setup_results_list()
 
         # Right panel - Actions
         right_panel = ttk.Frame(content_pane)
@@ -89,30 +113,27 @@ class xApp:
         self.action_frame.pack(fill="both", expand=True)
         self._setup_action_frame()
 
-        # Retry countdown section
-        retry_section = ttk.LabelFrame(main_container, text="Retry Countdown", padding=10)
+        # Pending retries section
+        retry_section = ttk.LabelFrame(main_container, text="Pending Retries", padding=10)
         retry_section.pack(fill="x", pady=(0, 10))
 
-        # Retry status frame
-        retry_frame = ttk.Frame(retry_section)
-        retry_frame.pack(fill="x")
-
-        self.retry_label = ttk.Label(retry_frame, text="No active retries", font=("TkDefaultFont", 10, "bold"))
+        self.retry_label = ttk.Label(retry_section, text="No active retries", font=("TkDefaultFont", 10, "bold"))
         self.retry_label.pack(anchor="w")
 
-        # Progress bar for countdown
-        self.retry_progress = ttk.Progressbar(retry_frame, orient="horizontal", length=400, mode="determinate")
-        self.retry_progress.pack(fill="x", pady=(5, 0))
-
-        # Countdown timer and cancel button
-        timer_frame = ttk.Frame(retry_frame)
-        timer_frame.pack(fill="x", pady=(5, 0))
-
-        self.countdown_label = ttk.Label(timer_frame, text="", font=("TkDefaultFont", 9))
-        self.countdown_label.pack(side="left")
-
-        self.cancel_retry_button = ttk.Button(timer_frame, text="Cancel Retry", command=self.cancel_current_retry, state="disabled")
+        # One row per scheduled retry, refreshed once a second
+        retry_columns = ("action", "target", "attempt", "due", "remaining")
+        self.retry_tree = ttk.Treeview(retry_section, columns=retry_columns, show="headings", height=4)
+        for column, heading, width in zip(retry_columns, ("Action", "Target", "Attempt", "Due At", "Remaining"),
+                                          (80, 260, 80, 100, 100)):
+            self.retry_tree.heading(column, text=heading)
+            self.retry_tree.column(column, width=width, anchor="w")
+        self.retry_tree.pack(fill="x", pady=(5, 0))
+
+        retry_buttons = ttk.Frame(retry_section)
+        retry_buttons.pack(fill="x", pady=(5, 0))
+        self.cancel_retry_button = ttk.Button(retry_buttons, text="Cancel Selected Retry", command=self.cancel_selected_retries)
         self.cancel_retry_button.pack(side="right")
+        ttk.Button(retry_buttons, text="Cancel All Retries", command=self.cancel_all_retries).pack(side="right", padx=(0, 5))
 
         # Bottom section - Status and logs
         status_section = ttk.LabelFrame(main_container, text="Status & Logs", padding=10)
@@ -130,6 +151,7 @@ class xApp:
 
         self.status_text.pack(side="left", fill="both", expand=True)
         status_scrollbar.pack(side="right", fill="y")
+        self.status_log = BufferedStatusLog(self.root, self.status_text)
 
         # Create context menu for text widgets
         self.context_menu = tk.Menu(self.root, tearoff=0)
@@ -139,12 +161,6 @@ class xApp:
         # Create menu bar
         self._setup_menu_bar()
 
-        # Initialize retry tracking
-        self.current_retry_thread = None
-        self.retry_cancelled = False
-
-        self.update_status("Application started.")
-
     def _setup_input_frame(self, frame: ttk.Frame):
         # Configure grid columns
         frame.columnconfigure(1, weight=1)
@@ -170,32 +186,71 @@ class xApp:
         ttk.Button(frame, text="Options", command=self.open_options).grid(row=2, column=3, padx=(0, 5))
         ttk.Button(frame, text="Show Stats", command=self.show_stats).grid(row=2, column=4, padx=(0, 5))
 
-    def _setup_scrollable_frame(self):
-        self.canvas = tk.Canvas(self.post_frame, highlightthickness=0)
-        self.scrollbar = ttk.Scrollbar(self.post_frame, orient="vertical", command=self.canvas.yview)
-        self.scrollable_frame = ttk.Frame(self.canvas)
-
-        # Create window and configure scrolling
-        self.canvas.create_window((0, 0), window=self.scrollable_frame, anchor="nw")
-        self.canvas.configure(yscrollcommand=self.scrollbar.set)
-
-        # Bind events for proper scrolling
-        self.scrollable_frame.bind("<Configure>", self._on_frame_configure)
-        self.canvas.bind("<Configure>", self._on_canvas_configure)
+        ttk.Checkbutton(frame, text="Only fetch posts newer than the last search for these keywords",
+                        variable=self.incremental_search).grid(row=3, column=1, sticky="w", pady=(5, 0))
+
+    def _setup_results_list(self):
+        """Results live in a Treeview, which only draws the rows in view"""
+        list_frame = ttk.Frame(self.post_frame)
+        list_frame.pack(fill="both", expand=True)
+        columns = ("check", "author", "text", "posted")
+        self.results_tree = ttk.Treeview(list_frame, columns=columns, show="headings", selectmode="extended")
+        for column, heading, width, stretch in zip(columns, ("", "Author", "Post", "Posted At"),
+                                                   (30, 120, 400, 150), (False, False, True, False)):
+            self.results_tree.heading(column, text=heading)
+            self.results_tree.column(column, width=width, stretch=stretch, anchor="w")
+        scrollbar = ttk.Scrollbar(list_frame, orient="vertical", command=self.results_tree.yview)
+        self.results_tree.configure(yscrollcommand=scrollbar.set)
+        self.results_tree.pack(side="left", fill="both", expand=True)
+        scrollbar.pack(side="right", fill="y")
 
-        # Pack widgets
-        self.canvas.pack(side="left", fill="both", expand=True)
-        self.scrollbar.pack(side="right", fill="y")
-        self.post_check_vars = []
+        self.results_tree.bind("<Button-1>", self._on_results_click)
+        self.results_tree.bind("<space>", self._toggle_selected_posts)
+        self.results_tree.bind("<<TreeviewSelect>>", self._show_post_preview)
+
+        # Full text of the highlighted post, selectable for copying
+        self.post_preview = tk.Text(self.post_frame, height=5, wrap="word", relief="flat", borderwidth=0,
+                                    font=("TkDefaultFont", 9), padx=5, pady=2, state="disabled",
+                                    background=self.root.cget("background"))
+        self.post_preview.pack(fill="x", pady=(5, 0))
+        self.post_preview.bind("<Key>", lambda e: "break")
+        self.post_preview.bind("<Button-1>", self._start_text_selection)
+        self.post_preview.bind("<Button-3>", self._show_context_menu)
+
+        # Selection model: posts are included unless unchecked
+        self.excluded_post_ids = set()
+
+    def _on_results_click(self, event):
+        """Clicking the check column toggles that post in or out of the action set"""
+        if self.results_tree.identify_column(event.x) != "#1":
+            return None
+        post_id = self.results_tree.identify_row(event.y)
+        if post_id:
+            self._toggle_posts([post_id])
+        return "break"
 
-    def _on_frame_configure(self, event):
-        """Update scroll region when frame content changes"""
-        self.canvas.configure(scrollregion=self.canvas.bbox("all"))
+    def _toggle_selected_posts(self, event=None):
+        self._toggle_posts(self.results_tree.selection())
+        return "break"
 
-    def _on_canvas_configure(self, event):
-        """Update scroll region when canvas is resized"""
-        self.canvas.itemconfig(self.canvas.find_withtag("all")[0], width=event.width)
-        self.canvas.configure(scrollregion=self.canvas.bbox("all"))
+    def _toggle_posts(self, post_ids):
+        for post_id in post_ids:
+            if post_id in self.excluded_post_ids:
+                self.excluded_post_ids.discard(post_id)
+                self.results_tree.set(post_id, "check", "☑")
+            else:
+                self.excluded_post_ids.add(post_id)
+                self.results_tree.set(post_id, "check", "☐")
+
+    def _show_post_preview(self, event=None):
+        selection = self.results_tree.selection()
+        post = self.store.get(selection[0]) if selection else None
+        self.post_preview.config(state="normal")
+        self.post_preview.delete("1.0", tk.END)
+        if post:
+            self.post_preview.insert("1.0", f"@{self.store.username(post.author_id)}: {post.text}\n"
+                                            f"[Posted at: {post.created_at}]")
+        self.post_preview.config(state="disabled")
 
     def _setup_action_frame(self):
         self.reply_var = tk.BooleanVar(value=False)
@@ -212,76 +267,72 @@ class xApp:
 
         self.execute_button = ttk.Button(self.action_frame, text="Execute Actions", command=self.queue_actions, state="disabled")
         self.execute_button.pack(pady=GUIConfig.PADY)
+        self.pause_button = ttk.Button(self.action_frame, text="Pause Actions", command=self.toggle_pause_actions, state="disabled")
+        self.pause_button.pack(pady=GUIConfig.PADY)
         self.cancel_button = ttk.Button(self.action_frame, text="Cancel Actions", command=self.cancel_actions, state="disabled")
         self.cancel_button.pack(pady=GUIConfig.PADY)
+        self.batch_label = ttk.Label(self.action_frame, text="", wraplength=250)
+        self.batch_label.pack(anchor="w", pady=GUIConfig.PADY)
+        self.batch = None
+        self._batch_refresh = None
 
     def load_user_options(self):
-        defaults = {
-            'verified_only': False,
-            'no_replies': False,
-            'debug_mode': False,
-            'search_retry_minutes': 15,
-            'like_retry_minutes': 15,
-            'reply_retry_hours': 24,
-            'max_search_results': 50
-        }
-        options = defaults
-        if os.path.exists(OPTIONS_FILE):
-            with open(OPTIONS_FILE, 'r') as f:
-                options.update(json.load(f))
-        self.verified_only = tk.BooleanVar(value=options['verified_only'])
-        self.no_replies = tk.BooleanVar(value=options['no_replies'])
-        self.debug_mode = tk.BooleanVar(value=options['debug_mode'])
-        self.search_retry_minutes = options['search_retry_minutes']
-        self.like_retry_minutes = options['like_retry_minutes']
-        self.reply_retry_hours = options['reply_retry_hours']
-        self.max_search_results = options['max_search_results']
+        """Mirror the toggle options in Tk variables"""
+        self.verified_only = tk.BooleanVar(value=self.options['verified_only'])
+        self.no_replies = tk.BooleanVar(value=self.options['no_replies'])
+        self.debug_mode = tk.BooleanVar(value=self.options['debug_mode'])
+        self.incremental_search = tk.BooleanVar(value=self.options['incremental_search'])
+        self.debug_mode.trace_add("write", self._sync_debug_mode)
+
+    def _sync_debug_mode(self, *args):
+        self.options['debug_mode'] = self.debug_mode.get()
+        if self.engine:
+            self.engine.debug_mode = self.options['debug_mode']
 
     def save_user_options(self):
-        options = {
-            'verified_only': self.verified_only.get(),
-            'no_replies': self.no_replies.get(),
-            'debug_mode': self.debug_mode.get(),
-            'search_retry_minutes': self.search_retry_minutes,
-            'like_retry_minutes': self.like_retry_minutes,
-            'reply_retry_hours': self.reply_retry_hours,
-            'max_search_results': self.max_search_results
-        }
-        with open(OPTIONS_FILE, 'w') as f:
-            json.dump(options, f, indent=4)
+        self.engine.verified_only = self.verified_only.get()
+        self.engine.no_replies = self.no_replies.get()
+        self.engine.debug_mode = self.debug_mode.get()
+        self.engine.incremental_search = self.incremental_search.get()
+        save_options(self.engine.get_options())
 
     def update_status(self, message: str):
         logger.info(message)
-        if hasattr(self, 'status_text'):
-            self.root.after(0, lambda: self._update_status_text(message))
-
-    def _update_status_text(self, message: str):
-        if hasattr(self, 'status_text'):
-            self.status_text.config(state="normal")
-            timestamp = get_timestamp()
-            self.status_text.insert(tk.END, f"[{timestamp}] {message}\n")
-            self.status_text.see(tk.END)
-            self.status_text.config(state="disabled")
-
-    def debug_log(self, message: str):
-        if self.debug_mode.get():
-            logger.debug(message)
-            self.update_status(f"[DEBUG] {message}")
+        self._show_status(message)
+
+    def _show_status(self, message: str):
+        # The engine logs its own messages; this only puts them in the window
+        if hasattr(self, 'status_log'):
+            self.status_log.write(message)
 
     def toggle_reply_text(self):
         state = "normal" if self.reply_var.get() else "disabled"
         self.reply_text.config(state=state)
 
+    def _engine_ready(self) -> bool:
+        """False, with a status message, until _start_engine has built the engine"""
+        if self.engine is None:
+            if self.startup_error:
+                self.update_status(f"Unavailable: the engine failed to start ({self.startup_error})")
+            else:
+                self.update_status("Still starting up; try again in a moment")
+            return False
+        return True
+
     def open_options(self):
+        if not self._engine_ready():
+            return
         OptionsWindow(self.root, self)
 
     def show_stats(self):
+        if not self._engine_ready():
+            return
         stats_window = tk.Toplevel(self.root)
         stats_window.title("API Call Statistics")
-        stats_window.geometry("400x300")
-        stats_text = tk.Text(stats_window, height=15, width=50)
+        stats_window.geometry("460x520")
+        stats_text = tk.Text(stats_window, height=26, width=55)
         stats_text.pack(padx=GUIConfig.PADDING, pady=GUIConfig.PADY)
-        stats_text.insert(tk.END, self.stats.format_stats())
+        stats_text.insert(tk.END, self.engine.stats.format_stats())
         stats_text.config(state="disabled")
         ttk.Button(stats_window, text="Close", command=stats_window.destroy).pack(pady=GUIConfig.PADY)
 
@@ -289,17 +340,10 @@ class xApp:
         try:
             start_dt = datetime.datetime.strptime(self.start_entry.get(), "%Y-%m-%d %H:%M").replace(tzinfo=datetime.timezone.utc)
             end_dt = datetime.datetime.strptime(self.end_entry.get(), "%Y-%m-%d %H:%M").replace(tzinfo=datetime.timezone.utc)
-            now = datetime.datetime.now(datetime.timezone.utc)
-            if start_dt >= end_dt:
-                raise ValueError("End time must be after start time.")
-            if start_dt.year < 2006:
-                raise ValueError("Start date must be on or after 2006.")
-            if start_dt > now:
-                raise ValueError("Start time cannot be in the future.")
-            min_end_time = now - datetime.timedelta(seconds=APIConfig.MIN_END_TIME_OFFSET)
-            if end_dt > min_end_time:
-                self.update_status(f"End time adjusted to {min_end_time.strftime('%Y-%m-%d %H:%M:%S')}Z")
-                end_dt = min_end_time
+            checked_end = check_time_range(start_dt, end_dt)
+            if checked_end != end_dt:
+                self.update_status(f"End time adjusted to {checked_end.strftime('%Y-%m-%d %H:%M:%S')}Z")
+                end_dt = checked_end
             keywords = self.keyword_entry.get().strip()
             if not keywords:
                 raise ValueError("Keywords are required.")
@@ -309,22 +353,23 @@ class xApp:
             return None
 
     def queue_search(self):
+        if not self._engine_ready():
+            return
         user_input = self.validate_inputs()
         if user_input is None:
             return
         keywords, start_time, end_time = user_input
-        self.action_queue.put(('search', {
-            'keywords': keywords,
-            'start_time': start_time,
-            'end_time': end_time,
-            'verified_only': self.verified_only.get(),
-            'no_replies': self.no_replies.get(),
-            'retries': 0
-        }))
-        self.update_status("Search queued")
+        self.engine.submit_search(self.engine.search_params(
+            keywords, start_time, end_time,
+            verified_only=self.verified_only.get(),
+            no_replies=self.no_replies.get(),
+            incremental=self.incremental_search.get()
+        ))
 
     def queue_actions(self):
-        selected_posts = [post for post, var in self.post_check_vars if var.get() == 1]
+        if not self._engine_ready():
+            return
+        selected_posts = [post for post in self.store if post.id not in self.excluded_post_ids]
         if not selected_posts:
             self.update_status("No posts selected")
             return
@@ -340,400 +385,149 @@ class xApp:
             if len(reply_text) > APIConfig.MAX_POST_LENGTH:
                 messagebox.showwarning("Length Error", f"Reply exceeds {APIConfig.MAX_POST_LENGTH} characters")
                 return
-            for post in selected_posts:
-                self.action_queue.put(('reply', {'post_id': post['id'], 'text': reply_text, 'retries': 0}))
-                self.update_status(f"Reply queued for post {post['id']}")
-
-        if self.like_var.get():
-            for post in selected_posts:
-                self.action_queue.put(('like', {'post_id': post['id'], 'retries': 0}))
-                self.update_status(f"Like queued for post {post['id']}")
 
+        actions = []
+        for post in selected_posts:
+            if self.reply_var.get():
+                actions.append(('reply', {'post_id': post.id, 'text': reply_text}))
+            if self.like_var.get():
+                actions.append(('like', {'post_id': post.id}))
+        batch = self.engine.submit_batch(actions)
+        if batch is not None:
+            self._show_batch(batch)
+
+    def _show_batch(self, batch):
+        """Make batch the one the Pause and Cancel buttons control"""
+        self.batch = batch
+        self.pause_button.config(state="normal", text="Resume Actions" if batch.state == PAUSED else "Pause Actions")
         self.cancel_button.config(state="normal")
         self.execute_button.config(state="disabled")
+        self._refresh_batch_view()
 
-    def cancel_actions(self):
-        self.stop_processing_event.set()
-        with self.action_queue.mutex:
-            self.action_queue.queue.clear()
-        self.update_status("All queued actions canceled.")
-        self.cancel_button.config(state="disabled")
-        self.execute_button.config(state="normal")
-
-    def process_action_queue(self):
-        while self.running:
-            if self.stop_processing_event.is_set():
-                break
-            if not self.action_queue.empty():
-                action_type, params = self.action_queue.get()
-                if action_type == 'search':
-                    self.perform_search(params)
-                elif action_type == 'reply':
-                    self.perform_reply(params)
-                elif action_type == 'like':
-                    self.perform_like(params)
-                self.action_queue.task_done()
-                if self.action_queue.empty() and not self.stop_processing_event.is_set():
-                    self.root.after(0, lambda: self.update_status("All actions completed"))
-            else:
-                time.sleep(1)
-
-    def perform_search(self, params):
-        start_time = time.time()
-        query = f"{params['keywords']} -is:retweet"
-        if params['verified_only']:
-            query += " is:verified"
-        if params['no_replies']:
-            query += " -is:reply"
-            self.update_status("ℹ️ Excluding replies from search results")
-        else:
-            self.update_status("ℹ️ Including replies in search results")
-
-        headers = APIConfig.DEFAULT_HEADERS.copy()
-        headers["Authorization"] = f"Bearer {BEARER_TOKEN}"
-        params_dict = {
-            "query": query,
-            "start_time": params['start_time'],
-            "end_time": params['end_time'],
-            "max_results": min(self.max_search_results, 100),  # Twitter API max is 100
-            "tweet.fields": "created_at",
-            "expansions": "author_id",
-            "user.fields": "username"
-        }
-
-        def search_call():
-            self.update_status("Sending search request to Twitter API...")
-            logger.info(f"Search query: {query}, start_time: {params['start_time']}, end_time: {params['end_time']}")
-            return requests.get(APIConfig.SEARCH_ENDPOINT, headers=headers, params=params_dict, timeout=30)
-
-        try:
-            self.debug_log(f"Executing search: {query}")
-            self.update_status("Performing search...")
-            response, success = self.execute_api_call(search_call, 'GET /2/tweets/search/recent')
-            self.update_status("Search API call completed, processing response...")
-            response.raise_for_status()
-            posts = response.json()
-            self.posts = posts.get('data', [])
-            self.users = posts.get('includes', {}).get("users", [])
-            self.update_status(f"Search completed. Found {len(self.posts)} posts")
-            logger.info(f"Search successful: {len(self.posts)} posts found")
-            self.root.after(0, self.update_search_results)
-        except requests.exceptions.Timeout:
-            self.update_status("⚠️ Search request timed out. Will retry automatically...")
-            logger.warning("Search request timed out")
-            self.handle_retry('search', params, None, Exception("Timeout"), 'GET /2/tweets/search/recent', start_time)
-        except requests.exceptions.HTTPError as e:
-            error_details = self._format_api_error_details(
-                f"Search HTTP Error ({e.response.status_code})",
-                "GET /2/tweets/search/recent",
-                params_dict,
-                e.response,
-                str(e)
-            )
-            if e.response.status_code == 429:
-                self.update_status(f"⚠️ Rate limit exceeded: {error_details}")
-            else:
-                self.update_status(f"⚠️ Search failed: {error_details}")
-            logger.error(f"Search HTTP error: {e}")
-            self.handle_retry('search', params, e.response, e, 'GET /2/tweets/search/recent', start_time)
-        except Exception as e:
-            self.update_status(f"⚠️ Search failed: {str(e)}. Will retry automatically...")
-            logger.error(f"Search error: {e}")
-            self.handle_retry('search', params, None, e, 'GET /2/tweets/search/recent', start_time)
-
-    def perform_reply(self, params):
-        if not self.ensure_client():
+    def toggle_pause_actions(self):
+        if self.batch is None:
             return
-        start_time = time.time()
-
-        def reply_call():
-            self.update_status("Sending reply to Twitter API...")
-            logger.info(f"Replying to post {params['post_id']} with text: {params['text'][:50]}...")
-            return self.client.create_tweet(text=params['text'], in_reply_to_tweet_id=params['post_id'])
-
-        try:
-            self.debug_log(f"Replying to post {params['post_id']}")
-            self.update_status(f"Preparing to reply to post {params['post_id']}...")
-            response, success = self.execute_api_call(reply_call, 'POST /2/tweets')
-            self.update_status("Reply API call completed, processing response...")
-            self.update_status(f"Successfully replied to post {params['post_id']}")
-            logger.info(f"Reply successful for post {params['post_id']}")
-        except Exception as e:
-            # Create request details for error formatting
-            request_details = {
-                'text': params['text'][:50] + "..." if len(params['text']) > 50 else params['text'],
-                'in_reply_to_tweet_id': params['post_id']
-            }
-
-            error_details = self._format_api_error_details(
-                "Reply Error",
-                "POST /2/tweets",
-                request_details,
-                getattr(e, 'response', None),
-                str(e)
-            )
-
-            # Check if it's a rate limit error
-            if hasattr(e, 'response') and e.response and e.response.status_code == 429:
-                self.update_status(f"⚠️ Reply rate limit exceeded: {error_details}")
-            else:
-                self.update_status(f"⚠️ Reply failed: {error_details}")
-
-            logger.error(f"Reply failed for post {params['post_id']}: {str(e)}")
-            self.handle_retry('reply', params, getattr(e, 'response', None), e, 'POST /2/tweets', start_time)
+        if self.batch.state == PAUSED:
+            self.batch.resume()
+            self.pause_button.config(text="Pause Actions")
+            self.update_status(f"Batch {self.batch.job_id} resumed")
+        else:
+            self.batch.pause()
+            self.pause_button.config(text="Resume Actions")
+            self.update_status(f"Batch {self.batch.job_id} paused; calls already started will finish")
 
-    def perform_like(self, params):
-        if not self.ensure_client():
+    def cancel_actions(self):
+        if self.batch is not None:
+            self.batch.cancel()
+        self._refresh_batch_view()
+
+    def _refresh_batch_view(self):
+        """Show the current batch's progress and ETA; runs once a second while a batch is active"""
+        if self._batch_refresh is not None:
+            self.root.after_cancel(self._batch_refresh)
+            self._batch_refresh = None
+        if self.batch is None:
             return
-        start_time = time.time()
-
-        def like_call():
-            self.update_status("Sending like to Twitter API...")
-            logger.info(f"Liking post {params['post_id']}")
-            return self.client.like(params['post_id'])
-
-        try:
-            self.debug_log(f"Liking post {params['post_id']}")
-            self.update_status(f"Preparing to like post {params['post_id']}...")
-            response, success = self.execute_api_call(like_call, 'POST /2/users/:id/likes')
-            self.update_status("Like API call completed, processing response...")
-            self.update_status(f"Successfully liked post {params['post_id']}")
-            logger.info(f"Like successful for post {params['post_id']}")
-        except Exception as e:
-            # Create request details for error formatting
-            request_details = {
-                'tweet_id': params['post_id']
-            }
-
-            error_details = self._format_api_error_details(
-                "Like Error",
-                "POST /2/users/:id/likes",
-                request_details,
-                getattr(e, 'response', None),
-                str(e)
-            )
+        text = self.batch.format_progress()
+        if self.batch.finished:
+            self.pause_button.config(state="disabled", text="Pause Actions")
+            self.cancel_button.config(state="disabled")
+            self.execute_button.config(state="normal" if self.store else "disabled")
+        elif self.batch.state == PAUSED:
+            text += " - paused"
+        else:
+            minutes, seconds = divmod(int(self.engine.batch_eta(self.batch)), 60)
+            hours, minutes = divmod(minutes, 60)
+            text += f" - ETA {hours:02d}:{minutes:02d}:{seconds:02d}"
+        self.batch_label.config(text=text)
+        if self.running and not self.batch.finished:
+            self._batch_refresh = self.root.after(1000, self._refresh_batch_view)
+
+    def clear_search_results(self):
+        self.results_tree.delete(*self.results_tree.get_children())
+        self.excluded_post_ids.clear()
+        self.store.clear()
+        self._show_post_preview()
+        self.results_count_label.config(text="")
+        self.execute_button.config(state="disabled")
 
-            # Check if it's a rate limit error
-            if hasattr(e, 'response') and e.response and e.response.status_code == 429:
-                self.update_status(f"⚠️ Like rate limit exceeded: {error_details}")
-            else:
-                self.update_status(f"⚠️ Like failed: {error_details}")
-
-            logger.error(f"Like failed for post {params['post_id']}: {str(e)}")
-            self.handle_retry('like', params, getattr(e, 'response', None), e, 'POST /2/users/:id/likes', start_time)
-
-    def update_search_results(self):
-        for widget in self.scrollable_frame.winfo_children():
-            widget.destroy()
-        self.post_check_vars.clear()
-
-        if self.posts:
-            user_dict = {user['id']: user['username'] for user in self.users}
-            for post in self.posts:
-                username = user_dict.get(post['author_id'], "Unknown")
-                post_frame = ttk.Frame(self.scrollable_frame)
-                post_frame.pack(fill="x", pady=2, padx=5)
-                check_var = tk.IntVar(value=1)
-                ttk.Checkbutton(post_frame, variable=check_var).pack(side="left", anchor="n")
-
-                # Create a frame for the post content to handle proper sizing
-                content_frame = ttk.Frame(post_frame)
-                content_frame.pack(side="left", fill="x", expand=True)
-
-                # Use Text widget for selectable post content with better height calculation
-                post_text = tk.Text(content_frame, wrap="word", relief="flat", borderwidth=0,
-                                  font=("TkDefaultFont", 9), padx=5, pady=2)
-                post_content = f"@{username}: {post['text']}\n[Posted at: {post['created_at']}]"
-                post_text.insert("1.0", post_content)
-                post_text.config(state="disabled", background=self.root.cget("background"))
-
-                # Calculate required height more accurately
-                # Get the width of the text widget to calculate wrapping
-                self.root.update_idletasks()  # Ensure widget is rendered
-                widget_width = max(400, content_frame.winfo_width() - 20)  # Minimum width with padding
-
-                # Estimate characters per line based on widget width
-                chars_per_line = max(40, widget_width // 8)  # Rough estimate: ~8 pixels per character
-
-                # Calculate lines needed
-                lines = post_content.count('\n') + 1
-                wrapped_lines = max(1, (len(post_content) // chars_per_line) + 1)
-                total_lines = max(lines, wrapped_lines)
-
-                # Set height with reasonable limits
-                height = min(max(total_lines, 2), 15)  # Min 2 lines, max 15 lines
-                post_text.config(height=height)
-
-                post_text.pack(fill="x", expand=True)
-
-                # Make text selectable but prevent editing
-                post_text.bind("<Key>", lambda e: "break")  # Prevent keyboard input
-                post_text.bind("<Button-1>", self._start_text_selection)  # Allow selection
-                post_text.bind("<Button-3>", self._show_context_menu)  # Right-click menu
-
-                self.post_check_vars.append((post, check_var))
+    def append_search_results(self, posts: list, users: list):
+        """Merge one page of results into the store and add rows for the posts not already shown"""
+        added, evicted = self.store.add_page(posts, users)
+        if evicted:
+            self.results_tree.delete(*evicted)
+            self.excluded_post_ids.difference_update(evicted)
+        for post in added:
+            self.results_tree.insert("", tk.END, iid=post.id, values=(
+                "☑", f"@{self.store.username(post.author_id)}", " ".join(post.text.split()), post.created_at))
+        if added:
             self.execute_button.config(state="normal")
-        else:
-            ttk.Label(self.scrollable_frame, text="No posts found.").pack()
+        self.results_count_label.config(text=f"{len(self.store)} posts")
 
-        # Update scroll region after all widgets are added
-        self.root.after(200, self._update_scroll_region)
+    def _show_search_page(self, params, posts: list, users: list):
+        start = time.time()
+        self.append_search_results(posts, users)
+        self.engine.tracer.record(params, 'gui_update', start, time.time(), posts=len(posts))
 
-    def _update_scroll_region(self):
-        """Update the scroll region to ensure all content is visible"""
-        try:
-            self.canvas.update_idletasks()
-            # Get the bounding box of all content in the scrollable frame
-            bbox = self.canvas.bbox("all")
-            if bbox:
-                self.canvas.configure(scrollregion=bbox)
-            else:
-                # Fallback if bbox is None
-                self.canvas.configure(scrollregion=(0, 0, self.canvas.winfo_width(), self.canvas.winfo_height()))
-        except Exception as e:
-            logger.error(f"Error updating scroll region: {e}")
-            # Fallback scroll region
-            self.canvas.configure(scrollregion=(0, 0, 1000, 2000))
+    def finish_search_results(self):
+        if not self.store:
+            self.results_count_label.config(text="No posts found.")
 
     def on_closing(self):
         self.running = False
+        if self.engine:
+            self.engine.shutdown()
         self.root.destroy()
 
-    def calculate_retry_delay(self, response, call_type: str, retries: int):
-        if response and hasattr(response, 'status_code') and response.status_code == 429:
-            # Rate limit exceeded, use reset time from headers
-            reset_time = response.headers.get('X-Rate-Limit-Reset')
-            if reset_time:
-                try:
-                    reset_timestamp = int(reset_time)
-                    current_time = int(time.time())
-                    delay = max(0, reset_timestamp - current_time)
-                    self.update_status(f"Rate limit exceeded. Retrying in {delay} seconds (at {datetime.datetime.fromtimestamp(reset_timestamp).strftime('%H:%M:%S')})")
-                    return delay
-                except (ValueError, TypeError):
-                    pass
-
-        # Use configurable retry times when API doesn't provide reset time
-        if call_type == 'search':
-            delay = self.search_retry_minutes * 60
-        elif call_type == 'like':
-            delay = self.like_retry_minutes * 60
-        elif call_type == 'reply':
-            delay = self.reply_retry_hours * 60 * 60
-        else:
-            delay = 300  # 5 minutes default
-
-        retry_time = datetime.datetime.now() + datetime.timedelta(seconds=delay)
-        self.update_status(f"Using configured retry time. Will retry {call_type} in {delay} seconds (at {retry_time.strftime('%H:%M:%S')})")
-        return delay
-
-    def handle_retry(self, action_type: str, params, response, exception, call_ref: str, start_time: float):
-        duration = time.time() - start_time
-        self.logger.log_call(call_ref, duration, None)
-        retries = params.get('retries', 0)
-
-        if retries >= APIConfig.MAX_RETRIES:
-            self.update_status(f"❌ Max retries ({APIConfig.MAX_RETRIES}) reached for {action_type}. Operation failed.")
-            logger.error(f"Max retries reached for {action_type} on {call_ref}")
-            self._clear_retry_display()
-            return False
-
-        # Calculate retry delay
-        delay = self.calculate_retry_delay(response, action_type, retries)
-        retry_time = datetime.datetime.now() + datetime.timedelta(seconds=delay)
-
-        # Start visual countdown
-        self._start_retry_countdown(action_type, delay, retries + 1, params, call_ref)
-
-        # Wait for countdown to complete or be cancelled
-        self.current_retry_thread.join()
-
-        # Check if retry was cancelled
-        if self.retry_cancelled:
-            self.update_status(f"⚠️ Retry for {action_type} was cancelled by user")
-            self.retry_cancelled = False
-            self._clear_retry_display()
-            return False
-
-        # Retry was not cancelled, proceed
-        params['retries'] = retries + 1
-        self.action_queue.put((action_type, params))
-        self._clear_retry_display()
-        return True
-
-    def execute_api_call(self, call_func, call_ref: str):
-        start_time = time.time()
-        try:
-            response = call_func()
-            duration = time.time() - start_time
-            self.logger.log_call(call_ref, duration, response)
-            return response, True
-        except Exception as e:
-            duration = time.time() - start_time
-            self.logger.log_call(call_ref, duration, None)
-            raise e
-
-    def ensure_client(self):
-        if not self.client:
-            self.client = create_client()
-            if not self.client:
-                self.update_status("API reconnection failed")
-                return False
-        return True
-
-    def _start_retry_countdown(self, action_type: str, delay: int, attempt: int, params, call_ref: str):
-        """Start visual countdown for retry with progress bar and cancel option"""
-        self.retry_cancelled = False
-
-        def countdown_thread():
-            try:
-                # Update UI elements
-                self.root.after(0, lambda: self.retry_label.config(text=f"Retrying {action_type} (attempt {attempt}/{APIConfig.MAX_RETRIES})"))
-                self.root.after(0, lambda: self.retry_progress.config(maximum=delay, value=0))
-                self.root.after(0, lambda: self.cancel_retry_button.config(state="normal"))
-
-                remaining = delay
-                while remaining > 0 and not self.retry_cancelled:
-                    # Update countdown display
-                    minutes, seconds = divmod(remaining, 60)
-                    time_str = f"{minutes:02d}:{seconds:02d}" if minutes > 0 else f"{seconds}s"
-
-                    self.root.after(0, lambda t=time_str, r=remaining, d=delay: self._update_countdown_display(t, r, d))
-
-                    time.sleep(1)
-                    remaining -= 1
-
-                if not self.retry_cancelled:
-                    # Countdown completed successfully
-                    self.root.after(0, lambda: self.retry_label.config(text=f"Retrying {action_type} now..."))
-                    self.root.after(0, lambda: self.countdown_label.config(text=""))
-                    self.root.after(0, lambda: self.retry_progress.config(value=delay))
-
-            except Exception as e:
-                logger.error(f"Error in countdown thread: {e}")
-
-        self.current_retry_thread = threading.Thread(target=countdown_thread, daemon=True)
-        self.current_retry_thread.start()
-
-    def _update_countdown_display(self, time_str: str, remaining: int, total: int):
-        """Update the countdown display elements"""
-        self.countdown_label.config(text=f"Time remaining: {time_str}")
-        self.retry_progress.config(value=total - remaining)
-
-    def cancel_current_retry(self):
-        """Cancel the current retry countdown"""
-        if self.current_retry_thread and self.current_retry_thread.is_alive():
-            self.retry_cancelled = True
-            self.update_status("Cancelling retry...")
-
-    def _clear_retry_display(self):
-        """Clear the retry countdown display"""
-        self.root.after(0, lambda: self.retry_label.config(text="No active retries"))
-        self.root.after(0, lambda: self.countdown_label.config(text=""))
-        self.root.after(0, lambda: self.retry_progress.config(value=0))
-        self.root.after(0, lambda: self.cancel_retry_button.config(state="disabled"))
-
+    def _refresh_retry_view(self):
+        """Sync the pending-retries table with the scheduler"""
+        now = time.time()
+        pending = self.engine.retry_scheduler.pending()
+        current_ids = set()
+        for retry in pending:
+            iid = str(retry.retry_id)
+            current_ids.add(iid)
+            minutes, seconds = divmod(int(retry.remaining(now)), 60)
+            hours, minutes = divmod(minutes, 60)
+            values = (
+                retry.action_type,
+                retry.params.get('post_id') or retry.params.get('keywords', ""),
+                f"{retry.params.get('retries', 0)}/{APIConfig.MAX_RETRIES}",
+                datetime.datetime.fromtimestamp(retry.due).strftime('%H:%M:%S'),
+                f"{hours:02d}:{minutes:02d}:{seconds:02d}"
+            )
+            if self.retry_tree.exists(iid):
+                self.retry_tree.item(iid, values=values)
+            else:
+                self.retry_tree.insert("", tk.END, iid=iid, values=values)
+        for iid in self.retry_tree.get_children():
+            if iid not in current_ids:
+                self.retry_tree.delete(iid)
+        self._update_retry_label()
+        if self.running:
+            self.root.after(1000, self._refresh_retry_view)
+
+    def cancel_selected_retries(self):
+        """Cancel the retries selected in the pending-retries table"""
+        if not self._engine_ready():
+            return
+        for iid in self.retry_tree.selection():
+            if self.engine.cancel_retries([int(iid)]):
+                self.update_status(f"⚠️ Retry of {self.retry_tree.set(iid, 'action')} was cancelled by user")
+            self.retry_tree.delete(iid)
+        self._update_retry_label()
+
+    def cancel_all_retries(self):
+        if not self._engine_ready():
+            return
+        count = self.engine.cancel_retries()
+        self.retry_tree.delete(*self.retry_tree.get_children())
+        self.update_status(f"⚠️ {count} pending retries cancelled by user")
+        self._update_retry_label()
 
+    def _update_retry_label(self):
+        count = len(self.retry_tree.get_children())
+        self.retry_label.config(text=f"{count} pending retries" if count else "No active retries")
 
     def _start_text_selection(self, event):
         """Allow text selection in read-only text widgets"""
@@ -896,138 +690,11 @@ class xApp:
         # Handle window close
         diag_window.protocol("WM_DELETE_WINDOW", close_window)
 
-    def _format_api_error_details(self, error_type, endpoint, request_params, response, error_message):
-        """Format comprehensive API error details for better debugging"""
-        details = f"{error_type}: {error_message}"
+def main():
+    logging.basicConfig(level=logging.INFO, format="[%(asctime)s] %(levelname)s: %(message)s", datefmt="%Y-%m-%d %H:%M:%S")
+    root = tk.Tk()
+    xApp(root)
+    root.mainloop()
 
-        # Add request information
-        details += f"\n📡 Endpoint: {endpoint}"
-
-        if request_params:
-            # Mask sensitive information
-            safe_params = {}
-            for key, value in request_params.items():
-                if 'token' in key.lower() or 'key' in key.lower():
-                    safe_params[key] = "***MASKED***"
-                else:
-                    safe_params[key] = value
-            details += f"\n📋 Parameters: {safe_params}"
-
-        # Add response information if available
-        if response:
-            details += f"\n📊 Status Code: {response.status_code}"
-
-            # Add specific troubleshooting for common errors
-            if response.status_code == 400:
-                details += "\n🚨 400 Bad Request - Common causes:"
-                details += "\n   • Invalid request parameters or malformed data"
-                details += "\n   • Tweet text too long or contains invalid characters"
-                details += "\n   • Invalid date format in search parameters"
-                details += "\n   • Duplicate tweet content"
-                details += "\n💡 Check your input data and try again"
-            elif response.status_code == 403:
-                details += "\n🚫 403 Forbidden - Common causes:"
-                details += "\n   • Missing write permissions for likes/replies"
-                details += "\n   • Tweet is protected/private"
-                details += "\n   • Account suspended or restricted"
-                details += "\n   • Missing OAuth write scope"
-                details += "\n💡 Check your app permissions and tweet visibility"
-
-            # Try to get Twitter API error details
-            try:
-                if hasattr(response, 'json'):
-                    error_data = response.json()
-                    if 'errors' in error_data and error_data['errors']:
-                        api_error = error_data['errors'][0]
-                        if 'message' in api_error:
-                            details += f"\n❌ API Message: {api_error['message']}"
-                        if 'code' in api_error:
-                            details += f"\n🔢 Error Code: {api_error['code']}"
-                            # Add documentation link for common errors
-                            doc_link = self._get_error_documentation_link(api_error['code'])
-                            if doc_link:
-                                details += f"\n📖 Documentation: {doc_link}"
-
-                            # Add specific troubleshooting for common error codes
-                            troubleshooting = self._get_error_troubleshooting(api_error['code'])
-                            if troubleshooting:
-                                details += f"\n🔧 Troubleshooting: {troubleshooting}"
-            except Exception:
-                pass
-
-            # Add rate limit information if available
-            if hasattr(response, 'headers'):
-                rate_limit_remaining = response.headers.get('X-Rate-Limit-Remaining')
-                rate_limit_reset = response.headers.get('X-Rate-Limit-Reset')
-                if rate_limit_remaining:
-                    details += f"\n⏱️ Rate Limit Remaining: {rate_limit_remaining}"
-                if rate_limit_reset:
-                    try:
-                        reset_time = datetime.datetime.fromtimestamp(int(rate_limit_reset))
-                        details += f"\n🔄 Rate Limit Resets: {reset_time.strftime('%H:%M:%S UTC')}"
-                    except:
-                        details += f"\n🔄 Rate Limit Reset: {rate_limit_reset}"
-
-        return details
-
-    def _get_error_documentation_link(self, error_code):
-        """Get documentation link for common Twitter API error codes"""
-        error_links = {
-            32: "https://developer.twitter.com/en/docs/authentication/api-reference/authenticate",
-            34: "https://developer.twitter.com/en/docs/twitter-api/v2/tweets/lookup/api-reference/get-tweets-id",
-            36: "https://developer.twitter.com/en/docs/twitter-api/v2/tweets/manage-tweets/api-reference/post-tweets",
-            44: "https://developer.twitter.com/en/docs/twitter-api/v2/tweets/manage-tweets/api-reference/post-tweets",
-            64: "https://developer.twitter.com/en/docs/twitter-api/v2/tweets/manage-tweets/api-reference/post-tweets",
-            88: "https://developer.twitter.com/en/docs/rate-limits",
-            89: "https://developer.twitter.com/en/docs/authentication/oauth-2-0/authorization-code",
-            99: "https://developer.twitter.com/en/docs/authentication/oauth-2-0/authorization-code",
-            130: "https://developer.twitter.com/en/docs/twitter-api/v2/tweets/search/api-reference/get-tweets-search-recent",
-            131: "https://developer.twitter.com/en/docs/twitter-api/v2/tweets/search/api-reference/get-tweets-search-recent",
-            135: "https://developer.twitter.com/en/docs/authentication/api-reference/authenticate",
-            144: "https://developer.twitter.com/en/docs/twitter-api/v2/tweets/manage-tweets/api-reference/delete-tweets-id",
-            179: "https://developer.twitter.com/en/docs/twitter-api/v2/tweets/lookup/api-reference/get-tweets-id",
-            185: "https://developer.twitter.com/en/docs/twitter-api/v2/tweets/manage-tweets/api-reference/post-tweets",
-            186: "https://developer.twitter.com/en/docs/twitter-api/v2/tweets/manage-tweets/api-reference/post-tweets",
-            187: "https://developer.twitter.com/en/docs/twitter-api/v2/tweets/manage-tweets/api-reference/post-tweets",
-            200: "https://developer.twitter.com/en/docs/twitter-api/v2/tweets/manage-tweets/api-reference/post-tweets",
-            220: "https://developer.twitter.com/en/docs/rate-limits",
-            226: "https://developer.twitter.com/en/docs/twitter-api/v2/tweets/filtered-stream/api-reference/get-tweets-search-stream",
-            261: "https://developer.twitter.com/en/docs/twitter-api/v2/tweets/manage-tweets/api-reference/post-tweets",
-            326: "https://developer.twitter.com/en/docs/twitter-api/v2/tweets/manage-tweets/api-reference/post-tweets",
-            327: "https://developer.twitter.com/en/docs/twitter-api/v2/tweets/manage-tweets/api-reference/post-tweets",
-            349: "https://developer.twitter.com/en/docs/authentication/oauth-2-0/authorization-code",
-            415: "https://developer.twitter.com/en/docs/twitter-api/v2/tweets/manage-tweets/api-reference/post-tweets",
-            416: "https://developer.twitter.com/en/docs/twitter-api/v2/tweets/manage-tweets/api-reference/post-tweets"
-        }
-        return error_links.get(error_code)
-
-    def _get_error_troubleshooting(self, error_code):
-        """Get specific troubleshooting steps for common Twitter API error codes"""
-        troubleshooting = {
-            32: "Your app's API keys are invalid. Regenerate them in the Twitter Developer Portal.",
-            34: "The tweet you're trying to access doesn't exist or has been deleted.",
-            36: "You don't have permission to perform this action on this tweet.",
-            44: "This tweet has already been liked by your account.",
-            64: "Your account is suspended and cannot perform write actions.",
-            88: "Rate limit exceeded. Wait for the reset time shown above, or upgrade your API plan.",
-            89: "Your access token has expired. Re-authenticate your application.",
-            99: "Unable to verify your credentials. Check your API keys and access tokens.",
-            130: "Twitter is temporarily over capacity. Wait a few minutes and try again.",
-            131: "Internal Twitter error. This is usually temporary - try again later.",
-            135: "Authentication failed. Check your API keys, tokens, and OAuth flow.",
-            144: "The tweet you're trying to delete doesn't exist or isn't yours to delete.",
-            179: "You don't have permission to view this tweet (it's protected).",
-            185: "You are posting too frequently. Wait before posting again.",
-            186: "Your tweet is too long. Shorten it to fit within Twitter's character limit.",
-            187: "You're trying to post a duplicate tweet. Twitter doesn't allow exact duplicates.",
-            200: "You can't reply to a tweet that doesn't allow replies.",
-            220: "Your credentials don't have the required permissions for this action.",
-            226: "This request looks like it might be automated. Twitter may have flagged your activity.",
-            261: "Application cannot perform write actions. Check your app permissions in Developer Portal.",
-            326: "You have been temporarily locked out due to unusual activity. Wait and try again.",
-            327: "You cannot reply to this tweet (it may be from a blocked account).",
-            349: "You don't have the correct OAuth scope for this operation.",
-            415: "Unsupported media type. Check your file format and try again.",
-            416: "The tweet you're trying to reply to doesn't exist."
-        }
-        return troubleshooting.get(error_code)
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+import json
+import os
+from config import RateLimits
+
+OPTIONS_FILE = "user_options.json"
+
+DEFAULT_OPTIONS = {
+    'verified_only': False,
+    'no_replies': False,
+    'debug_mode': False,
+    'search_retry_minutes': 15,
+    'like_retry_minutes': 15,
+    'reply_retry_hours': 24,
+    'max_search_results': 50,
+    'license_level': 'Free',
+    'incremental_search': False
+}
+
+def load_options(path: str = OPTIONS_FILE) -> dict:
+    options = dict(DEFAULT_OPTIONS)
+    if os.path.exists(path):
+        with open(path, 'r') as f:
+            options.update(json.load(f))
+    if options['license_level'] not in RateLimits.LIMITS:
+        options['license_level'] = 'Free'
+    return options
+
+def save_options(options: dict, path: str = OPTIONS_FILE):
+    with open(path, 'w') as f:
+        json.dump(options, f, indent=4)
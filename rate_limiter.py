@@ -0,0 +1,247 @@
+import json
+import logging
+import math
+import os
+import re
+import threading
+import time
+from urllib.parse import urlparse
+from config import APIConfig, RateLimits
+
+logger = logging.getLogger(__name__)
+
+WINDOW_SECONDS = {'15m': APIConfig.SECONDS_PER_15M, '24h': APIConfig.SECONDS_PER_24H}
+
+# (method, path pattern) -> call type, used to attribute response headers
+ENDPOINT_PATTERNS = [
+    ('GET', re.compile(r"/2/tweets/search/recent$"), 'search'),
+    ('POST', re.compile(r"/2/tweets$"), 'reply'),
+    ('POST', re.compile(r"/2/users/[^/]+/likes$"), 'like')
+]
+
+def call_type_for(method: str, url: str):
+    path = urlparse(str(url)).path.rstrip("/")
+    for endpoint_method, pattern, call_type in ENDPOINT_PATTERNS:
+        if method == endpoint_method and pattern.search(path):
+            return call_type
+    return None
+
+def _header_int(headers, name: str):
+    try:
+        return int(headers.get(name))
+    except (TypeError, ValueError):
+        return None
+
+def request_info(status: int, headers) -> dict:
+    """Status and rate-limit headers of a response, as recorded per request"""
+    return {'status': status, 'remaining': _header_int(headers, 'x-rate-limit-remaining'),
+            'reset': _header_int(headers, 'x-rate-limit-reset')}
+
+class TokenBucket:
+    """Client-side estimate of one endpoint's remaining quota.
+
+    Without server information the bucket refills continuously at
+    limit/window. Once a response reports the remaining count and reset time,
+    that count is authoritative until the reset, after which the bucket is
+    full again.
+    """
+
+    def __init__(self, capacity: int, window_seconds: int):
+        self.capacity = capacity
+        self.window_seconds = window_seconds
+        self.tokens = float(capacity)
+        self.updated = time.time()
+        self.reset_at = None
+        self.in_flight = 0
+
+    def refill(self, now: float):
+        if self.reset_at is not None:
+            if now < self.reset_at:
+                return
+            self.reset_at = None
+            self.tokens = float(self.capacity)
+        else:
+            elapsed = max(0.0, now - self.updated)
+            self.tokens = min(float(self.capacity), self.tokens + elapsed * self.capacity / self.window_seconds)
+        self.updated = now
+
+    def wait_time(self, now: float) -> float:
+        self.refill(now)
+        if self.tokens >= 1:
+            return 0.0
+        if self.reset_at is not None:
+            return self.reset_at - now
+        return (1 - self.tokens) * self.window_seconds / self.capacity
+
+    def time_for(self, count: int, now: float) -> float:
+        """Seconds until count calls will have fit in the quota"""
+        short = count - self.tokens
+        if short <= 0:
+            return 0.0
+        if self.reset_at is not None:
+            # A full quota at the reset, then another window per further capacity's worth
+            return self.reset_at - now + (math.ceil(short / self.capacity) - 1) * self.window_seconds
+        return short * self.window_seconds / self.capacity
+
+    def sync(self, remaining: int, reset_at: float, now: float):
+        self.refill(now)
+        if reset_at <= now:
+            return
+        # The reported count predates requests still in flight
+        self.tokens = float(max(0, remaining - max(0, self.in_flight - 1)))
+        self.reset_at = float(reset_at)
+        self.updated = now
+
+    def to_dict(self) -> dict:
+        return {'tokens': self.tokens, 'updated': self.updated, 'reset_at': self.reset_at}
+
+    def restore(self, state: dict):
+        self.tokens = min(float(self.capacity), float(state['tokens']))
+        self.updated = float(state['updated'])
+        self.reset_at = state.get('reset_at')
+
+class RateLimiter:
+    """Per-endpoint token buckets seeded from RateLimits and corrected from X-Rate-Limit-* headers.
+
+    Taking a token or reading headers only requests a snapshot; a background
+    thread writes it, so callers on the event loop never wait on the disk.
+    Requests made while a snapshot is being written are folded into the next one.
+    """
+
+    def __init__(self, license_level: str = 'Free', state_file: str = RateLimits.STATE_FILE):
+        self.state_file = state_file
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._saver_lock = threading.Lock()
+        self._saver = None
+        self._save_requested = False
+        self.buckets = {}
+        self.set_license_level(license_level)
+        self.load_state()
+
+    def set_license_level(self, level: str):
+        with self._lock:
+            self.license_level = level
+            self.buckets = {
+                call_type: TokenBucket(info['limit'], WINDOW_SECONDS[info['window']])
+                for call_type, info in RateLimits.LIMITS[level].items()
+            }
+
+    def load_state(self):
+        """Restore bucket levels from the last snapshot; elapsed time is refilled on next use"""
+        if not self.state_file or not os.path.exists(self.state_file):
+            return
+        try:
+            with open(self.state_file, 'r') as f:
+                state = json.load(f)
+            if state.get('license_level') != self.license_level:
+                return
+            with self._lock:
+                for call_type, bucket_state in state.get('buckets', {}).items():
+                    if call_type in self.buckets:
+                        self.buckets[call_type].restore(bucket_state)
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+
+    def save_state(self):
+        """Write a small snapshot atomically; its size doesn't depend on call history"""
+        if not self.state_file:
+            return
+        with self._save_lock:
+            with self._lock:
+                state = {
+                    'license_level': self.license_level,
+                    'buckets': {call_type: bucket.to_dict() for call_type, bucket in self.buckets.items()}
+                }
+            tmp_path = self.state_file + ".tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(state, f)
+            os.replace(tmp_path, self.state_file)
+
+    def request_save(self):
+        """Have the background thread write a snapshot soon"""
+        if not self.state_file:
+            return
+        with self._saver_lock:
+            self._save_requested = True
+            if self._saver is None:
+                self._saver = threading.Thread(target=self._run_saver, name="rate-limit-state", daemon=True)
+                self._saver.start()
+
+    def _run_saver(self):
+        while True:
+            with self._saver_lock:
+                if not self._save_requested:
+                    self._saver = None
+                    return
+                self._save_requested = False
+            try:
+                self.save_state()
+            except OSError as e:
+                logger.warning(f"Saving the rate-limit state failed: {e}")
+
+    def close(self):
+        """Wait for a pending snapshot, then write the final one"""
+        saver = self._saver
+        if saver is not None:
+            saver.join()
+        self.save_state()
+
+    def try_acquire(self, call_type: str) -> float:
+        """Take a token and return 0, or return the seconds until one is available"""
+        with self._lock:
+            bucket = self.buckets[call_type]
+            wait = bucket.wait_time(time.time())
+            if wait <= 0:
+                bucket.tokens -= 1
+                bucket.in_flight += 1
+        if wait <= 0:
+            self.request_save()
+        return max(0.0, wait)
+
+    def release(self, call_type: str):
+        """Mark a call as finished; its token stays spent"""
+        with self._lock:
+            bucket = self.buckets[call_type]
+            bucket.in_flight = max(0, bucket.in_flight - 1)
+
+    def refund(self, call_type: str):
+        """Give back a token taken for a call that was never sent"""
+        with self._lock:
+            bucket = self.buckets[call_type]
+            bucket.tokens = min(float(bucket.capacity), bucket.tokens + 1)
+        self.request_save()
+
+    def remaining(self, call_type: str) -> int:
+        with self._lock:
+            bucket = self.buckets[call_type]
+            bucket.refill(time.time())
+            return max(0, int(bucket.tokens))
+
+    def time_until(self, call_type: str, count: int) -> float:
+        with self._lock:
+            bucket = self.buckets[call_type]
+            now = time.time()
+            bucket.refill(now)
+            return bucket.time_for(count, now)
+
+    def update_from_headers(self, call_type: str, headers):
+        remaining = _header_int(headers, 'x-rate-limit-remaining')
+        reset_at = _header_int(headers, 'x-rate-limit-reset')
+        # Per-user daily caps (e.g. Free tier replies) can be tighter than the app limit
+        user_remaining = _header_int(headers, 'x-user-limit-24hour-remaining')
+        user_reset_at = _header_int(headers, 'x-user-limit-24hour-reset')
+        if user_remaining is not None and user_reset_at is not None and (remaining is None or user_remaining < remaining):
+            remaining, reset_at = user_remaining, user_reset_at
+        if remaining is None or reset_at is None:
+            return
+        with self._lock:
+            self.buckets[call_type].sync(remaining, reset_at, time.time())
+        self.request_save()
+
+    def response_hook(self, response, *args, **kwargs):
+        """requests response hook; attach to any session that talks to the X API"""
+        call_type = call_type_for(response.request.method, response.request.url)
+        if call_type in self.buckets:
+            self.update_from_headers(call_type, response.headers)
+        return response
@@ -0,0 +1,84 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from config import SearchConfig
+from search_state import normalize_query
+
+class SearchCache:
+    """On-disk cache of search results with a TTL and least-recently-used eviction"""
+
+    def __init__(self, path: str = SearchConfig.CACHE_FILE, ttl: int = SearchConfig.CACHE_TTL_SECONDS,
+                 max_entries: int = SearchConfig.CACHE_MAX_ENTRIES, max_bytes: int = SearchConfig.CACHE_MAX_BYTES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""CREATE TABLE IF NOT EXISTS search_cache (
+            key TEXT PRIMARY KEY,
+            payload TEXT NOT NULL,
+            created REAL NOT NULL,
+            accessed REAL NOT NULL,
+            size INTEGER NOT NULL)""")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS search_cache_accessed ON search_cache (accessed)")
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(query: str, start_time: str, end_time: str, max_results: int) -> str:
+        raw = json.dumps([normalize_query(query), start_time, end_time, max_results])
+        return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+    def get(self, key: str):
+        """Return (posts, users) for a fresh entry, or None"""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT payload, created FROM search_cache WHERE key = ?", (key,)).fetchone()
+            if row is None or now - row[1] > self.ttl:
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE search_cache SET accessed = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+        payload = json.loads(row[0])
+        return payload['posts'], payload['users']
+
+    def put(self, key: str, posts: list, users: list):
+        payload = json.dumps({'posts': posts, 'users': users}, ensure_ascii=False)
+        now = time.time()
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO search_cache (key, payload, created, accessed, size) "
+                               "VALUES (?, ?, ?, ?, ?)", (key, payload, now, now, len(payload)))
+            self._evict(now)
+            self._conn.commit()
+
+    def _evict(self, now: float):
+        # Caller holds self._lock
+        self._conn.execute("DELETE FROM search_cache WHERE created < ?", (now - self.ttl,))
+        count, total_bytes = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM search_cache").fetchone()
+        if count <= self.max_entries and total_bytes <= self.max_bytes:
+            return
+        doomed = []
+        for key, size in self._conn.execute("SELECT key, size FROM search_cache ORDER BY accessed ASC"):
+            if count <= self.max_entries and total_bytes <= self.max_bytes:
+                break
+            doomed.append((key,))
+            count -= 1
+            total_bytes -= size
+        self._conn.executemany("DELETE FROM search_cache WHERE key = ?", doomed)
+
+    def format(self) -> str:
+        lookups = self.hits + self.misses
+        hit_pct = 100.0 * self.hits / lookups if lookups else 0.0
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM search_cache").fetchone()[0]
+        return (f"Search Cache:\n"
+                f"  Hits: {self.hits}, Misses: {self.misses} ({hit_pct:.0f}% hit rate), Entries: {entries}")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
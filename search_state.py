@@ -0,0 +1,72 @@
+import json
+import os
+import threading
+from config import SearchConfig
+
+def normalize_query(query: str) -> str:
+    """Searches are case-insensitive, so case and spacing don't make a query different"""
+    return " ".join(query.split()).lower()
+
+class SearchCursors:
+    """Newest post id seen per normalized query, used as since_id for incremental searches.
+
+    The cursor only moves once a search has paged through every result. A
+    search cut short (max results reached or quota used up) leaves a resume
+    point instead: the since_id it ran with, the oldest post id it reached
+    (the next run's until_id) and the newest post id it saw, which becomes
+    the cursor once the rest of that span has been fetched.
+    """
+
+    def __init__(self, path: str = SearchConfig.STATE_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        self.cursors = {}
+        self.resume_points = {}
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, 'r') as f:
+                    state = json.load(f)
+                if isinstance(state.get('cursors'), dict):
+                    self.cursors = state['cursors']
+                    self.resume_points = state.get('resume', {})
+                else:
+                    # Older files hold the cursors only
+                    self.cursors = state
+            except (OSError, ValueError, AttributeError):
+                self.cursors = {}
+                self.resume_points = {}
+
+    def get(self, query: str):
+        with self._lock:
+            return self.cursors.get(normalize_query(query))
+
+    def resume_point(self, query: str):
+        """{'since_id', 'until_id', 'newest_id'} left by a search cut short, or None"""
+        with self._lock:
+            return self.resume_points.get(normalize_query(query))
+
+    def update(self, query: str, newest_id: str):
+        """Move the cursor after a search that fetched every result; clears the query's resume point"""
+        key = normalize_query(query)
+        with self._lock:
+            changed = self.resume_points.pop(key, None) is not None
+            current = self.cursors.get(key)
+            # Post ids are snowflakes: a larger id is a newer post
+            if current is None or int(current) < int(newest_id):
+                self.cursors[key] = newest_id
+                changed = True
+            if changed:
+                self._save()
+
+    def save_resume_point(self, query: str, since_id: str, until_id: str, newest_id: str):
+        with self._lock:
+            self.resume_points[normalize_query(query)] = {
+                'since_id': since_id, 'until_id': until_id, 'newest_id': newest_id}
+            self._save()
+
+    def _save(self):
+        # Caller holds self._lock
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({'cursors': self.cursors, 'resume': self.resume_points}, f, indent=4)
+        os.replace(tmp_path, self.path)
@@ -1,29 +1,292 @@
-from logger import APICallLogger
-from config import RateLimits
+import json
+import logging
+import os
+import threading
+import time
+from logger import APICallLogger, entry_time, is_hourly
+from config import APIConfig, LogConfig, RateLimits
+
+logger = logging.getLogger(__name__)
+
+class P2Quantile:
+    """Streaming quantile estimate using the P-squared algorithm (five markers, O(1) memory)"""
+    __slots__ = ('p', 'heights', 'positions', 'desired', 'increments')
+
+    def __init__(self, p: float):
+        self.p = p
+        self.heights = []
+        self.positions = [1, 2, 3, 4, 5]
+        self.desired = [1, 1 + 2 * p, 1 + 4 * p, 3 + 2 * p, 5]
+        self.increments = [0, p / 2, p, (1 + p) / 2, 1]
+
+    def add(self, x: float):
+        h = self.heights
+        if len(h) < 5:
+            h.append(x)
+            h.sort()
+            return
+
+        if x < h[0]:
+            h[0] = x
+            k = 0
+        elif x >= h[4]:
+            h[4] = x
+            k = 3
+        else:
+            k = 0
+            while x >= h[k + 1]:
+                k += 1
+
+        n = self.positions
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self.desired[i] += self.increments[i]
+
+        for i in range(1, 4):
+            d = self.desired[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                d = 1 if d > 0 else -1
+                candidate = self._parabolic(i, d)
+                if h[i - 1] < candidate < h[i + 1]:
+                    h[i] = candidate
+                else:
+                    h[i] = h[i] + d * (h[i + d] - h[i]) / (n[i + d] - n[i])
+                n[i] += d
+
+    def _parabolic(self, i: int, d: int) -> float:
+        h, n = self.heights, self.positions
+        return h[i] + d / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + d) * (h[i + 1] - h[i]) / (n[i + 1] - n[i])
+            + (n[i + 1] - n[i] - d) * (h[i] - h[i - 1]) / (n[i] - n[i - 1]))
+
+    def value(self) -> float:
+        h = self.heights
+        if not h:
+            return 0.0
+        if len(h) < 5:
+            return h[min(len(h) - 1, int(round(self.p * (len(h) - 1))))]
+        return h[2]
+
+    def to_dict(self) -> dict:
+        return {'heights': self.heights, 'positions': self.positions, 'desired': self.desired}
+
+    def restore(self, state: dict):
+        self.heights = list(state['heights'])
+        self.positions = list(state['positions'])
+        self.desired = list(state['desired'])
+
+class WindowCounter:
+    """Approximate sliding-window event count kept in a fixed ring of time buckets"""
+    __slots__ = ('bucket_seconds', 'bucket_ids', 'counts')
+
+    def __init__(self, window_seconds: int, buckets: int):
+        self.bucket_seconds = window_seconds / buckets
+        self.bucket_ids = [-1] * buckets
+        self.counts = [0] * buckets
+
+    def add(self, timestamp: float, count: int = 1):
+        bucket_id = int(timestamp // self.bucket_seconds)
+        slot = bucket_id % len(self.counts)
+        if self.bucket_ids[slot] == bucket_id:
+            self.counts[slot] += count
+        elif self.bucket_ids[slot] < bucket_id:
+            self.bucket_ids[slot] = bucket_id
+            self.counts[slot] = count
+
+    def total(self, now: float = None) -> int:
+        oldest = int((now or time.time()) // self.bucket_seconds) - len(self.counts)
+        return sum(c for b, c in zip(self.bucket_ids, self.counts) if b > oldest)
+
+    def to_dict(self) -> dict:
+        return {'bucket_ids': self.bucket_ids, 'counts': self.counts}
+
+    def restore(self, state: dict):
+        if len(state['counts']) == len(self.counts):
+            self.bucket_ids = list(state['bucket_ids'])
+            self.counts = list(state['counts'])
+
+class EndpointStats:
+    """Running totals for one endpoint, updated per log entry"""
+    __slots__ = ('count', 'successes', 'failures', 'mean', 'quantiles', 'windows')
+
+    def __init__(self):
+        self.count = 0
+        self.successes = 0
+        self.failures = 0
+        self.mean = 0.0
+        self.quantiles = {p: P2Quantile(p) for p in (0.5, 0.95, 0.99)}
+        self.windows = {
+            '15m': WindowCounter(APIConfig.SECONDS_PER_15M, 15),
+            '24h': WindowCounter(APIConfig.SECONDS_PER_24H, 96)
+        }
+
+    def record(self, timestamp: float, duration: float, success: bool):
+        self.count += 1
+        for window in self.windows.values():
+            window.add(timestamp)
+        if not success:
+            self.failures += 1
+            return
+        self.successes += 1
+        self.mean += (duration - self.mean) / self.successes
+        for quantile in self.quantiles.values():
+            quantile.add(duration)
+
+    def record_hour(self, timestamp: float, calls: int, failures: int, duration_sum: float):
+        """Add an hourly aggregate from the compacted log; its mean stands in for the hour's durations in the quantiles"""
+        self.count += calls
+        for window in self.windows.values():
+            window.add(timestamp, calls)
+        self.failures += failures
+        successes = calls - failures
+        if not successes:
+            return
+        self.successes += successes
+        self.mean += (duration_sum - successes * self.mean) / self.successes
+        for quantile in self.quantiles.values():
+            quantile.add(duration_sum / successes)
+
+    def to_dict(self) -> dict:
+        return {'count': self.count, 'successes': self.successes, 'failures': self.failures, 'mean': self.mean,
+                'quantiles': {str(p): quantile.to_dict() for p, quantile in self.quantiles.items()},
+                'windows': {name: window.to_dict() for name, window in self.windows.items()}}
+
+    def restore(self, state: dict):
+        self.count = state['count']
+        self.successes = state['successes']
+        self.failures = state['failures']
+        self.mean = state['mean']
+        for p, quantile in self.quantiles.items():
+            quantile.restore(state['quantiles'][str(p)])
+        for name, window in self.windows.items():
+            window.restore(state['windows'][name])
 
 class APICallStats:
-    def __init__(self, logger: APICallLogger, license_level: str = 'Free'):
+    """Per-endpoint statistics, kept up to date as calls are logged.
+
+    start() subscribes to the logger and then, on a background thread, seeds
+    the totals with the calls logged before that: from the snapshot saved at
+    the last close plus the entries logged since (read from the end of the
+    log), or from the whole log if there is no snapshot. The logger's lock is
+    only held to register the listener; the subscription's watermark keeps
+    the seeded and live entries from overlapping.
+    """
+
+    def __init__(self, logger: APICallLogger, license_level: str = 'Free',
+                 snapshot_path: str = LogConfig.STATS_SNAPSHOT_FILE):
         self.logger = logger
         self.license_level = license_level
+        self.snapshot_path = snapshot_path
+        self.endpoints = {call_type: EndpointStats() for call_type in APIConfig.API_REFS}
+        self._lock = threading.Lock()
+        self._seeder = None
+        self._seeded = threading.Event()
+        # Every entry logged up to this time is counted; saved as the snapshot's cut-off
+        self._newest = 0.0
+        self.sections = []
 
     def set_license_level(self, level: str):
         self.license_level = level
 
+    def add_section(self, source):
+        """Append source.format() to the stats output (connection pool, search cache, ...)"""
+        self.sections.append(source)
+
+    def start(self):
+        if self._seeder is not None:
+            return
+        # The snapshot is restored before any live entry is recorded
+        since = self._load_snapshot()
+        watermark = self.logger.subscribe(self.record)
+        with self._lock:
+            # Once seeded, everything logged up to the watermark is counted, aggregates included
+            self._newest = max(self._newest, watermark)
+        self._seeder = threading.Thread(target=self._seed, args=(since, watermark), name="stats-seed", daemon=True)
+        self._seeder.start()
+
+    def _seed(self, since, watermark: float):
+        try:
+            history = self.logger.iter_logs() if since is None else self.logger.iter_since(since)
+            for entry in history:
+                # Later entries reach the listener directly
+                if entry_time(entry) > watermark:
+                    break
+                self.record(entry)
+        except OSError as e:
+            logger.warning(f"Reading the call history for stats failed: {e}")
+        finally:
+            self._seeded.set()
+
+    def _load_snapshot(self):
+        """Restore the saved totals and return the time they run up to, or None without a usable snapshot"""
+        if not self.snapshot_path or not os.path.exists(self.snapshot_path):
+            return None
+        try:
+            with open(self.snapshot_path, 'r') as f:
+                snapshot = json.load(f)
+            endpoints = {call_type: EndpointStats() for call_type in APIConfig.API_REFS}
+            for call_type, state in snapshot['endpoints'].items():
+                if call_type in endpoints:
+                    endpoints[call_type].restore(state)
+            newest = float(snapshot['newest'])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        self.endpoints = endpoints
+        self._newest = newest
+        return newest
+
+    def save_snapshot(self):
+        """Write the totals, if the history has been fully read into them"""
+        if not self.snapshot_path or not self._seeded.is_set():
+            return
+        with self._lock:
+            snapshot = {'newest': self._newest,
+                        'endpoints': {call_type: endpoint.to_dict() for call_type, endpoint in self.endpoints.items()}}
+        tmp_path = self.snapshot_path + ".tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(snapshot, f)
+        os.replace(tmp_path, self.snapshot_path)
+
+    def close(self):
+        if self._seeder is not None:
+            self._seeder.join()
+        self.save_snapshot()
+
+    def record(self, entry: dict):
+        endpoint = self.endpoints.get(entry['endpoint'])
+        if endpoint is None:
+            return
+        with self._lock:
+            if is_hourly(entry):
+                endpoint.record_hour(entry_time(entry), entry['calls'], entry['failures'], entry['duration_sum'])
+            else:
+                endpoint.record(entry_time(entry), entry['duration'], entry['ok'])
+                self._newest = max(self._newest, entry_time(entry))
+
+    def get_endpoint_stats(self, call_type: str) -> EndpointStats:
+        return self.endpoints[call_type]
+
     def get_avg_duration(self, call_type: str) -> float:
-        api_refs = {
-            'search': 'GET /2/tweets/search/recent',
-            'reply': 'POST /2/tweets',
-            'like': 'POST /2/users/:id/likes'
-        }
-        durations = [log['duration'] for log in self.logger.get_logs()
-                     if log['api_ref'] == api_refs[call_type] and log['response'] != "Failed"]
-        return sum(durations) / len(durations) if durations else 0.0
+        return self.get_endpoint_stats(call_type).mean
 
     def format_stats(self) -> str:
         output = [f"License Level: {self.license_level}"]
+        now = time.time()
         for call_type in ['search', 'reply', 'like']:
             limit_info = RateLimits.LIMITS[self.license_level][call_type]
-            output.append(f"{call_type.capitalize()}:\n"
-                          f"  Limit: {limit_info['limit']}/{limit_info['window']}\n"
-                          f"  Avg Duration: {self.get_avg_duration(call_type):.2f}s")
-        return "\n".join(output)
\ No newline at end of file
+            endpoint = self.get_endpoint_stats(call_type)
+            with self._lock:
+                p50, p95, p99 = (endpoint.quantiles[p].value() for p in (0.5, 0.95, 0.99))
+                output.append(f"{call_type.capitalize()}:\n"
+                              f"  Limit: {limit_info['limit']}/{limit_info['window']}\n"
+                              f"  Calls: {endpoint.count} ({endpoint.successes} ok, {endpoint.failures} failed)\n"
+                              f"  Last 15m: {endpoint.windows['15m'].total(now)}, "
+                              f"Last 24h: {endpoint.windows['24h'].total(now)}\n"
+                              f"  Avg Duration: {endpoint.mean:.2f}s\n"
+                              f"  p50/p95/p99: {p50:.2f}s / {p95:.2f}s / {p99:.2f}s")
+        if self._seeder is not None and not self._seeded.is_set():
+            output.append("(Still reading earlier call history; totals are incomplete)")
+        for source in self.sections:
+            output.append(source.format())
+        return "\n".join(output)
@@ -0,0 +1,95 @@
+from collections import OrderedDict
+from config import StoreConfig
+
+class Post:
+    __slots__ = ('id', 'author_id', 'text', 'created_at')
+
+    def __init__(self, id: str, author_id: str, text: str, created_at: str):
+        self.id = id
+        self.author_id = author_id
+        self.text = text
+        self.created_at = created_at
+
+    @classmethod
+    def from_api(cls, data: dict) -> 'Post':
+        return cls(data['id'], data.get('author_id'), data.get('text', ""), data.get('created_at', ""))
+
+class User:
+    __slots__ = ('id', 'username')
+
+    def __init__(self, id: str, username: str):
+        self.id = id
+        self.username = username
+
+class PostStore:
+    """Posts and their authors indexed by id.
+
+    Results from overlapping searches are merged rather than duplicated. Once
+    more than max_posts are held, the posts seen least recently are evicted,
+    along with authors no remaining post refers to. Used from the Tk thread
+    only.
+    """
+
+    def __init__(self, max_posts: int = StoreConfig.MAX_POSTS):
+        self.max_posts = max_posts
+        self.posts = OrderedDict()
+        self.users = {}
+        self._author_refs = {}
+
+    def add_page(self, posts: list, users: list):
+        """Merge one page of API results; returns (new posts, evicted post ids)"""
+        for data in users:
+            user = self.users.get(data['id'])
+            if user is None:
+                self.users[data['id']] = User(data['id'], data.get('username', ""))
+            else:
+                user.username = data.get('username', user.username)
+        added = []
+        for data in posts:
+            post_id = data['id']
+            if post_id in self.posts:
+                self.posts.move_to_end(post_id)
+                continue
+            post = Post.from_api(data)
+            self.posts[post_id] = post
+            self._author_refs[post.author_id] = self._author_refs.get(post.author_id, 0) + 1
+            added.append(post)
+        for data in users:
+            # Only keep authors of posts we hold
+            if data['id'] not in self._author_refs:
+                self.users.pop(data['id'], None)
+        evicted = []
+        while len(self.posts) > self.max_posts:
+            post_id, post = self.posts.popitem(last=False)
+            self._release_author(post.author_id)
+            evicted.append(post_id)
+        # A post evicted in the same call it was added in never reaches the caller
+        if evicted:
+            added = [post for post in added if post.id in self.posts]
+        return added, evicted
+
+    def _release_author(self, author_id: str):
+        refs = self._author_refs.get(author_id, 0) - 1
+        if refs > 0:
+            self._author_refs[author_id] = refs
+        else:
+            self._author_refs.pop(author_id, None)
+            self.users.pop(author_id, None)
+
+    def get(self, post_id: str):
+        return self.posts.get(post_id)
+
+    def username(self, author_id: str) -> str:
+        user = self.users.get(author_id)
+        return user.username if user else "Unknown"
+
+    def clear(self):
+        self.posts.clear()
+        self.users.clear()
+        self._author_refs.clear()
+
+    def __len__(self) -> int:
+        return len(self.posts)
+
+    def __iter__(self):
+        return iter(self.posts.values())
@@ -0,0 +1,37 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logger import APICallLogger, JSONLinesLogBackend
+from stats import APICallStats
+
+def _open(tmp_path):
+    backend = JSONLinesLogBackend(str(tmp_path / "api_call_log.jsonl"), legacy_path=None, aggregate_after=0)
+    call_logger = APICallLogger(backend)
+    stats = APICallStats(call_logger, snapshot_path=str(tmp_path / "api_call_stats.json"))
+    return call_logger, stats
+
+def _restart(tmp_path) -> int:
+    """Start the stats over the existing log, wait for the seed and return the like count"""
+    call_logger, stats = _open(tmp_path)
+    stats.start()
+    stats.close()
+    call_logger.close()
+    return stats.get_endpoint_stats('like').count
+
+def test_snapshot_restart_counts_aggregated_history_once(tmp_path):
+    call_logger, _ = _open(tmp_path)
+    for _ in range(40):
+        call_logger.log_call('POST /2/users/:id/likes', 0.1, {'data': {'liked': True}})
+    call_logger.close()
+    # Compact every call into hourly aggregates, so the seeded history holds no raw entry
+    backend = JSONLinesLogBackend(str(tmp_path / "api_call_log.jsonl"), legacy_path=None, aggregate_after=0,
+                                  rotate_bytes=1)
+    backend._rotate()
+    backend.close()
+    backend.maintain()
+
+    assert _restart(tmp_path) == 40
+    assert _restart(tmp_path) == 40
+    assert _restart(tmp_path) == 40
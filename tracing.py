@@ -0,0 +1,229 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+from config import TracingConfig
+
+SERVICE_NAME = "x-ai-reply"
+
+def _new_id(size: int) -> str:
+    return os.urandom(size).hex()
+
+class ActionTrace:
+    """Per-action tracing state, kept in the action's params under 'trace'"""
+    __slots__ = ('trace_id', 'span_id', 'action_type', 'start', 'ready_at', 'retry_scheduled_at', 'ended')
+
+    def __init__(self, action_type: str, now: float):
+        self.trace_id = _new_id(16)
+        self.span_id = _new_id(8)
+        self.action_type = action_type
+        self.start = now
+        self.ready_at = now
+        self.retry_scheduled_at = None
+        self.ended = False
+
+class Span:
+    __slots__ = ('trace_id', 'span_id', 'parent_id', 'name', 'action_type', 'start', 'end', 'attributes')
+
+    def __init__(self, trace: ActionTrace, name: str, start: float, end: float, attributes: dict,
+                 root: bool = False):
+        self.trace_id = trace.trace_id
+        self.span_id = trace.span_id if root else _new_id(8)
+        self.parent_id = None if root else trace.span_id
+        self.name = name
+        self.action_type = trace.action_type
+        self.start = start
+        self.end = end
+        self.attributes = attributes
+
+    def to_otlp(self) -> dict:
+        span = {
+            'traceId': self.trace_id,
+            'spanId': self.span_id,
+            'name': self.name,
+            'kind': 1,
+            'startTimeUnixNano': str(int(self.start * 1e9)),
+            'endTimeUnixNano': str(int(self.end * 1e9)),
+            'attributes': [{'key': key, 'value': _otlp_value(value)}
+                           for key, value in dict(self.attributes, action=self.action_type).items()],
+        }
+        if self.parent_id:
+            span['parentSpanId'] = self.parent_id
+        if self.attributes.get('error'):
+            span['status'] = {'code': 2}
+        return span
+
+def _otlp_value(value) -> dict:
+    if isinstance(value, bool):
+        return {'boolValue': value}
+    if isinstance(value, int):
+        return {'intValue': str(value)}
+    if isinstance(value, float):
+        return {'doubleValue': value}
+    return {'stringValue': str(value)}
+
+class Tracer:
+    """Spans for each search, reply and like, from queueing to outcome.
+
+    Every action gets a root span named after its type, with children for
+    queue_wait, rate_limit_wait, retry_wait, api_call (with connect and server
+    time from the HTTP layer), parse and gui_update. Finished spans are kept in
+    a bounded buffer for export as OpenTelemetry (OTLP) JSON, and their
+    durations feed per-span histograms exported as Prometheus text.
+    """
+
+    def __init__(self, enabled: bool = TracingConfig.ENABLED, max_spans: int = TracingConfig.MAX_SPANS,
+                 buckets=TracingConfig.BUCKETS):
+        self.enabled = enabled
+        self.spans = deque(maxlen=max_spans)
+        self.buckets = tuple(buckets)
+        # (span name, action type) -> [count per bucket..., +Inf count, sum]
+        self.histograms = {}
+        self._lock = threading.Lock()
+
+    def _trace(self, params: dict, action_type: str = None, now: float = None):
+        trace = params.get('trace')
+        if trace is None or (trace.ended and action_type):
+            trace = params['trace'] = ActionTrace(action_type or "unknown", now or time.time())
+        return trace
+
+    def _add(self, span: Span):
+        duration = max(0.0, span.end - span.start)
+        with self._lock:
+            self.spans.append(span)
+            histogram = self.histograms.get((span.name, span.action_type))
+            if histogram is None:
+                histogram = self.histograms[(span.name, span.action_type)] = [0] * (len(self.buckets) + 2)
+            for index, bound in enumerate(self.buckets):
+                if duration <= bound:
+                    histogram[index] += 1
+            histogram[-2] += 1
+            histogram[-1] += duration
+
+    def queued(self, action_type: str, params: dict):
+        """The action was put on the action queue"""
+        if not self.enabled:
+            return
+        now = time.time()
+        self._trace(params, action_type, now).ready_at = now
+
+    def dispatched(self, params: dict, rate_wait: float):
+        """The executor handed the action to a worker after rate_wait seconds paced by the rate limiter"""
+        if not self.enabled:
+            return
+        now = time.time()
+        trace = self._trace(params)
+        if trace.retry_scheduled_at is not None:
+            self._add(Span(trace, 'retry_wait', trace.retry_scheduled_at, trace.ready_at, {}))
+            trace.retry_scheduled_at = None
+        paced_from = max(trace.ready_at, now - rate_wait)
+        self._add(Span(trace, 'queue_wait', trace.ready_at, paced_from, {}))
+        if rate_wait > 0:
+            self._add(Span(trace, 'rate_limit_wait', paced_from, now, {}))
+
+    def retry_scheduled(self, params: dict, delay: float):
+        if not self.enabled:
+            return
+        now = time.time()
+        trace = self._trace(params)
+        trace.retry_scheduled_at = now
+        trace.ready_at = now + delay
+
+    def api_call(self, params: dict, call_ref: str, start: float, end: float, timings: list,
+                 status_code: int = None, error: str = None):
+        """One API call attempt; timings are the per-request dicts from the HTTP layer"""
+        if not self.enabled:
+            return
+        trace = self._trace(params)
+        attributes = {'http.route': call_ref, 'attempt': params.get('retries', 0) + 1}
+        if status_code is not None:
+            attributes['http.status_code'] = status_code
+        if error:
+            attributes['error'] = error
+        parse = 0.0
+        if timings:
+            attributes['http.requests'] = len(timings)
+            attributes['new_connections'] = sum(1 for timing in timings if timing.get('new_connection'))
+            attributes['connect_ms'] = round(sum(timing.get('connect', 0.0) for timing in timings) * 1000, 3)
+            attributes['server_ms'] = round(sum(timing.get('server', 0.0) for timing in timings) * 1000, 3)
+            parse = sum(timing.get('parse', 0.0) for timing in timings)
+        self._add(Span(trace, 'api_call', start, end, attributes))
+        if parse:
+            self._add(Span(trace, 'parse', end - parse, end, {}))
+
+    def record(self, params: dict, name: str, start: float, end: float, **attributes):
+        """Any other child span of the action, e.g. parse or gui_update"""
+        if not self.enabled:
+            return
+        self._add(Span(self._trace(params), name, start, end, attributes))
+
+    def end(self, params: dict, outcome: str):
+        """Close the action's root span with its final outcome"""
+        if not self.enabled:
+            return
+        trace = params.get('trace')
+        if trace is None or trace.ended:
+            return
+        trace.ended = True
+        attributes = {'outcome': outcome, 'retries': params.get('retries', 0)}
+        if outcome == 'failed':
+            attributes['error'] = "failed"
+        self._add(Span(trace, trace.action_type, trace.start, time.time(), attributes, root=True))
+
+    def otlp_json(self, limit: int = None) -> dict:
+        """Recent spans as an OTLP/JSON ExportTraceServiceRequest"""
+        with self._lock:
+            spans = list(self.spans)
+        if limit:
+            spans = spans[-limit:]
+        return {'resourceSpans': [{
+            'resource': {'attributes': [{'key': 'service.name', 'value': {'stringValue': SERVICE_NAME}}]},
+            'scopeSpans': [{'scope': {'name': __name__}, 'spans': [span.to_otlp() for span in spans]}]
+        }]}
+
+    def prometheus(self) -> str:
+        """Span duration histograms in the Prometheus text exposition format"""
+        name = "x_ai_reply_span_duration_seconds"
+        lines = [f"# HELP {name} Duration of traced action phases.", f"# TYPE {name} histogram"]
+        with self._lock:
+            histograms = {key: list(values) for key, values in self.histograms.items()}
+        for (span_name, action_type), values in sorted(histograms.items()):
+            labels = f'span="{span_name}",action="{action_type}"'
+            for bound, count in zip(self.buckets, values):
+                lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {count}')
+            lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {values[-2]}')
+            lines.append(f'{name}_sum{{{labels}}} {values[-1]:.6f}')
+            lines.append(f'{name}_count{{{labels}}} {values[-2]}')
+        return "\n".join(lines) + "\n"
+
+class _TraceHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        url = urlparse(self.path)
+        tracer = self.server.tracer
+        if url.path == "/metrics":
+            body, content_type = tracer.prometheus().encode(), "text/plain; version=0.0.4"
+        elif url.path == "/traces":
+            limit = int(parse_qs(url.query).get('limit', ['0'])[0]) or None
+            body, content_type = json.dumps(tracer.otlp_json(limit)).encode(), "application/json"
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def start_server(tracer: Tracer, port: int = TracingConfig.PORT, host: str = TracingConfig.HOST) -> ThreadingHTTPServer:
+    """Serve GET /metrics (Prometheus) and GET /traces[?limit=N] (OTLP JSON) in a background thread"""
+    server = ThreadingHTTPServer((host, port), _TraceHandler)
+    server.daemon_threads = True
+    server.tracer = tracer
+    threading.Thread(target=server.serve_forever, name="trace-server", daemon=True).start()
+    return server
@@ -1,19 +1,67 @@
 import datetime
-import tweepy
+import itertools
 import os
-from dotenv import load_dotenv
+from config import APIConfig
+
+CREDENTIAL_VARS = ['API_KEY', 'API_SECRET', 'ACCESS_TOKEN', 'ACCESS_TOKEN_SECRET', 'BEARER_TOKEN']
+# Further accounts repeat these with a number, e.g. API_KEY_2; searches only use the first account's BEARER_TOKEN
+ACCOUNT_VARS = ['API_KEY', 'API_SECRET', 'ACCESS_TOKEN', 'ACCESS_TOKEN_SECRET']
+
+def load_credentials(path: str = "cred.env") -> dict:
+    from dotenv import load_dotenv
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"{path} file not found.")
+    load_dotenv(path)
+    credentials = {name: os.getenv(name) for name in CREDENTIAL_VARS}
+    if not all(credentials.values()):
+        raise ValueError(f"Missing environment variables in {path}.")
+    return credentials
+
+def load_accounts(path: str = "cred.env") -> list:
+    """Credentials of every account in path: the unnumbered set first, then _2, _3, ... until one is missing"""
+    accounts = [load_credentials(path)]
+    for number in itertools.count(2):
+        credentials = {name: os.getenv(f"{name}_{number}") for name in ACCOUNT_VARS}
+        if not any(credentials.values()):
+            return accounts
+        if not all(credentials.values()):
+            raise ValueError(f"Incomplete credentials for account {number} in {path}.")
+        accounts.append(credentials)
+
+def set_api_base_url(base_url: str):
+    """Send every X API call to base_url (e.g. http://127.0.0.1:8000/2) instead of api.twitter.com"""
+    APIConfig.BASE_URL = base_url.rstrip("/")
+    APIConfig.SEARCH_ENDPOINT = f"{APIConfig.BASE_URL}/tweets/search/recent"
+    APIConfig.TWEETS_ENDPOINT = f"{APIConfig.BASE_URL}/tweets"
+    APIConfig.USERS_ME_ENDPOINT = f"{APIConfig.BASE_URL}/users/me"
+    APIConfig.LIKES_ENDPOINT = APIConfig.BASE_URL + "/users/{user_id}/likes"
 
 def get_timestamp() -> str:
     return datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-def create_client():
+def check_time_range(start_dt: datetime.datetime, end_dt: datetime.datetime) -> datetime.datetime:
+    """Validate a UTC search window and return the end time, clamped to what the API accepts"""
+    now = datetime.datetime.now(datetime.timezone.utc)
+    if start_dt >= end_dt:
+        raise ValueError("End time must be after start time.")
+    if start_dt.year < 2006:
+        raise ValueError("Start date must be on or after 2006.")
+    if start_dt > now:
+        raise ValueError("Start time cannot be in the future.")
+    return min(end_dt, now - datetime.timedelta(seconds=APIConfig.MIN_END_TIME_OFFSET))
+
+def create_client(credentials: dict = None):
+    """tweepy client for credentials (see load_accounts), or for the credentials in the environment"""
+    # tweepy is slow to import and only needed once the first reply or like is sent
+    import tweepy
+    credentials = credentials or os.environ
     try:
         return tweepy.Client(
-            bearer_token=os.getenv("BEARER_TOKEN"),
-            consumer_key=os.getenv("API_KEY"),
-            consumer_secret=os.getenv("API_SECRET"),
-            access_token=os.getenv("ACCESS_TOKEN"),
-            access_token_secret=os.getenv("ACCESS_TOKEN_SECRET"),
+            bearer_token=credentials.get("BEARER_TOKEN"),
+            consumer_key=credentials.get("API_KEY"),
+            consumer_secret=credentials.get("API_SECRET"),
+            access_token=credentials.get("ACCESS_TOKEN"),
+            access_token_secret=credentials.get("ACCESS_TOKEN_SECRET"),
             return_type=dict
         )
     except Exception as e: